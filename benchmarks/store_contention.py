@@ -0,0 +1,68 @@
+"""
+Measures the throughput of the MeseexStore when many worker threads move jobs through it at once.
+
+Every thread summons its own jobs and walks them through the transitions a MeseexBox performs:
+queued -> working -> two task updates -> completed. The store guards its state with one lock,
+so the throughput should stay about flat as threads are added instead of collapsing under contention.
+
+Usage (from the repository root, or with meseex installed):
+    python benchmarks/store_contention.py [--jobs 20000] [--threads 1 2 4 8 16]
+"""
+import argparse
+import os
+import sys
+import threading
+import time
+
+# Run from a checkout without installing the package
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from meseex import MrMeseex
+from meseex.meseex_store import MeseexStore
+
+
+def _work(store: MeseexStore, meekz, barrier: threading.Barrier):
+    barrier.wait()
+    for meex in meekz:
+        store.add_to_queue(meex)
+        meseex_id, _ = store.pop_next_queued()
+        if meseex_id is None:
+            continue
+        store.update_meseex_task(meseex_id, -1, 0)
+        store.update_meseex_task(meseex_id, 0, 1)
+        store.complete_meseex(meseex_id)
+
+
+def run(n_jobs: int, n_threads: int) -> float:
+    """Returns the number of jobs per second."""
+    store = MeseexStore()
+    per_thread = [[MrMeseex(tasks=["a", "b"]) for _ in range(n_jobs // n_threads)] for _ in range(n_threads)]
+    barrier = threading.Barrier(n_threads + 1)
+    threads = [threading.Thread(target=_work, args=(store, meekz, barrier)) for meekz in per_thread]
+    for thread in threads:
+        thread.start()
+
+    barrier.wait()
+    start = time.perf_counter()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+
+    n_done = sum(len(meekz) for meekz in per_thread)
+    assert store.totals["completed"] == n_done
+    return n_done / elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--jobs", type=int, default=20_000)
+    parser.add_argument("--threads", type=int, nargs="+", default=[1, 2, 4, 8, 16])
+    args = parser.parse_args()
+
+    print(f"{'threads':>8} {'jobs/s':>10}")
+    for n_threads in args.threads:
+        print(f"{n_threads:>8} {run(args.jobs, n_threads):>10,.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,6 +1,14 @@
-from .meseex_box import MeseexBox
+from .meseex_box import MeseexBox, QueueFullException
 from .mr_meseex import MrMeseex, TaskException, TaskProgress, TaskCancelledException
-from .gather import gather_results, gather_results_async
+from .gather import gather_results, gather_results_async, as_completed, as_completed_async
+from .meseex_batch import MeseexBatch
+from .task_spec import TaskSpec, task
+from .rate_limiter import TokenBucket
+from .stage_cache import StageCache
+from .single_flight import SingleFlight
 
 
-__all__ = ['MeseexBox', 'MrMeseex', 'TaskProgress', 'TaskException', 'TaskCancelledException', 'gather_results', 'gather_results_async']
+__all__ = [
+    'MeseexBox', 'MeseexBatch', 'QueueFullException', 'MrMeseex', 'TaskProgress', 'TaskException', 'TaskCancelledException',
+    'gather_results', 'gather_results_async', 'as_completed', 'as_completed_async', 'TaskSpec', 'task', 'TokenBucket', 'StageCache', 'SingleFlight'
+]
@@ -0,0 +1,5 @@
+from .i_checkpoint_store import ICheckpointStore, MeseexCheckpoint
+from .sqlite_checkpoint_store import SQLiteCheckpointStore
+from .file_checkpoint_store import FileCheckpointStore
+
+__all__ = ["ICheckpointStore", "MeseexCheckpoint", "SQLiteCheckpointStore", "FileCheckpointStore"]
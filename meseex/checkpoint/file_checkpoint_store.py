@@ -0,0 +1,116 @@
+import os
+import pickle
+import struct
+import threading
+from typing import Dict, Iterable, List, Optional
+
+from .i_checkpoint_store import ICheckpointStore, MeseexCheckpoint
+
+# Every record is prefixed with its length
+_HEADER = struct.Struct("<I")
+
+
+class FileCheckpointStore(ICheckpointStore):
+    """
+    Appends checkpoints to a log file. The latest record of a Mr. Meseex wins when the file is read.
+
+    Appending is the cheapest way to persist a transition. The latest checkpoints are also kept in memory,
+    so loading doesn't read the file again. A record that was cut off by a crash is ignored and overwritten.
+    Call compact() from time to time to drop superseded records.
+    The memory grows with the number of jobs, because the checkpoints of terminated jobs are kept as well.
+    compact(keep_terminated=False) drops them from the file and from memory.
+    Checkpoints are pickled, so task inputs and outputs must be picklable.
+    """
+
+    def __init__(self, path: str, fsync: bool = False):
+        """
+        Args:
+            path: Path of the log file. Created if it doesn't exist.
+            fsync: If True, every save is flushed to disk. Survives power loss but is much slower.
+        """
+        self.path = path
+        self.fsync = fsync
+        self._lock = threading.Lock()
+        # Latest checkpoint of each Mr. Meseex in order of their first record
+        self._latest: Dict[str, MeseexCheckpoint] = {}
+        valid_size = self._read_log()
+        self._file = open(path, "ab")
+        if self._file.tell() > valid_size:
+            # Drop a partially written record
+            self._file.truncate(valid_size)
+            self._file.seek(valid_size)
+
+    def _read_log(self) -> int:
+        """Load all complete records. Returns the size of the file up to the last complete record."""
+        if not os.path.exists(self.path):
+            return 0
+
+        valid_size = 0
+        with open(self.path, "rb") as f:
+            while True:
+                header = f.read(_HEADER.size)
+                if len(header) < _HEADER.size:
+                    break
+                (size,) = _HEADER.unpack(header)
+                data = f.read(size)
+                if len(data) < size:
+                    break
+                try:
+                    checkpoint = pickle.loads(data)
+                except Exception:
+                    break
+                self._latest[checkpoint.meseex_id] = checkpoint
+                valid_size = f.tell()
+        return valid_size
+
+    def _write(self, f, checkpoints: Iterable[MeseexCheckpoint]):
+        records = []
+        for checkpoint in checkpoints:
+            data = pickle.dumps(checkpoint, protocol=pickle.HIGHEST_PROTOCOL)
+            records.append(_HEADER.pack(len(data)))
+            records.append(data)
+        f.write(b"".join(records))
+        f.flush()
+        if self.fsync:
+            os.fsync(f.fileno())
+
+    def save_many(self, checkpoints: Iterable[MeseexCheckpoint]) -> None:
+        checkpoints = list(checkpoints)
+        if not checkpoints:
+            return
+        with self._lock:
+            self._write(self._file, checkpoints)
+            for checkpoint in checkpoints:
+                self._latest[checkpoint.meseex_id] = checkpoint
+
+    def load(self, meseex_id: str) -> Optional[MeseexCheckpoint]:
+        with self._lock:
+            return self._latest.get(meseex_id)
+
+    def load_unfinished(self) -> List[MeseexCheckpoint]:
+        with self._lock:
+            return [checkpoint for checkpoint in self._latest.values() if not checkpoint.is_terminal]
+
+    def compact(self, keep_terminated: bool = True) -> None:
+        """
+        Rewrite the log with only the latest record of every Mr. Meseex.
+
+        Args:
+            keep_terminated: If False, checkpoints of terminated jobs are dropped as well.
+        """
+        with self._lock:
+            if not keep_terminated:
+                self._latest = {
+                    meseex_id: checkpoint for meseex_id, checkpoint in self._latest.items() if not checkpoint.is_terminal
+                }
+            tmp_path = f"{self.path}.compact"
+            with open(tmp_path, "wb") as f:
+                self._write(f, self._latest.values())
+                os.fsync(f.fileno())
+            self._file.close()
+            os.replace(tmp_path, self.path)
+            self._file = open(self.path, "ab")
+
+    def close(self) -> None:
+        with self._lock:
+            self._file.close()
@@ -0,0 +1,69 @@
+from abc import ABC, abstractmethod
+from typing import Any, Dict, Iterable, List, NamedTuple, Optional
+
+from meseex.mr_meseex import MrMeseex
+
+
+class MeseexCheckpoint(NamedTuple):
+    """The persisted state of a Mr. Meseex. Enough to continue the job in a new process."""
+    meseex_id: str
+    name: str
+    tasks: list
+    input: Any
+    # Outputs of the completed tasks by task index
+    task_outputs: Dict[int, Any]
+    # The first task without a recorded output. A resumed job continues with it.
+    resume_task_index: int
+    # Name of the TerminationState or None while the job is unfinished
+    termination_state: Optional[str] = None
+    priority: int = 0
+
+    @classmethod
+    def from_meseex(cls, meseex: MrMeseex, resume_task_index: int) -> "MeseexCheckpoint":
+        termination_state = meseex.termination_state
+        return cls(
+            meseex_id=meseex.meseex_id,
+            name=meseex.name,
+            tasks=list(meseex.tasks),
+            input=meseex.input,
+            task_outputs=dict(meseex.task_outputs),
+            resume_task_index=resume_task_index,
+            termination_state=termination_state.name if termination_state is not None else None,
+            priority=meseex.priority
+        )
+
+    @property
+    def is_terminal(self) -> bool:
+        return self.termination_state is not None
+
+
+class ICheckpointStore(ABC):
+    """
+    Interface for persistent checkpoint backends of a MeseexBox.
+
+    The box saves a checkpoint of a job when it is queued, whenever it moves to the next task and when it terminates.
+    Backends must be thread-safe, because checkpoints are saved from the threads that finish tasks.
+    """
+
+    @abstractmethod
+    def save_many(self, checkpoints: Iterable[MeseexCheckpoint]) -> None:
+        """Persist checkpoints. A checkpoint replaces the previous one of the same Mr. Meseex."""
+        pass
+
+    def save(self, checkpoint: MeseexCheckpoint) -> None:
+        """Persist a single checkpoint"""
+        self.save_many([checkpoint])
+
+    @abstractmethod
+    def load(self, meseex_id: str) -> Optional[MeseexCheckpoint]:
+        """The latest checkpoint of a Mr. Meseex or None"""
+        pass
+
+    @abstractmethod
+    def load_unfinished(self) -> List[MeseexCheckpoint]:
+        """The latest checkpoints of all jobs that did not terminate, in the order they were first saved"""
+        pass
+
+    def close(self) -> None:
+        """Release files and connections"""
+        pass
@@ -0,0 +1,77 @@
+import pickle
+import sqlite3
+import threading
+from typing import Iterable, List, Optional
+
+from .i_checkpoint_store import ICheckpointStore, MeseexCheckpoint
+
+
+class SQLiteCheckpointStore(ICheckpointStore):
+    """
+    Keeps the latest checkpoint of every Mr. Meseex in a SQLite database.
+
+    Checkpoints are pickled, so task inputs and outputs must be picklable.
+    The database runs in WAL mode, so saving a checkpoint is a cheap append to the write-ahead log.
+    """
+
+    def __init__(self, path: str, synchronous: str = "NORMAL"):
+        """
+        Args:
+            path: Path of the database file. Created if it doesn't exist.
+            synchronous: SQLite synchronous pragma. "NORMAL" survives process crashes,
+                "FULL" also survives power loss at the cost of an fsync per transaction.
+        """
+        if synchronous not in ("OFF", "NORMAL", "FULL"):
+            raise ValueError("synchronous must be 'OFF', 'NORMAL' or 'FULL'")
+
+        self.path = path
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute(f"PRAGMA synchronous={synchronous}")
+        self._connection.execute(
+            "CREATE TABLE IF NOT EXISTS meseex_checkpoints ("
+            "  meseex_id TEXT PRIMARY KEY,"
+            "  terminated INTEGER NOT NULL,"
+            "  data BLOB NOT NULL"
+            ")"
+        )
+
+    def save_many(self, checkpoints: Iterable[MeseexCheckpoint]) -> None:
+        rows = [
+            (checkpoint.meseex_id, int(checkpoint.is_terminal), pickle.dumps(checkpoint, protocol=pickle.HIGHEST_PROTOCOL))
+            for checkpoint in checkpoints
+        ]
+        if not rows:
+            return
+        with self._lock:
+            # Updating in place keeps the rowid, so unfinished jobs are loaded in the order they were summoned
+            self._connection.execute("BEGIN")
+            try:
+                self._connection.executemany(
+                    "INSERT INTO meseex_checkpoints (meseex_id, terminated, data) VALUES (?, ?, ?) "
+                    "ON CONFLICT(meseex_id) DO UPDATE SET terminated = excluded.terminated, data = excluded.data",
+                    rows
+                )
+            except BaseException:
+                self._connection.execute("ROLLBACK")
+                raise
+            self._connection.execute("COMMIT")
+
+    def load(self, meseex_id: str) -> Optional[MeseexCheckpoint]:
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT data FROM meseex_checkpoints WHERE meseex_id = ?", (meseex_id,)
+            ).fetchone()
+        return pickle.loads(row[0]) if row else None
+
+    def load_unfinished(self) -> List[MeseexCheckpoint]:
+        with self._lock:
+            rows = self._connection.execute(
+                "SELECT data FROM meseex_checkpoints WHERE terminated = 0 ORDER BY rowid"
+            ).fetchall()
+        return [pickle.loads(row[0]) for row in rows]
+
+    def close(self) -> None:
+        with self._lock:
+            self._connection.close()
@@ -0,0 +1,19 @@
+import time
+from datetime import datetime, timezone
+
+# All timing uses the monotonic clock in integer nanoseconds. It is cheap to read and durations stay
+# correct when the wall clock is adjusted. Wall-clock datetimes are only computed on demand.
+now_ns = time.monotonic_ns
+
+# Offset to convert monotonic timestamps to wall-clock time
+_WALL_CLOCK_OFFSET_NS = time.time_ns() - time.monotonic_ns()
+
+
+def to_datetime(monotonic_ns: int) -> datetime:
+    """Convert a monotonic timestamp to a wall-clock datetime in UTC."""
+    return datetime.fromtimestamp((_WALL_CLOCK_OFFSET_NS + monotonic_ns) / 1e9, tz=timezone.utc)
+
+
+def now_datetime() -> datetime:
+    """The current time as datetime, consistent with the datetimes of to_datetime."""
+    return to_datetime(now_ns())
@@ -1,5 +1,11 @@
-from .signals import TaskSignal, Repeat
+from .signals import TaskSignal, Repeat, Retry
 from .polling import polling_task, PollAgain
 from .polling import PollingException
+from .backoff import Backoff, ConstantBackoff, ExponentialBackoff, DecorrelatedJitterBackoff
+from .batched_polling import batched_polling_task, BatchedPoller
+from .batched_task import batched_task, MicroBatcher
+from .retry import retry_task
 
-__all__ = ["PollAgain", "TaskSignal", "polling_task", "Repeat", "PollingException"]
+__all__ = ["PollAgain", "TaskSignal", "polling_task", "Repeat", "Retry", "retry_task", "PollingException", "batched_polling_task", "BatchedPoller",
+           "batched_task", "MicroBatcher",
+           "Backoff", "ConstantBackoff", "ExponentialBackoff", "DecorrelatedJitterBackoff"]
@@ -0,0 +1,80 @@
+import random
+from abc import ABC, abstractmethod
+
+
+class Backoff(ABC):
+    """
+    Strategy that computes the delay before the next polling attempt.
+
+    Backoff instances are shared by all Mr. Meseex instances of a task, so they must not hold per-job state.
+    The attempt counter and the previous delay are tracked in the PollingState of each job.
+    """
+
+    @abstractmethod
+    def next_delay(self, attempt: int, prev_delay_s: float) -> float:
+        """
+        Args:
+            attempt: Number of the attempt that is scheduled, starting with 1.
+            prev_delay_s: The delay used before the previous attempt. 0 for the first attempt.
+
+        Returns:
+            float: Delay in seconds.
+        """
+        pass
+
+
+class ConstantBackoff(Backoff):
+    """Polls in a fixed interval."""
+    def __init__(self, interval_s: float):
+        self.interval_s = interval_s
+
+    def next_delay(self, attempt: int, prev_delay_s: float) -> float:
+        return self.interval_s
+
+
+class ExponentialBackoff(Backoff):
+    """
+    Multiplies the delay with factor after every attempt up to max_s.
+
+    Short jobs are still polled quickly while the request rate falls for long running jobs.
+    With jitter > 0 each delay is randomly shortened by up to that fraction so jobs started together drift apart.
+    """
+    def __init__(self, initial_s: float = 1.0, factor: float = 2.0, max_s: float = 60.0, jitter: float = 0.0):
+        if initial_s <= 0 or factor < 1 or max_s < initial_s:
+            raise ValueError("Expected initial_s > 0, factor >= 1 and max_s >= initial_s")
+        if not 0 <= jitter <= 1:
+            raise ValueError("jitter must be between 0 and 1")
+        self.initial_s = initial_s
+        self.factor = factor
+        self.max_s = max_s
+        self.jitter = jitter
+
+    def next_delay(self, attempt: int, prev_delay_s: float) -> float:
+        # Stop growing once the cap is reached. Avoids overflows for very long polling.
+        delay = self.initial_s
+        for _ in range(attempt - 1):
+            delay *= self.factor
+            if delay >= self.max_s:
+                break
+        delay = min(delay, self.max_s)
+        if self.jitter:
+            delay *= 1 - self.jitter * random.random()
+        return delay
+
+
+class DecorrelatedJitterBackoff(Backoff):
+    """
+    Picks a random delay between base_s and three times the previous delay, capped at max_s.
+
+    Grows like an exponential backoff on average but spreads jobs started together over time,
+    which prevents thundering herds on the polled service.
+    """
+    def __init__(self, base_s: float = 1.0, max_s: float = 60.0):
+        if base_s <= 0 or max_s < base_s:
+            raise ValueError("Expected base_s > 0 and max_s >= base_s")
+        self.base_s = base_s
+        self.max_s = max_s
+
+    def next_delay(self, attempt: int, prev_delay_s: float) -> float:
+        prev_delay_s = max(prev_delay_s, self.base_s)
+        return min(self.max_s, random.uniform(self.base_s, prev_delay_s * 3))
@@ -0,0 +1,157 @@
+import time
+import asyncio
+import threading
+from concurrent.futures import Future
+from typing import Any, Callable, Dict, Hashable, Mapping, Optional, Set, Tuple
+
+from meseex.mr_meseex import MrMeseex
+from meseex.control_flow.signals import Repeat
+from meseex.control_flow.polling import PollAgain, _get_or_create_polling_state, _handle_poll_again
+
+
+def _delay_to_next_tick(poll_interval_s: float) -> float:
+    """Delay until the next multiple of the poll interval. Aligns all jobs of a stage to the same ticks."""
+    return poll_interval_s - (time.monotonic() % poll_interval_s)
+
+
+class BatchedPoller:
+    """
+    Coalesces the polls of many Mr. Meseex instances into one call of a batch function.
+
+    The first poll of a batch opens it. All polls arriving within the batch window join it.
+    Then the batch function is called once with all keys and every poll receives its own result.
+    """
+    def __init__(self, batch_func: Callable, batch_window_s: float = 0.05, max_batch_size: Optional[int] = None):
+        """
+        Args:
+            batch_func: Sync or async function called with a list of keys.
+                Returns a mapping from key to result, PollAgain or an Exception.
+            batch_window_s: How long a batch collects polls before it is sent.
+            max_batch_size: Maximum number of keys per call. A full batch is sent when its window ends
+                while further polls open a new batch.
+        """
+        if max_batch_size is not None and max_batch_size < 1:
+            raise ValueError("max_batch_size must be >= 1")
+
+        self.batch_func = batch_func
+        self.batch_window_s = batch_window_s
+        self.max_batch_size = max_batch_size
+        self._is_async = asyncio.iscoroutinefunction(batch_func)
+        self._lock = threading.Lock()
+        # The batch that is currently open for new polls. Maps key to the future of its result.
+        self._open_batch: Optional[Dict[Hashable, Future]] = None
+        # Keep references to running flushes, otherwise they might be garbage collected
+        self._flushes: Set[asyncio.Task] = set()
+        self.n_calls = 0
+
+    def _join(self, key: Hashable) -> Tuple[Future, Optional[Dict[Hashable, Future]]]:
+        """Add the key to the open batch. Returns its future and the batch if this poll opened it."""
+        with self._lock:
+            opened = None
+            if self._open_batch is None:
+                self._open_batch = opened = {}
+            batch = self._open_batch
+
+            future = batch.get(key)
+            if future is None:
+                future = batch[key] = Future()
+            if self.max_batch_size is not None and len(batch) >= self.max_batch_size:
+                self._open_batch = None
+            return future, opened
+
+    async def _flush(self, batch: Dict[Hashable, Future]):
+        await asyncio.sleep(self.batch_window_s)
+        with self._lock:
+            if self._open_batch is batch:
+                self._open_batch = None
+
+        # Skip the keys whose polls were all cancelled
+        batch = {key: future for key, future in batch.items() if future.set_running_or_notify_cancel()}
+        if not batch:
+            return
+
+        keys = list(batch)
+        self.n_calls += 1
+        try:
+            if self._is_async:
+                results = await self.batch_func(keys)
+            else:
+                results = await asyncio.get_running_loop().run_in_executor(None, self.batch_func, keys)
+        except Exception as e:
+            for future in batch.values():
+                future.set_exception(e)
+            return
+
+        if not isinstance(results, Mapping):
+            results = dict(zip(keys, results))
+        for key, future in batch.items():
+            # Keys without status are not ready yet
+            future.set_result(results.get(key, PollAgain()))
+
+    async def poll(self, key: Hashable) -> Any:
+        """Poll the status of a key as part of the next batch call."""
+        future, opened = self._join(key)
+        if opened is not None:
+            # The flush does not belong to this poll, so cancelling this Mr. Meseex doesn't cancel the batch
+            flush = asyncio.ensure_future(self._flush(opened))
+            self._flushes.add(flush)
+            flush.add_done_callback(self._flushes.discard)
+
+        # Polls of the same key share the future. Cancelling one poll must not cancel it for the others.
+        result = await asyncio.shield(asyncio.wrap_future(future))
+        if isinstance(result, Exception):
+            raise result
+        return result
+
+
+def batched_polling_task(
+    key_fn: Callable[[MrMeseex], Hashable],
+    poll_interval_seconds: float = 1.0,
+    timeout_seconds: float = 300.0,
+    batch_window_seconds: float = 0.05,
+    max_batch_size: Optional[int] = None
+) -> Callable[[Callable], Callable]:
+    """
+    Transforms a batch status function into a polling task that polls many jobs with one upstream call.
+
+    All Mr. Meseex instances waiting in the stage poll on the same ticks. The polls of one tick are
+    collected for batch_window_seconds and the decorated function is called once with their keys.
+    It returns a mapping (or a list in key order) with an entry per key:
+    - a value on success
+    - PollAgain to continue polling (keys missing in the mapping poll again as well)
+    - an Exception to fail only this Mr. Meseex
+
+    Example:
+        @batched_polling_task(key_fn=lambda meex: meex.input["job_id"], poll_interval_seconds=5)
+        async def check_jobs(job_ids: List[str]) -> Dict[str, Any]:
+            statuses = await api.get_statuses(job_ids)
+            return {job_id: status if status == "COMPLETED" else PollAgain(status) for job_id, status in statuses.items()}
+
+    The decorated function must be a plain function, not a method.
+
+    Args:
+        key_fn: Returns the key that identifies a Mr. Meseex in the batch call, e.g. a remote job id
+        poll_interval_seconds: Time between polling ticks
+        timeout_seconds: Maximum total time to spend polling before a Mr. Meseex fails
+        batch_window_seconds: How long polls are collected before the batch function is called
+        max_batch_size: Maximum number of keys per batch function call
+
+    Returns:
+        Decorator function that turns the batch function into an async task
+    """
+    def decorator(func: Callable) -> Callable:
+        poller = BatchedPoller(func, batch_window_s=batch_window_seconds, max_batch_size=max_batch_size)
+
+        async def batched_poll_wrapper(meex: MrMeseex):
+            state = _get_or_create_polling_state(meex, poll_interval_seconds, timeout_seconds)
+            result = await poller.poll(key_fn(meex))
+            signal = _handle_poll_again(meex, result, state, func)
+            if isinstance(signal, Repeat):
+                signal.delay_s = _delay_to_next_tick(poll_interval_seconds)
+            return signal
+
+        batched_poll_wrapper.poller = poller
+        batched_poll_wrapper.control_flow = "batched_polling_task"
+        return batched_poll_wrapper
+
+    return decorator
@@ -0,0 +1,132 @@
+import asyncio
+import threading
+from concurrent.futures import Future
+from typing import Any, Callable, List, Optional, Set, Tuple
+
+from meseex.mr_meseex import MrMeseex
+
+
+class MicroBatcher:
+    """
+    Accumulates the Mr. Meseex instances that reach a stage and runs the stage function once per batch.
+
+    A batch is sent as soon as it holds max_batch_size instances or max_wait_s after its first instance arrived.
+    Cancelled instances are left out of the batch if it was not sent yet.
+    """
+    def __init__(self, batch_func: Callable, max_batch_size: int = 32, max_wait_s: float = 0.01):
+        """
+        Args:
+            batch_func: Sync or async function called with a list of Mr. Meseex instances.
+                Returns a list with one output per instance. An Exception in the list fails only its instance.
+            max_batch_size: Maximum number of Mr. Meseex instances per call.
+            max_wait_s: Maximum time the first instance of a batch waits for further instances.
+        """
+        if max_batch_size < 1:
+            raise ValueError("max_batch_size must be >= 1")
+        if max_wait_s < 0:
+            raise ValueError("max_wait_s must be >= 0")
+
+        self.batch_func = batch_func
+        self.max_batch_size = max_batch_size
+        self.max_wait_s = max_wait_s
+        self._is_async = asyncio.iscoroutinefunction(batch_func)
+        self._lock = threading.Lock()
+        # The batch that is currently collecting instances
+        self._open_batch: Optional[List[Tuple[MrMeseex, Future]]] = None
+        # Keep references to running batches, otherwise they might be garbage collected
+        self._running: Set[asyncio.Task] = set()
+
+    def _close_if_open(self, batch: List[Tuple[MrMeseex, Future]]):
+        with self._lock:
+            if self._open_batch is not batch:
+                return  # Sent already because it was full
+            self._open_batch = None
+        self._start(batch)
+
+    def _start(self, batch: List[Tuple[MrMeseex, Future]]):
+        running = asyncio.ensure_future(self._run(batch))
+        self._running.add(running)
+        running.add_done_callback(self._running.discard)
+
+    async def _run(self, batch: List[Tuple[MrMeseex, Future]]):
+        batch = [(meex, future) for meex, future in batch if future.set_running_or_notify_cancel()]
+        if not batch:
+            return
+
+        meekz = [meex for meex, _ in batch]
+        try:
+            if self._is_async:
+                outputs = await self.batch_func(meekz)
+            else:
+                outputs = await asyncio.get_running_loop().run_in_executor(None, self.batch_func, meekz)
+            outputs = list(outputs)
+            if len(outputs) != len(meekz):
+                raise ValueError(f"Batch function returned {len(outputs)} outputs for {len(meekz)} Mr. Meseex instances")
+        except Exception as e:
+            for _, future in batch:
+                future.set_exception(e)
+            return
+
+        for (_, future), output in zip(batch, outputs):
+            if isinstance(output, Exception):
+                future.set_exception(output)
+            else:
+                future.set_result(output)
+
+    async def submit(self, meex: MrMeseex) -> Any:
+        """Add the Mr. Meseex to the next batch and return its output once the batch ran."""
+        future = Future()
+        with self._lock:
+            opened = self._open_batch is None
+            if opened:
+                self._open_batch = []
+            batch = self._open_batch
+            batch.append((meex, future))
+            is_full = len(batch) >= self.max_batch_size
+            if is_full:
+                self._open_batch = None
+
+        if is_full:
+            self._start(batch)
+        elif opened:
+            asyncio.get_running_loop().call_later(self.max_wait_s, self._close_if_open, batch)
+
+        # Cancelling the awaiting task cancels the future, so an unsent batch skips this Mr. Meseex
+        return await asyncio.wrap_future(future)
+
+
+def batched_task(max_batch_size: int = 32, max_wait_ms: float = 10.0) -> Callable[[Callable], Callable]:
+    """
+    Transforms a function over a list of Mr. Meseex instances into a stage that runs them in micro-batches.
+
+    Jobs reaching the stage are collected until max_batch_size jobs arrived or max_wait_ms passed.
+    Then the function is called once with all of them and has to return one output per job, in order.
+    Each output becomes the task output of its job. An Exception in the outputs fails only its job,
+    an exception raised by the function fails the whole batch.
+
+    Example:
+        @batched_task(max_batch_size=64, max_wait_ms=20)
+        async def embed(meekz: List[MrMeseex]) -> List[List[float]]:
+            return await model.embed([meex.input for meex in meekz])
+
+        meseex_box = MeseexBox({"embed": embed, "store": store})
+
+    Sync functions run in the default executor of the event loop.
+
+    Args:
+        max_batch_size: Maximum number of jobs per call
+        max_wait_ms: Maximum time in milliseconds the first job of a batch waits for further jobs
+
+    Returns:
+        Decorator function that turns the batch function into an async task
+    """
+    def decorator(func: Callable) -> Callable:
+        batcher = MicroBatcher(func, max_batch_size=max_batch_size, max_wait_s=max_wait_ms / 1000)
+
+        async def batched_task_wrapper(meex: MrMeseex):
+            return await batcher.submit(meex)
+
+        batched_task_wrapper.batcher = batcher
+        return batched_task_wrapper
+
+    return decorator
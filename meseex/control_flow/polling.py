@@ -6,6 +6,7 @@ from typing import Callable, Optional, TypeVar, Any, Tuple, Dict
 from meseex.mr_meseex import MrMeseex, TaskException
 from meseex.control_flow.signals import TaskSignal, Repeat
 from meseex.utils import _expects_mr_meseex_param
+from meseex.control_flow.backoff import Backoff, ConstantBackoff
 
 # Type variable for better type hinting
 T = TypeVar('T')
@@ -24,8 +25,13 @@ class PollAgain(TaskSignal):
             if status == "COMPLETED":
                 return status
             return PollAgain(f"Job status: {status}")
+
+    A server hint like a Retry-After header can be passed with retry_after.
+    It replaces the delay of the backoff strategy for the next attempt.
     """
-    pass
+    def __init__(self, message: Optional[str] = None, retry_after: Optional[float] = None, *args, **kwargs):
+        super().__init__(message, *args, **kwargs)
+        self.retry_after = retry_after
 
 
 class PollingException(TaskException):
@@ -66,11 +72,30 @@ class PollingState:
     
     Tracks timing, retries, and preserves error information between attempts.
     """
-    def __init__(self, poll_interval_s: float = 1, timeout_s: float = 300.0):
+    def __init__(self, poll_interval_s: float = 1, timeout_s: float = 300.0, backoff: Optional[Backoff] = None):
         self.start_time: float = time.monotonic()
         self.poll_interval: float = poll_interval_s
         self.timeout: float = timeout_s
+        self.backoff: Backoff = backoff or ConstantBackoff(poll_interval_s)
+        self.attempts: int = 0
+        self.last_delay: float = 0.0
         self.last_exception: Optional[Exception] = None
+
+    def next_delay(self, retry_after: Optional[float] = None) -> float:
+        """
+        Count the attempt and compute the delay before the next one.
+        A retry_after hint of the polled service takes precedence over the backoff strategy.
+        The delay never reaches beyond the timeout.
+        """
+        self.attempts += 1
+        if retry_after is not None:
+            delay = max(0.0, retry_after)
+        else:
+            delay = self.backoff.next_delay(self.attempts, self.last_delay)
+        # Poll once more right at the timeout instead of sleeping past it
+        delay = min(delay, self.remaining_time)
+        self.last_delay = delay
+        return delay
         
     @property
     def elapsed_time(self) -> float:
@@ -88,14 +113,14 @@ class PollingState:
         return self.elapsed_time > self.timeout
 
 
-def _get_or_create_polling_state(meex: MrMeseex, poll_interval_s: float, timeout_s: float):
+def _get_or_create_polling_state(meex: MrMeseex, poll_interval_s: float, timeout_s: float, backoff: Optional[Backoff] = None):
     """Gets existing polling state or initializes a new one."""
 
     state = meex.get_task_signal(POLLING_STATE_KEY)
     
     if state is None:
         # First execution: initialize state
-        state = PollingState(poll_interval_s=poll_interval_s, timeout_s=timeout_s)
+        state = PollingState(poll_interval_s=poll_interval_s, timeout_s=timeout_s, backoff=backoff)
         meex.set_task_signal(POLLING_STATE_KEY, state)
         meex.set_task_progress(0.0, "Polling initiated")
         
@@ -117,7 +142,7 @@ def _handle_poll_again(meex: MrMeseex, result: T, state: PollingState, func: Cal
             original_error=getattr(state, 'last_exception', None)
         )
 
-    return Repeat(delay_s=state.poll_interval)
+    return Repeat(delay_s=state.next_delay(result.retry_after))
 
 
 def _is_class_method(func: Callable) -> bool:
@@ -126,7 +151,11 @@ def _is_class_method(func: Callable) -> bool:
     return bool(sig.parameters) and next(iter(sig.parameters.values())).name in ('self', 'cls')
 
         
-def polling_task(poll_interval_seconds: float = 1.0, timeout_seconds: float = 300.0) -> Callable[[Callable], Callable]:
+def polling_task(
+    poll_interval_seconds: float = 1.0,
+    timeout_seconds: float = 300.0,
+    backoff: Optional[Backoff] = None
+) -> Callable[[Callable], Callable]:
     """
     Transforms a function into a polling task that automatically retries until success or timeout.
     
@@ -150,10 +179,17 @@ def polling_task(poll_interval_seconds: float = 1.0, timeout_seconds: float = 30
             async def poll_endpoint(self, meex: MrMeseex):
                 # self is properly handled, meex is correctly passed
                 return PollAgain() if not_ready() else result
+
+        # Poll often at first and less often for long running jobs
+        @polling_task(timeout_seconds=3600, backoff=ExponentialBackoff(initial_s=1, max_s=60, jitter=0.2))
+        async def wait_for_training(meex: MrMeseex):
+            ...
     
     Args:
         poll_interval_seconds: Time to wait between polling attempts
         timeout_seconds: Maximum total time to spend polling before failing
+        backoff: Strategy for the delay between attempts, e.g. ExponentialBackoff or DecorrelatedJitterBackoff.
+            Defaults to a constant poll_interval_seconds. PollAgain(retry_after=...) overrides it for one attempt.
     
     Returns:
         Decorator function that wraps the target function
@@ -164,7 +200,7 @@ def polling_task(poll_interval_seconds: float = 1.0, timeout_seconds: float = 30
         expects_meex = _expects_mr_meseex_param(func)
             
         async def async_poll_class_method_wrapper(self, meex: MrMeseex):
-            state = _get_or_create_polling_state(meex, poll_interval_seconds, timeout_seconds)
+            state = _get_or_create_polling_state(meex, poll_interval_seconds, timeout_seconds, backoff)
             if not expects_meex:
                 result = await func(self)
             else:
@@ -174,7 +210,7 @@ def polling_task(poll_interval_seconds: float = 1.0, timeout_seconds: float = 30
 
         # Async wrapper for async functions
         async def async_poll_wrapper(meex: MrMeseex):
-            state = _get_or_create_polling_state(meex, poll_interval_seconds, timeout_seconds)  
+            state = _get_or_create_polling_state(meex, poll_interval_seconds, timeout_seconds, backoff)  
             if expects_meex:
                 result = await func(meex)
             else:
@@ -184,7 +220,7 @@ def polling_task(poll_interval_seconds: float = 1.0, timeout_seconds: float = 30
             return _handle_poll_again(meex, result, state, func)
             
         def sync_poll_class_method_wrapper(self, meex: MrMeseex):
-            state = _get_or_create_polling_state(meex, poll_interval_seconds, timeout_seconds)
+            state = _get_or_create_polling_state(meex, poll_interval_seconds, timeout_seconds, backoff)
             if not expects_meex:
                 result = func(self)
             else:
@@ -192,7 +228,7 @@ def polling_task(poll_interval_seconds: float = 1.0, timeout_seconds: float = 30
             return _handle_poll_again(meex, result, state, func)
 
         def sync_poll_wrapper(meex: MrMeseex):
-            state = _get_or_create_polling_state(meex, poll_interval_seconds, timeout_seconds)
+            state = _get_or_create_polling_state(meex, poll_interval_seconds, timeout_seconds, backoff)
             if expects_meex:
                 result = func(meex)
             else:
@@ -201,8 +237,11 @@ def polling_task(poll_interval_seconds: float = 1.0, timeout_seconds: float = 30
         
         # Return the appropriate wrapper based on the function type
         if is_class_method:
-            return async_poll_class_method_wrapper if is_async else sync_poll_class_method_wrapper
+            wrapper = async_poll_class_method_wrapper if is_async else sync_poll_class_method_wrapper
         else:
-            return async_poll_wrapper if is_async else sync_poll_wrapper
+            wrapper = async_poll_wrapper if is_async else sync_poll_wrapper
+        # The polling state lives in the task signals of the Mr. Meseex, so executors can't run it in another process
+        wrapper.control_flow = "polling_task"
+        return wrapper
             
     return decorator
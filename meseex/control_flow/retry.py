@@ -0,0 +1,172 @@
+import asyncio
+from typing import Callable, Optional, Tuple, Type
+
+from meseex.mr_meseex import MrMeseex
+from meseex.control_flow.signals import Retry
+from meseex.control_flow.backoff import Backoff, ExponentialBackoff
+from meseex.control_flow.polling import _is_class_method
+from meseex.utils import _expects_mr_meseex_param
+
+RETRY_STATE_KEY = "_retry_state"
+# Delay of a Retry without delay_s that is returned outside of the retry_task decorator
+DEFAULT_RETRY_DELAY_S = 1.0
+
+
+class RetryState:
+    """
+    Internal state of the retries of one task of a Mr. Meseex.
+
+    Kept in the task signal metadata, so every stage of a job counts its attempts separately.
+    """
+    def __init__(self):
+        self.attempts: int = 0
+        self.last_delay: float = 0.0
+        self.last_exception: Optional[Exception] = None
+
+
+def _get_or_create_retry_state(meex: MrMeseex) -> RetryState:
+    state = meex.get_task_signal(RETRY_STATE_KEY)
+    if state is None:
+        state = RetryState()
+        meex.set_task_signal(RETRY_STATE_KEY, state)
+    return state
+
+
+def _handle_attempt(
+        meex: MrMeseex,
+        state: RetryState,
+        result: object,
+        error: Optional[Exception],
+        max_attempts: int,
+        backoff: Backoff
+):
+    """Turn the outcome of an attempt into the task result, a Retry signal or the final error."""
+    if error is None and not isinstance(result, Retry):
+        meex.clear_task_signal(RETRY_STATE_KEY)
+        return result
+
+    state.attempts += 1
+    if error is None:
+        # The task asked for a retry itself
+        error = result.error
+    state.last_exception = error
+
+    if state.attempts >= max_attempts:
+        _give_up(meex, error, max_attempts)
+
+    if isinstance(result, Retry) and result.delay_s is not None:
+        delay = result.delay_s
+    else:
+        delay = backoff.next_delay(state.attempts, state.last_delay)
+    state.last_delay = delay
+    meex.set_task_progress(None, f"Retry {state.attempts}/{max_attempts - 1} in {delay:.1f}s: {error}")
+    retry = Retry(delay_s=delay, message=str(error), error=error, max_attempts=max_attempts)
+    retry.counted = True
+    return retry
+
+
+def _give_up(meex: MrMeseex, error: Optional[Exception], max_attempts: int):
+    meex.clear_task_signal(RETRY_STATE_KEY)
+    if error is not None:
+        raise error
+    raise RuntimeError(f"Task {meex.task} asked for a retry after the last of {max_attempts} attempts")
+
+
+def _count_retry(meex: MrMeseex, retry: Retry) -> Retry:
+    """
+    Count a Retry that a task returned without the retry_task decorator.
+
+    Raises the error of the Retry once retry.max_attempts attempts failed.
+    """
+    state = _get_or_create_retry_state(meex)
+    state.attempts += 1
+    state.last_exception = retry.error
+    if state.attempts >= retry.max_attempts:
+        _give_up(meex, retry.error, retry.max_attempts)
+    if retry.delay_s is None:
+        retry.delay_s = DEFAULT_RETRY_DELAY_S
+    state.last_delay = retry.delay_s
+    retry.counted = True
+    return retry
+
+
+def retry_task(
+    max_attempts: int = 3,
+    backoff: Optional[Backoff] = None,
+    retry_on: Tuple[Type[BaseException], ...] = (Exception,)
+) -> Callable[[Callable], Callable]:
+    """
+    Re-runs a task when it raises one of the retry_on exceptions, so transient errors don't fail the whole job.
+
+    Only the failing stage is run again. Outputs of earlier stages are kept.
+    Between attempts the job waits in the delay scheduler without occupying a thread.
+    The task can also return Retry(...) itself to request another attempt.
+    After max_attempts the last error is raised and fails the Mr. Meseex as usual.
+
+    Example:
+        @retry_task(max_attempts=5, backoff=ExponentialBackoff(initial_s=0.5, max_s=10, jitter=0.2),
+                    retry_on=(ConnectionError, TimeoutError))
+        async def upload(meex: MrMeseex):
+            return await client.upload(meex.prev_task_output)
+
+    Works with sync and async functions and with class methods.
+
+    Args:
+        max_attempts: Total number of attempts including the first one.
+        backoff: Strategy for the delay before each retry. Defaults to an exponential backoff
+            starting at 0.5 s with jitter.
+        retry_on: Exception types that trigger a retry. Other exceptions fail the Mr. Meseex immediately.
+
+    Returns:
+        Decorator function that wraps the target function
+    """
+    if max_attempts < 1:
+        raise ValueError("max_attempts must be >= 1")
+    backoff = backoff or ExponentialBackoff(initial_s=0.5, max_s=30.0, jitter=0.2)
+    retry_on = tuple(retry_on)
+
+    def decorator(func: Callable) -> Callable:
+        is_async = asyncio.iscoroutinefunction(func)
+        is_class_method = _is_class_method(func)
+        expects_meex = _expects_mr_meseex_param(func)
+
+        def args_for(meex: MrMeseex, *self_arg) -> tuple:
+            return (*self_arg, meex) if expects_meex else self_arg
+
+        async def async_retry_wrapper(meex: MrMeseex, *self_arg):
+            state = _get_or_create_retry_state(meex)
+            try:
+                result = await func(*args_for(meex, *self_arg))
+            except retry_on as e:
+                return _handle_attempt(meex, state, None, e, max_attempts, backoff)
+            return _handle_attempt(meex, state, result, None, max_attempts, backoff)
+
+        def sync_retry_wrapper(meex: MrMeseex, *self_arg):
+            state = _get_or_create_retry_state(meex)
+            try:
+                result = func(*args_for(meex, *self_arg))
+            except retry_on as e:
+                return _handle_attempt(meex, state, None, e, max_attempts, backoff)
+            return _handle_attempt(meex, state, result, None, max_attempts, backoff)
+
+        async def async_retry_class_method_wrapper(self, meex: MrMeseex):
+            return await async_retry_wrapper(meex, self)
+
+        def sync_retry_class_method_wrapper(self, meex: MrMeseex):
+            return sync_retry_wrapper(meex, self)
+
+        async def async_retry_function_wrapper(meex: MrMeseex):
+            return await async_retry_wrapper(meex)
+
+        def sync_retry_function_wrapper(meex: MrMeseex):
+            return sync_retry_wrapper(meex)
+
+        if is_class_method:
+            wrapper = async_retry_class_method_wrapper if is_async else sync_retry_class_method_wrapper
+        else:
+            wrapper = async_retry_function_wrapper if is_async else sync_retry_function_wrapper
+        # The attempts are counted in the task signals of the Mr. Meseex, so executors can't run it in another process
+        wrapper.control_flow = "retry_task"
+        return wrapper
+
+    return decorator
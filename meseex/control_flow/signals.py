@@ -10,3 +10,31 @@ class Repeat(TaskSignal):
     def __init__(self, delay_s: float, message: Optional[str] = None, *args, **kwargs):
         super().__init__(message, *args, **kwargs)
         self.delay_s = delay_s
+
+
+class Retry(Repeat):
+    """
+    Signal to run the current task again after a failed attempt.
+
+    Only the current stage is re-run, the outputs of earlier stages are kept.
+    Like Repeat, the task waits for delay_s in the delay scheduler without occupying a thread.
+    Without delay_s, the backoff of the retry_task decorator decides the delay, or 1 s outside of it.
+    Tasks can return it directly or use the retry_task decorator which returns it for matching exceptions.
+    Attempts are counted per task. Once max_attempts attempts failed, the Mr. Meseex fails with error.
+    """
+    def __init__(
+            self,
+            delay_s: Optional[float] = None,
+            message: Optional[str] = None,
+            error: Optional[Exception] = None,
+            max_attempts: int = 3,
+            *args,
+            **kwargs
+    ):
+        if max_attempts < 1:
+            raise ValueError("max_attempts must be >= 1")
+        super().__init__(delay_s, message, *args, **kwargs)
+        self.error = error
+        self.max_attempts = max_attempts
+        # True once the attempt was counted, e.g. by the retry_task decorator
+        self.counted = False
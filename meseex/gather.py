@@ -1,6 +1,25 @@
-from typing import List, Any, Optional, Dict, Union
+from typing import List, Any, Optional, Dict, Union, Iterable, Iterator, AsyncIterator
 import asyncio
-from meseex import MrMeseex
+import queue
+import time
+from meseex.mr_meseex import MrMeseex
+
+
+def _result_keys(meekz: List[MrMeseex]) -> List[str]:
+    """Key of each Mr. Meseex in the results. The name is used unless it is taken already, then the meseex_id."""
+    keys = []
+    taken = set()
+    for meseex in meekz:
+        key = meseex.name if meseex.name not in taken else meseex.meseex_id
+        taken.add(key)
+        keys.append(key)
+    return keys
+
+
+def _remaining_s(deadline: Optional[float]) -> Optional[float]:
+    if deadline is None:
+        return None
+    return max(0.0, deadline - time.monotonic())
 
 
 async def gather_results_async(
@@ -12,51 +31,42 @@ async def gather_results_async(
 ) -> Union[Dict[str, Any], List[Any]]:
     """
     Asynchronously gather results from a list of Mr. Meseex instances.
-    
+
     Args:
         meekz: List of Mr. Meseex instances to gather results from
-        timeout_s: Optional timeout in seconds
+        timeout_s: Optional timeout in seconds for the whole batch
         default_value: Value to return if the job has an error or times out.
         raise_on_error: If True, raise an exception if a job has an error or times out. Else fills remaining jobs with default_value.
         results_only: If True the results are returned as a list of results. Else the results are returned as a dictionary mapping meseex_id to results.
 
     Returns:
-        Dictionary mapping meseex_id to results or list of results if results_only is True
+        Dictionary mapping meseex_id to results or list of results if results_only is True.
+        Results are ordered like the given meekz.
     """
+    meekz = list(meekz)
+    keys = _result_keys(meekz)
     results = {}
-    
-    async def get_result(meseex):
+
+    async def get_result(meseex, key):
         try:
-            result = await meseex
-            if meseex.name not in results:
-                results[meseex.name] = result
-            else:
-                results[meseex.meseex_id] = result
+            results[key] = await meseex
         except Exception as e:
             if raise_on_error:
                 raise e
             print("Meseex failed: ", meseex.name, "with error: ", e)
-            if meseex.name not in results:
-                results[meseex.name] = default_value
-            else:
-                results[meseex.meseex_id] = default_value
-    
+            results[key] = default_value
+
     try:
         if timeout_s is not None:
-            await asyncio.wait_for(asyncio.gather(*(get_result(meseex) for meseex in meekz)), timeout=timeout_s)
+            await asyncio.wait_for(asyncio.gather(*(get_result(m, k) for m, k in zip(meekz, keys))), timeout=timeout_s)
         else:
-            await asyncio.gather(*(get_result(meseex) for meseex in meekz))
+            await asyncio.gather(*(get_result(m, k) for m, k in zip(meekz, keys)))
     except asyncio.TimeoutError:
         if raise_on_error:
             raise
-        # For timed out tasks, set default value for any missing results
-        for meseex in meekz:
-            if meseex.name not in results and meseex.meseex_id not in results.values():
-                if meseex.name not in results:
-                    results[meseex.name] = default_value
-                else:
-                    results[meseex.meseex_id] = default_value
-    
+
+    # Keep the order of the given meekz. Timed out jobs get the default value.
+    results = {key: results.get(key, default_value) for key in keys}
     if results_only:
         return list(results.values())
     return results
@@ -71,31 +81,107 @@ def gather_results(
 ) -> Union[Dict[str, Any], List[Any]]:
     """
     Synchronously gather results from a list of Mr. Meseex instances.
-    
+
     Args:
         meekz: List of Mr. Meseex instances to gather results from
-        timeout_s: Optional timeout in seconds
+        timeout_s: Optional timeout in seconds for the whole batch
         default_value: Value to return if the job has an error or times out
         raise_on_error: If True, raise an exception if a job has an error or times out. Else fills remaining jobs with default_value.
         results_only: If True the results are returned as a list of results. Else the results are returned as a dictionary mapping meseex_id to results.
     Returns:
         Dictionary mapping meseex_id to results
     """
+    meekz = list(meekz)
+    deadline = None if timeout_s is None else time.monotonic() + timeout_s
     results = {}
-    for meseex in meekz:
+    for meseex, key in zip(meekz, _result_keys(meekz)):
+        # All jobs run concurrently, so waiting for one job also lets the others progress.
+        # The deadline is shared by the whole batch.
+        if not meseex.wait(_remaining_s(deadline)):
+            if raise_on_error:
+                raise TimeoutError(f"Meseex {meseex.name} did not finish within {timeout_s}s")
+            print("Meseex timed out: ", meseex.name)
+            results[key] = default_value
+            continue
+
         try:
-            if meseex.name not in results:
-                results[meseex.name] = meseex.wait_for_result(timeout_s=timeout_s)
-            else:
-                results[meseex.meseex_id] = meseex.wait_for_result(timeout_s=timeout_s)
+            results[key] = meseex.get_result()
         except Exception as e:
             if raise_on_error:
                 raise e
             print("Meseex failed: ", meseex.name, "with error: ", e)
-            if meseex.name not in results:
-                results[meseex.name] = default_value
-            else:
-                results[meseex.meseex_id] = default_value
+            results[key] = default_value
     if results_only:
         return list(results.values())
     return results
+
+
+def as_completed(meekz: Iterable[MrMeseex], timeout_s: Optional[float] = None) -> Iterator[MrMeseex]:
+    """
+    Yield Mr. Meseex instances in the order they finish.
+
+    The yielded instances are terminal, so reading their result with get_result() doesn't block.
+
+    Example:
+        for meex in as_completed(meekz, timeout_s=60):
+            print(meex.name, meex.get_result(default_value_on_error=None))
+
+    Args:
+        meekz: The Mr. Meseex instances to wait for
+        timeout_s: Optional timeout in seconds for the whole batch
+
+    Raises:
+        TimeoutError: If not all jobs finished before the timeout.
+    """
+    meekz = list({id(m): m for m in meekz}.values())
+    deadline = None if timeout_s is None else time.monotonic() + timeout_s
+    done_queue: queue.SimpleQueue = queue.SimpleQueue()
+    for meseex in meekz:
+        meseex.add_done_callback(done_queue.put)
+
+    try:
+        for n_done in range(len(meekz)):
+            try:
+                yield done_queue.get(timeout=_remaining_s(deadline))
+            except queue.Empty:
+                raise TimeoutError(f"{len(meekz) - n_done} of {len(meekz)} Meseex jobs did not finish within {timeout_s}s")
+    finally:
+        for meseex in meekz:
+            meseex.remove_done_callback(done_queue.put)
+
+
+async def as_completed_async(meekz: Iterable[MrMeseex], timeout_s: Optional[float] = None) -> AsyncIterator[MrMeseex]:
+    """
+    Asynchronously yield Mr. Meseex instances in the order they finish.
+
+    Example:
+        async for meex in as_completed_async(meekz):
+            print(meex.name, meex.result)
+
+    Args:
+        meekz: The Mr. Meseex instances to wait for
+        timeout_s: Optional timeout in seconds for the whole batch
+
+    Raises:
+        asyncio.TimeoutError: If not all jobs finished before the timeout.
+    """
+    meekz = list({id(m): m for m in meekz}.values())
+    deadline = None if timeout_s is None else time.monotonic() + timeout_s
+    loop = asyncio.get_running_loop()
+    done_queue: asyncio.Queue = asyncio.Queue()
+
+    def on_done(meseex: MrMeseex):
+        loop.call_soon_threadsafe(done_queue.put_nowait, meseex)
+
+    for meseex in meekz:
+        meseex.add_done_callback(on_done)
+
+    try:
+        for n_done in range(len(meekz)):
+            try:
+                yield await asyncio.wait_for(done_queue.get(), timeout=_remaining_s(deadline))
+            except asyncio.TimeoutError:
+                raise asyncio.TimeoutError(f"{len(meekz) - n_done} of {len(meekz)} Meseex jobs did not finish within {timeout_s}s")
+    finally:
+        for meseex in meekz:
+            meseex.remove_done_callback(on_done)
@@ -0,0 +1,80 @@
+from typing import List, Any, Optional, Dict, Union, Iterator, AsyncIterator
+
+from meseex.mr_meseex import MrMeseex
+from meseex.gather import gather_results, gather_results_async, as_completed, as_completed_async
+
+
+class MeseexBatch:
+    """
+    Lightweight handle for Mr. Meseex instances summoned together with MeseexBox.summon_many.
+
+    The batch can be iterated, gathered, streamed in completion order and cancelled as a unit.
+
+    Example:
+        batch = meseex_box.summon_many([{"meal": "steak"}, {"meal": "salad"}])
+        results = batch.gather()            # or: results = await batch
+        for meex in batch.as_completed():
+            print(meex.name, meex.result)
+    """
+    def __init__(self, meekz: List[MrMeseex]):
+        self.meekz = meekz
+
+    def __len__(self) -> int:
+        return len(self.meekz)
+
+    def __iter__(self) -> Iterator[MrMeseex]:
+        return iter(self.meekz)
+
+    def __getitem__(self, index: int) -> MrMeseex:
+        return self.meekz[index]
+
+    @property
+    def is_terminal(self) -> bool:
+        """True if all Mr. Meseex instances of the batch reached a terminal state."""
+        return all(meseex.is_terminal for meseex in self.meekz)
+
+    def gather(
+        self,
+        timeout_s: Optional[float] = None,
+        default_value: Any = None,
+        raise_on_error: bool = False,
+        results_only: bool = True
+    ) -> Union[Dict[str, Any], List[Any]]:
+        """Wait for the whole batch. See gather_results. Returns the results in summon order by default."""
+        return gather_results(self.meekz, timeout_s, default_value, raise_on_error, results_only)
+
+    async def gather_async(
+        self,
+        timeout_s: Optional[float] = None,
+        default_value: Any = None,
+        raise_on_error: bool = False,
+        results_only: bool = True
+    ) -> Union[Dict[str, Any], List[Any]]:
+        """Asynchronously wait for the whole batch. See gather_results_async."""
+        return await gather_results_async(self.meekz, timeout_s, default_value, raise_on_error, results_only)
+
+    def as_completed(self, timeout_s: Optional[float] = None) -> Iterator[MrMeseex]:
+        """Yield the Mr. Meseex instances of the batch in the order they finish."""
+        return as_completed(self.meekz, timeout_s)
+
+    def as_completed_async(self, timeout_s: Optional[float] = None) -> AsyncIterator[MrMeseex]:
+        """Asynchronously yield the Mr. Meseex instances of the batch in the order they finish."""
+        return as_completed_async(self.meekz, timeout_s)
+
+    def cancel(self, cancel_result: Any = None) -> int:
+        """
+        Cancel all Mr. Meseex instances of the batch that are not terminal yet.
+
+        Returns:
+            int: The number of instances cancellation was requested for.
+        """
+        n_cancelled = 0
+        for meseex in self.meekz:
+            if not meseex.is_terminal:
+                meseex.cancel(cancel_result=cancel_result)
+                n_cancelled += 1
+        return n_cancelled
+
+    def __await__(self):
+        """Await all results of the batch in summon order. Raises the first error."""
+        return self.gather_async(raise_on_error=True).__await__()
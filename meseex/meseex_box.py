@@ -1,16 +1,50 @@
 import time
-from typing import Dict, Callable, Union, List, Optional, Any
+import uuid
+import asyncio
+from typing import Dict, Callable, Union, List, Optional, Any, Iterable, Tuple, NamedTuple
 import threading
 from .utils import _expects_mr_meseex_param
-from meseex.control_flow import Repeat
-from meseex.tasks import AsyncTask, TaskExecutor
+from meseex.control_flow import Repeat, Retry
+from meseex.control_flow.retry import _count_retry
+from meseex.tasks import AsyncTask, TaskExecutor, ITaskExecutor
+from meseex.tasks.delay_scheduler import DelayScheduler, ScheduledCall
 from meseex.progress_bar import ProgressBar
-from meseex.mr_meseex import TerminationState, MrMeseex
-from meseex.meseex_store import MeseexStore
+from meseex.mr_meseex import TerminationState, MrMeseex, _resolve_waiter
+from meseex.meseex_store import MeseexStore, MeseexStoreView
+from meseex.meseex_batch import MeseexBatch
+from meseex.task_spec import TaskSpec
+from meseex.stage_gate import StageGate
+from meseex.rate_limiter import TokenBucket
+from meseex.stage_cache import StageCache
+from meseex.single_flight import SingleFlight
+from meseex.checkpoint import ICheckpointStore, MeseexCheckpoint
 import signal
 import traceback
 
 
+class _TaskDispatch(NamedTuple):
+    """How a task is run. Compiled once per task when the MeseexBox is created."""
+    method: Callable
+    expects_meseex: bool
+    executor: ITaskExecutor
+    submit: Callable[..., AsyncTask]
+    gate: Optional[StageGate]
+    rate_limit: Optional[TokenBucket]
+    cache: Optional[StageCache]
+    single_flight: Optional[SingleFlight]
+
+
+# Task signal that holds the cache key of a task whose output is not cached yet
+_CACHE_KEY_SIGNAL = "_stage_cache_key"
+# Task signal that holds the flight key of a Mr. Meseex that leads a single-flight execution
+_SINGLE_FLIGHT_SIGNAL = "_single_flight_key"
+
+
+class QueueFullException(Exception):
+    """Raised by summon if the queue of a MeseexBox is full and the admission policy is 'reject'."""
+    pass
+
+
 class MeseexBox:
     """
     Summon and manage the lifecycle of Mr. Meseex instances while they perform their tasks.
@@ -46,7 +80,23 @@ class MeseexBox:
         # Wait for completion
         result = await meseex
     """
-    def __init__(self, task_methods: Union[Dict[Union[int, str], Callable], List[Callable]], raise_on_meseex_error: bool = False, progress_verbosity: int = 1):
+    def __init__(
+            self,
+            task_methods: Union[Dict[Union[int, str], Callable], List[Callable]],
+            raise_on_meseex_error: bool = False,
+            progress_verbosity: int = 1,
+            max_terminated_meekz: Optional[int] = None,
+            terminated_ttl_s: Optional[float] = None,
+            evict_on_result: bool = False,
+            max_in_flight: Optional[int] = None,
+            max_queued: Optional[int] = None,
+            admission_policy: str = "block",
+            max_workers: int = 10,
+            task_executor: Optional[ITaskExecutor] = None,
+            executors: Optional[Dict[str, ITaskExecutor]] = None,
+            priority_aging_s: Optional[float] = 30.0,
+            checkpoint: Optional[ICheckpointStore] = None
+    ):
         """
         Initialize the MeseexBox with task methods.
         
@@ -55,11 +105,36 @@ class MeseexBox:
                          Task identifiers can be integers (for ordered tasks) or strings
                          (for named tasks). Each handler method should accept a Mr. Meseex
                          parameter and return the modified Mr. Meseex.
+                         Wrap a handler with task(...) to configure it, e.g. task(infer, concurrency=2).
             raise_on_meseex_error: If True, raise an exception if Mr. Meseex has a problem. Only set to true for debugging.
             progress_verbosity: Influences how often updates are seen on the progress bar. Is for example important in cloud environment to reduce amounts of logs.
                 0 = no progress bar
                 1 = progress bar that shows when a task changes its state or progress.
                 2 = progress bar with spinners (default).
+            max_terminated_meekz: Retention policy. Maximum number of terminated Mr. Meseex instances kept in the box.
+                The oldest terminated instances are evicted first. None (default) keeps all of them.
+            terminated_ttl_s: Retention policy. Terminated Mr. Meseex instances are evicted after this many seconds.
+            evict_on_result: Retention policy. If True, a Mr. Meseex is evicted as soon as its result was consumed
+                with wait_for_result, get_result or await.
+                Aggregate totals stay available in meseex_store.totals after eviction.
+            max_in_flight: Maximum number of Mr. Meseex instances working at the same time.
+                Further instances wait in the queue. None (default) starts every instance immediately.
+            max_queued: Maximum number of Mr. Meseex instances waiting in the queue. None (default) is unbounded.
+            admission_policy: What summon does if the queue is full.
+                "block" (default) waits until there is space. Use summon_async to wait without blocking an event loop.
+                "reject" raises a QueueFullException.
+            max_workers: Number of threads of the default executor that runs sync tasks.
+            task_executor: Default executor for all tasks. If None, a TaskExecutor with max_workers threads is created.
+                The box only shuts down the executor it created. A passed executor must be shut down by the caller.
+            executors: Named executors. Route a task to one of them with task(method, executor="name"),
+                for example to separate an I/O pool from a CPU pool.
+                They may be shared with other boxes, so the caller shuts them down.
+            priority_aging_s: Seconds a Mr. Meseex waits in the queue or at a stage gate to gain one priority level.
+                Keeps low priority jobs from starving while high priority jobs keep arriving. None disables aging.
+            checkpoint: Persistent store for the state of the jobs, e.g. SQLiteCheckpointStore("jobs.db").
+                Jobs are saved when they are queued, after every completed task and when they terminate.
+                Call resume() after a restart to continue unfinished jobs from their last completed task.
+                Inputs and task outputs must be picklable. The box closes the store on shutdown.
         Example:
             task_methods = {
                 "prepare": prepare_task,    # First task
@@ -67,23 +142,74 @@ class MeseexBox:
                 "finish": finalize_task    # Third task
             }
         """
+        # Validate before anything is allocated, so a rejected configuration leaks no threads
+        if max_in_flight is not None and max_in_flight < 1:
+            raise ValueError("max_in_flight must be >= 1")
+        if max_queued is not None and max_queued < 1:
+            raise ValueError("max_queued must be >= 1")
+        if admission_policy not in ("block", "reject"):
+            raise ValueError("admission_policy must be 'block' or 'reject'")
+
         # Initialize the meseex store for thread-safe instance management
-        self.meseex_store = MeseexStore()
+        self.meseex_store = MeseexStore(
+            max_terminated=max_terminated_meekz,
+            terminated_ttl_s=terminated_ttl_s,
+            priority_aging_s=priority_aging_s
+        )
+        self.priority_aging_s = priority_aging_s
+        self.checkpoint = checkpoint
+        self.evict_on_result = evict_on_result
+        # Incrementally updated view of the store, used by the background loop for the progress bar
+        self._store_view = MeseexStoreView(self.meseex_store)
         
         if isinstance(task_methods, List):
             self.task_methods = {i: task for i, task in enumerate(task_methods)}
         else:
             self.task_methods = task_methods
 
-        self.async_tasks: Dict[str, AsyncTask] = {}
-        self.task_executor = TaskExecutor(max_workers=10)
+        self.max_in_flight = max_in_flight
+        self.max_queued = max_queued
+        self.admission_policy = admission_policy
+        # Notified whenever space in the queue becomes available. Used for blocking summons.
+        self._queue_space = threading.Condition()
+        # Futures of summon_async calls waiting for space in the queue
+        self._queue_space_waiters: List[Tuple[asyncio.AbstractEventLoop, asyncio.Future]] = []
 
-        self.progress_bar = ProgressBar(progress_verbosity=progress_verbosity)
+        # Lifecycle state is created before any executor, so shutdown works on every box that owns threads
         self._worker_thread = None
         self._shutdown = threading.Event()
+        # Set whenever the background loop has something to do (summon, task transition, shutdown).
+        self._wakeup = threading.Event()
         self._is_running = False
         self.raise_on_meseex_error = raise_on_meseex_error
 
+        # Repeated tasks wait here for their delay instead of occupying an executor thread or a stage slot
+        self.delay_scheduler = DelayScheduler.shared()
+        self._delayed_lock = threading.Lock()
+        self._delayed_calls: Dict[str, ScheduledCall] = {}
+
+        self.async_tasks: Dict[str, AsyncTask] = {}
+        self.task_executor = task_executor if task_executor is not None else TaskExecutor(max_workers=max_workers)
+        # Only the executor created here is shut down by the box
+        self._owns_task_executor = task_executor is None
+        self.executors: Dict[str, ITaskExecutor] = dict(executors or {})
+        # Stages with a concurrency limit hold Mr. Meseex instances at their gate
+        self._stage_gates: Dict[Any, StageGate] = {}
+        self._owned_caches: List[StageCache] = []
+        # Everything needed to submit a task is resolved once here. A transition only needs a dict lookup.
+        try:
+            self._dispatch: Dict[Any, _TaskDispatch] = {
+                key: self._compile_task(key, method) for key, method in self.task_methods.items()
+            }
+        except Exception:
+            # Don't leak the threads of the default executor created above. Executors of the caller stay untouched.
+            if self._owns_task_executor:
+                self.task_executor.shutdown(wait=False)
+            self._shutdown.set()
+            raise
+
+        self.progress_bar = ProgressBar(progress_verbosity=progress_verbosity)
+
         # Add signal handlers. Needed for shutdown if raise_on_meseex_error
         # Only register signal handlers if we're in the main thread
         if threading.current_thread() is threading.main_thread():
@@ -93,16 +219,57 @@ class MeseexBox:
             signal.signal(signal.SIGTERM, signal_handler)
             signal.signal(signal.SIGINT, signal_handler)
 
-    def _refresh_progress(self):
-        snapshot = self.meseex_store.get_state_snapshot()
-        self.progress_bar.update_progress(
-            snapshot["all_meekz"],
-            snapshot["task_map"],
-            snapshot["completed_ids"],
-            snapshot["failed_ids"],
-            snapshot["cancelled_ids"]
+    def _resolve_executor(self, task_key: Any, spec: TaskSpec) -> ITaskExecutor:
+        """Get the executor that runs a task."""
+        if spec.executor is None:
+            return self.task_executor
+        if isinstance(spec.executor, ITaskExecutor):
+            return spec.executor
+        if spec.executor not in self.executors:
+            raise ValueError(f"Task {task_key} uses unknown executor '{spec.executor}'. Known executors: {list(self.executors)}")
+        return self.executors[spec.executor]
+
+    def _compile_task(self, task_key: Any, method: Union[Callable, TaskSpec]) -> _TaskDispatch:
+        """Resolve how a task is run: signature inspection, executor routing, its stage gate, rate limit, cache and single-flight."""
+        spec = method if isinstance(method, TaskSpec) else TaskSpec(method)
+        executor = self._resolve_executor(task_key, spec)
+        try:
+            submit = executor.get_submit(spec.method)
+        except ValueError as e:
+            raise ValueError(f"Task {task_key}: {e}") from e
+        gate = None
+        if spec.concurrency is not None:
+            gate = self._stage_gates[task_key] = StageGate(spec.concurrency, priority_aging_s=self.priority_aging_s)
+        if spec.owns_cache:
+            self._owned_caches.append(spec.cache)
+        return _TaskDispatch(
+            method=spec.method,
+            expects_meseex=_expects_mr_meseex_param(spec.method),
+            executor=executor,
+            submit=submit,
+            gate=gate,
+            rate_limit=spec.rate_limit,
+            cache=spec.cache,
+            single_flight=spec.single_flight
         )
 
+    def _evict_consumed_meseex(self, meseex: MrMeseex):
+        self.meseex_store.evict_terminated(meseex.meseex_id)
+        self._wake()
+
+    def _bind_meseex(self, meseex: MrMeseex):
+        """Attach the handlers of this box to a Mr. Meseex before it is queued."""
+        # Waiters are woken up by the box once the termination is recorded in the store
+        meseex._defer_completion = True
+        if meseex._cancel_handler is None:
+            meseex._cancel_handler = self.cancel_meseex
+        if self.evict_on_result and meseex._result_consumed_handler is None:
+            meseex._result_consumed_handler = self._evict_consumed_meseex
+
+    def _wake(self):
+        """Wake the background loop so it starts queued jobs and refreshes the progress bar."""
+        self._wakeup.set()
+
     @staticmethod
     def _resolve_meseex_id(meseex_or_id: Union[str, MrMeseex]) -> Optional[str]:
         if isinstance(meseex_or_id, MrMeseex):
@@ -119,9 +286,15 @@ class MeseexBox:
             meseex.set_cancel_result(cancel_result)
 
         meseex.mark_cancelled(cancel_result=cancel_result)
+        self._hand_over_flight(meseex)
+        # Jobs interrupted by a shutdown stay unfinished in the checkpoint, so they can be resumed
+        if not self._shutdown.is_set():
+            self._checkpoint([meseex])
         self.async_tasks.pop(meseex.meseex_id, None)
         self.meseex_store.terminate_meseex(meseex.meseex_id)
-        self._refresh_progress()
+        meseex._notify_completion()
+        self._notify_queue_space()
+        self._wake()
 
     def cancel_meseex(self, meseex_or_id: Union[str, MrMeseex], cancel_result: Any = None) -> Optional[MrMeseex]:
         """
@@ -149,8 +322,29 @@ class MeseexBox:
             self._finalize_cancelled_meseex(meseex, cancel_result)
             return meseex
 
-        if meseex_id in self.meseex_store.queued_ids:
+        if self.meseex_store.is_queued(meseex_id):
+            self._finalize_cancelled_meseex(meseex, cancel_result)
+            return meseex
+
+        # Jobs waiting for the delay of a repeated task are not running
+        with self._delayed_lock:
+            delayed_call = self._delayed_calls.pop(meseex_id, None)
+        if delayed_call is not None:
+            delayed_call.cancel()
             self._finalize_cancelled_meseex(meseex, cancel_result)
+            return meseex
+
+        # Jobs waiting for a slot at a stage gate are not running yet
+        for gate in self._stage_gates.values():
+            if gate.remove(meseex):
+                self._finalize_cancelled_meseex(meseex, cancel_result)
+                break
+
+        # Followers of a single-flight execution don't run anything themselves
+        for dispatch in self._dispatch.values():
+            if dispatch.single_flight is not None and dispatch.single_flight.remove(meseex):
+                self._finalize_cancelled_meseex(meseex, cancel_result)
+                break
 
         return meseex
 
@@ -162,11 +356,15 @@ class MeseexBox:
         if not async_task.error:
             return
 
-        error = async_task.error
+        self._fail_with_error(meseex, async_task.error)
+
+    def _fail_with_error(self, meseex: MrMeseex, error: Exception):
         terminate_meseex = meseex.set_error(error)
         if terminate_meseex is None or terminate_meseex:
             self.meseex_store.fail_meseex(meseex.meseex_id)
-            self._refresh_progress()
+            self._checkpoint([meseex])
+            meseex._notify_completion()
+            self._wake()
 
         if self.raise_on_meseex_error:
             print(f"\nError occurred in {meseex.name} task: {meseex.task}")
@@ -175,64 +373,246 @@ class MeseexBox:
             self.shutdown(graceful=False)
             return  # Don't continue to next task
 
-    def _run_async(self, method, meseex: MrMeseex, delay_s: Optional[float] = None):
-        """Run a task using the hybrid executor, optionally after a delay. Then init a task transition."""
-        # The callback handles the result transition
-        callback = lambda async_task: self._result_transition(meseex, async_task)
+    def _run_async(self, dispatch: _TaskDispatch, meseex: MrMeseex, delay_s: Optional[float] = None):
+        """Run a task with its executor, optionally after a delay. Then init a task transition."""
+        if dispatch.rate_limit is not None:
+            # Over the rate limit the task waits for its token in the delay scheduler, not in a thread.
+            # Reserved after the stage gate, so waiting calls can't pile up and burst once they pass the gate.
+            wait_s = dispatch.rate_limit.reserve()
+            if wait_s > 0:
+                delay_s = max(delay_s or 0.0, wait_s)
+        # The callback handles the result transition and frees the slot at the stage gate
+        callback = lambda async_task: self._result_transition(meseex, async_task, dispatch)
         # Submit the task via the executor, passing the delay.
         # If the method expects a MrMeseex parameter, we pass it.
-        if _expects_mr_meseex_param(method):
-            async_task = self.task_executor.submit(method, meseex, callback=callback, delay_s=delay_s)
+        if dispatch.expects_meseex:
+            async_task = dispatch.submit(dispatch.method, meseex, callback=callback, delay_s=delay_s)
         else:
-            async_task = self.task_executor.submit(method, callback=callback, delay_s=delay_s)
+            async_task = dispatch.submit(dispatch.method, callback=callback, delay_s=delay_s)
         
         self.async_tasks[meseex.meseex_id] = async_task
+        # Very fast tasks may have finished before they were registered. Don't leak them.
+        if async_task.is_completed and self.async_tasks.get(meseex.meseex_id) is async_task:
+            self.async_tasks.pop(meseex.meseex_id, None)
         return async_task
-    
+
+    def _resolve_task_key(self, task_name_or_index: Union[str, int], meseex: MrMeseex) -> Any:
+        """Get the key of the task in task_methods using the task name or index of the Mr. Meseex."""
+        if isinstance(task_name_or_index, int) and task_name_or_index < len(meseex.tasks):
+            return meseex.tasks[task_name_or_index]
+        return task_name_or_index
+
     def _run_task(self, task_name_or_index: Union[str, int], meseex: MrMeseex, delay_s: Optional[float] = None):
         if meseex.cancel_requested or meseex.termination_state == TerminationState.CANCELLED:
             self._finalize_cancelled_meseex(meseex, meseex.cancel_result)
             return
 
-        # Get the task method using the task name or index
-        task_method = None
-        if isinstance(task_name_or_index, int) and task_name_or_index < len(meseex.tasks):
-            task_name = meseex.tasks[task_name_or_index]
-            task_method = self.task_methods.get(task_name)
-        else:
-            task_method = self.task_methods.get(task_name_or_index)
+        # Get the task using the task name or index
+        dispatch = self._dispatch.get(self._resolve_task_key(task_name_or_index, meseex))
 
-        if not task_method:
+        if dispatch is None:
             error_msg = f"No task method found for {meseex.name} task: {task_name_or_index}"
             print(f"Warning: {error_msg}")
             meseex.set_error(error_msg, task=str(task_name_or_index))
             # Handle termination after error
             if meseex.is_terminal:
                 self.meseex_store.terminate_meseex(meseex.meseex_id)
-                self._refresh_progress()
+                # Otherwise resume() would pick up the failed job again after every restart
+                self._checkpoint([meseex])
+                meseex._notify_completion()
+                self._wake()
+            return
+
+        if dispatch.cache is not None and self._use_cached_output(dispatch.cache, meseex):
+            return
+
+        if dispatch.single_flight is not None and not self._join_flight(dispatch.single_flight, meseex):
+            # Waits for the output of the Mr. Meseex that runs the same execution
+            return
+
+        self._enter_stage(dispatch, meseex, delay_s)
+
+    def _enter_stage(self, dispatch: _TaskDispatch, meseex: MrMeseex, delay_s: Optional[float] = None):
+        if dispatch.gate is not None and not dispatch.gate.try_enter(meseex, delay_s):
+            # Waits at the stage gate until a running Mr. Meseex leaves the stage
             return
 
-        self._run_async(task_method, meseex, delay_s=delay_s)
+        self._run_async(dispatch, meseex, delay_s=delay_s)
 
-    def _result_transition(self, meseex: MrMeseex, async_task: AsyncTask):
+    def _join_flight(self, single_flight: SingleFlight, meseex: MrMeseex) -> bool:
+        """
+        Join the single-flight execution of the task.
+
+        Returns:
+            bool: True if the Mr. Meseex has to run the task. False if it follows a running leader
+                or failed because the key function raised.
+        """
+        # A repeated task leads its flight already
+        if meseex.get_task_signal(_SINGLE_FLIGHT_SIGNAL) is not None:
+            return True
+
+        try:
+            key = single_flight.key_for(meseex)
+        except Exception as e:
+            # The key function is user code. It must not take down the background loop.
+            self._fail_with_error(meseex, e)
+            return False
+        if key is None:
+            return True
+        if not single_flight.join(key, meseex):
+            return False
+        meseex.set_task_signal(_SINGLE_FLIGHT_SIGNAL, key)
+        return True
+
+    def _complete_flight(self, dispatch: _TaskDispatch, meseex: MrMeseex, output: Any = None, error: Optional[Exception] = None):
+        """Hand the output or error of a leader to the followers of its flight."""
+        key = meseex.get_task_signal(_SINGLE_FLIGHT_SIGNAL)
+        if key is None:
+            return
+        meseex.clear_task_signal(_SINGLE_FLIGHT_SIGNAL)
+
+        for follower in dispatch.single_flight.complete(key):
+            if follower.cancel_requested or follower.termination_state == TerminationState.CANCELLED:
+                self._finalize_cancelled_meseex(follower, follower.cancel_result)
+            elif error is not None:
+                terminate_meseex = follower.set_error(error)
+                if terminate_meseex is None or terminate_meseex:
+                    self.meseex_store.fail_meseex(follower.meseex_id)
+                    self._checkpoint([follower])
+                    follower._notify_completion()
+                    self._wake()
+            else:
+                follower.set_task_output(output)
+                self._continue_to_next_task(follower)
+
+    def _hand_over_flight(self, meseex: MrMeseex):
+        """If a cancelled Mr. Meseex led a single-flight execution, the longest waiting follower runs the task instead."""
+        key = meseex.get_task_signal(_SINGLE_FLIGHT_SIGNAL)
+        if key is None:
+            return
+        meseex.clear_task_signal(_SINGLE_FLIGHT_SIGNAL)
+        dispatch = self._dispatch.get(self._resolve_task_key(meseex.current_task_index, meseex))
+        if dispatch is None or dispatch.single_flight is None:
+            return
+
+        while True:
+            new_leader = dispatch.single_flight.hand_over(key)
+            if new_leader is None:
+                return
+            if self._shutdown.is_set() or new_leader.cancel_requested or new_leader.termination_state == TerminationState.CANCELLED:
+                self._finalize_cancelled_meseex(new_leader, new_leader.cancel_result)
+                continue
+            new_leader.set_task_signal(_SINGLE_FLIGHT_SIGNAL, key)
+            self._enter_stage(dispatch, new_leader)
+            return
+
+    def _leave_gate(self, dispatch: _TaskDispatch):
+        """Free a slot at the stage gate and run the next waiting Mr. Meseex with it."""
+        gate = dispatch.gate
+        entry = gate.leave()
+        while entry is not None:
+            meseex, delay_s = entry
+            if not (meseex.cancel_requested or meseex.termination_state == TerminationState.CANCELLED):
+                self._run_async(dispatch, meseex, delay_s)
+                return
+            self._finalize_cancelled_meseex(meseex, meseex.cancel_result)
+            entry = gate.leave()
+
+    def _result_transition(self, meseex: MrMeseex, async_task: AsyncTask, dispatch: Optional[_TaskDispatch] = None):
         """Handle task results and transition to next task or reschedule polling."""
         self.async_tasks.pop(meseex.meseex_id, None)
+        if dispatch is not None and dispatch.gate is not None:
+            self._leave_gate(dispatch)
 
         if meseex.cancel_requested or meseex.termination_state == TerminationState.CANCELLED:
             self._finalize_cancelled_meseex(meseex, meseex.cancel_result)
             return
 
         if async_task.error:
+            if dispatch is not None and dispatch.single_flight is not None:
+                self._complete_flight(dispatch, meseex, error=async_task.error)
             self._handle_task_error(meseex, async_task)
             return
 
+        # Task changed its state. Let the background loop refresh the progress display.
+        self._wake()
+
         task_result = async_task.result
+        if isinstance(task_result, Retry) and not task_result.counted:
+            # Retries returned without the retry_task decorator are limited as well
+            try:
+                task_result = _count_retry(meseex, task_result)
+            except Exception as e:
+                if dispatch is not None and dispatch.single_flight is not None:
+                    self._complete_flight(dispatch, meseex, error=e)
+                self._fail_with_error(meseex, e)
+                return
+
         if isinstance(task_result, Repeat):
-            self._run_task(meseex.current_task_index, meseex, delay_s=task_result.delay_s)
+            self._repeat_task_later(meseex, task_result.delay_s)
         else:
+            if dispatch is not None and dispatch.cache is not None:
+                cache_key = meseex.get_task_signal(_CACHE_KEY_SIGNAL)
+                if cache_key is not None:
+                    meseex.clear_task_signal(_CACHE_KEY_SIGNAL)
+                    dispatch.cache.put(cache_key, task_result)
+            if dispatch is not None and dispatch.single_flight is not None:
+                self._complete_flight(dispatch, meseex, output=task_result)
             meseex.set_task_output(task_result)
             self._continue_to_next_task(meseex)
 
+    def _use_cached_output(self, cache: StageCache, meseex: MrMeseex) -> bool:
+        """
+        Skip the task if its output is cached. Otherwise remember the cache key to store the output later.
+
+        Returns:
+            bool: True if the task is not run, because the cached output was used and the Mr. Meseex moved on
+                to its next task, or because the key function raised and the Mr. Meseex failed.
+        """
+        # A repeated task was looked up already when it first ran
+        if meseex.get_task_signal(_CACHE_KEY_SIGNAL) is not None:
+            return False
+
+        try:
+            cache_key = cache.key_for(meseex)
+        except Exception as e:
+            # The key function is user code. It must not take down the background loop.
+            self._fail_with_error(meseex, e)
+            return True
+        if cache_key is None:
+            return False
+        found, output = cache.get(cache_key)
+        if not found:
+            # The task might change the inputs of the key function, so the key is computed only once
+            meseex.set_task_signal(_CACHE_KEY_SIGNAL, cache_key)
+            return False
+
+        meseex.set_task_output(output)
+        self._continue_to_next_task(meseex)
+        return True
+
+    def cache_stats(self) -> Dict[Any, Dict[str, int]]:
+        """Hit and miss statistics of the stage caches by task"""
+        return {key: dispatch.cache.stats for key, dispatch in self._dispatch.items() if dispatch.cache is not None}
+
+    def _repeat_task_later(self, meseex: MrMeseex, delay_s: Optional[float]):
+        """Run the current task again once the delay has passed. The slot at the stage gate is only taken when it is due."""
+        if not delay_s:
+            self._run_task(meseex.current_task_index, meseex)
+            return
+
+        def run_when_due():
+            with self._delayed_lock:
+                if self._delayed_calls.pop(meseex.meseex_id, None) is None:
+                    return  # Cancelled in the meantime
+            if self._shutdown.is_set():
+                self._finalize_cancelled_meseex(meseex, meseex.cancel_result)
+                return
+            self._run_task(meseex.current_task_index, meseex)
+
+        with self._delayed_lock:
+            self._delayed_calls[meseex.meseex_id] = self.delay_scheduler.call_later(delay_s, run_when_due)
+
     def _continue_to_next_task(self, meseex: MrMeseex):
         """Helper method to continue Mr. Meseex to next task"""
         if meseex.cancel_requested or meseex.termination_state == TerminationState.CANCELLED:
@@ -249,45 +629,209 @@ class MeseexBox:
         # This happens when the task has a different or shortened task order.
         # Update progress bar and meseex store
         if meseex.is_terminal:
-            # First update task mapping to remove from previous task
-            if prev_task in self.meseex_store.task_map:
-                self.meseex_store.update_meseex_task(meseex.meseex_id, prev_task, None)
-            
-            # Then mark as terminated
+            # Marking as terminated also removes it from the task mapping
             if meseex.error is not None:
                 self.meseex_store.fail_meseex(meseex.meseex_id)
             else:
                 self.meseex_store.terminate_meseex(meseex.meseex_id)
 
-            self._refresh_progress()
+            self._checkpoint([meseex])
+            meseex._notify_completion()
+            self._wake()
             return
         
         # Update task mapping for non-terminal state
         if prev_task != new_task:
             self.meseex_store.update_meseex_task(meseex.meseex_id, prev_task, new_task)
+            # The output of the previous task is recorded. A resumed job continues with the new task.
+            self._checkpoint([meseex], resume_task_index=new_task)
          
         self._run_task(new_task, meseex)
 
-    def summon(self, params=None, meseex_name: str = None) -> MrMeseex:
+    def _create_meseex(self, params: Any = None, meseex_name: str = None, meseex_id: str = None, priority: int = 0) -> MrMeseex:
+        meseex = MrMeseex(
+            tasks=list(self.task_methods.keys()),
+            data=params,
+            name=meseex_name,
+            cancel_handler=self.cancel_meseex,
+            meseex_id=meseex_id,
+            priority=priority
+        )
+        self._bind_meseex(meseex)
+        return meseex
+
+    def _checkpoint(self, meekz: List[MrMeseex], resume_task_index: Optional[int] = None):
+        """
+        Save the state of the meekz to the checkpoint store, if the box has one.
+
+        Args:
+            meekz: The Mr. Meseex instances to save.
+            resume_task_index: The task a resumed job continues with.
+                Defaults to the task after the current one, which is correct for queued and terminated jobs.
+        """
+        if self.checkpoint is None:
+            return
+        try:
+            self.checkpoint.save_many(
+                MeseexCheckpoint.from_meseex(
+                    meseex, meseex.current_task_index + 1 if resume_task_index is None else resume_task_index
+                )
+                for meseex in meekz
+            )
+        except Exception as e:
+            # A failing checkpoint must not break the job itself
+            print(f"Warning: Could not checkpoint {len(meekz)} Mr. Meseex instance(s): {e}")
+
+    def _add_to_queue(self, meekz: List[MrMeseex]):
+        self._checkpoint(meekz)
+        if len(meekz) == 1:
+            self.meseex_store.add_to_queue(meekz[0])
+        else:
+            self.meseex_store.add_many_to_queue(meekz)
+        self.start()
+        self._wake()
+
+    def _free_queue_slots(self) -> int:
+        return max(0, self.max_queued - self.meseex_store.queued_count)
+
+    def _check_admission(self, n_meekz: int):
+        """Raise if the meekz can't be admitted. Must be called while holding the queue space condition."""
+        if self._shutdown.is_set():
+            raise RuntimeError("cannot summon new Mr. Meseex instances after shutdown")
+        if self.admission_policy == "reject" and self._free_queue_slots() < n_meekz:
+            raise QueueFullException(
+                f"MeseexBox queue is full ({self.meseex_store.queued_count}/{self.max_queued} queued)"
+            )
+
+    def _enqueue(self, meekz: List[MrMeseex]):
+        """Add meekz to the queue. Blocks until there is space if max_queued is set and the policy is 'block'."""
+        if self.max_queued is None:
+            self._add_to_queue(meekz)
+            return
+
+        pending = meekz
+        with self._queue_space:
+            self._check_admission(len(pending))
+            while pending:
+                free_slots = self._free_queue_slots()
+                if free_slots == 0:
+                    self._queue_space.wait()
+                    self._check_admission(len(pending))
+                    continue
+                self._add_to_queue(pending[:free_slots])
+                pending = pending[free_slots:]
+
+    async def _enqueue_async(self, meekz: List[MrMeseex]):
+        """Like _enqueue, but waits for space in the queue without blocking the event loop."""
+        if self.max_queued is None:
+            self._add_to_queue(meekz)
+            return
+
+        loop = asyncio.get_running_loop()
+        pending = meekz
+        while pending:
+            with self._queue_space:
+                self._check_admission(len(pending))
+                free_slots = self._free_queue_slots()
+                if free_slots > 0:
+                    self._add_to_queue(pending[:free_slots])
+                    pending = pending[free_slots:]
+                    continue
+                waiter = loop.create_future()
+                self._queue_space_waiters.append((loop, waiter))
+            await waiter
+
+    def _notify_queue_space(self):
+        """Wake up summons waiting for space in the queue."""
+        if self.max_queued is None:
+            return
+
+        with self._queue_space:
+            self._queue_space.notify_all()
+            waiters, self._queue_space_waiters = self._queue_space_waiters, []
+
+        for loop, waiter in waiters:
+            try:
+                loop.call_soon_threadsafe(_resolve_waiter, waiter)
+            except RuntimeError:
+                pass
+
+    def summon(self, params=None, meseex_name: str = None, priority: int = 0) -> MrMeseex:
         """
         Create and start a new Mr. Meseex instance.
         
         Creates a new Mr. Meseex with the given parameters and starts its execution
         through the defined tasks.
+        If max_queued is set and the queue is full, this blocks until there is space
+        or raises a QueueFullException, depending on the admission_policy.
+        Don't summon into a full box with the blocking policy from inside one of its own tasks.
         
         Args:
             params: Optional input parameters to pass to the Mr. Meseex
             meseex_name: Optional name for the Mr. Meseex (defaults to generated identifier)
+            priority: Higher priorities are started first and are admitted first at stage gates.
+                Jobs with the same priority keep their order.
             
         Returns:
             MrMeseex: The created Mr. Meseex instance
         """
-        meseex = MrMeseex(tasks=list(self.task_methods.keys()), data=params, name=meseex_name, cancel_handler=self.cancel_meseex)
+        meseex = self._create_meseex(params, meseex_name, priority=priority)
+        self._enqueue([meseex])
+        return meseex
 
-        self.meseex_store.add_to_queue(meseex)
-        self.start()
+    async def summon_async(self, params=None, meseex_name: str = None, priority: int = 0) -> MrMeseex:
+        """
+        Like summon, but waits for space in a full queue without blocking the event loop.
+
+        Args:
+            params: Optional input parameters to pass to the Mr. Meseex
+            meseex_name: Optional name for the Mr. Meseex (defaults to generated identifier)
+            priority: Higher priorities are started first and are admitted first at stage gates.
+
+        Returns:
+            MrMeseex: The created Mr. Meseex instance
+        """
+        meseex = self._create_meseex(params, meseex_name, priority=priority)
+        await self._enqueue_async([meseex])
         return meseex
 
+    def summon_many(
+            self,
+            iterable_of_params: Iterable[Any],
+            names: Optional[Iterable[str]] = None,
+            priority: int = 0
+    ) -> MeseexBatch:
+        """
+        Create and start many Mr. Meseex instances at once.
+
+        All instances are added to the store with a single lock acquisition and the
+        background loop is woken up only once, which makes large fan-outs cheap.
+        With max_queued set, the instances are added in chunks as space becomes available.
+        With the 'reject' admission policy either all or none of the instances are admitted.
+
+        Args:
+            iterable_of_params: The input parameters. One Mr. Meseex is summoned per item.
+            names: Optional names. Must have the same length as iterable_of_params.
+            priority: Priority of all summoned instances. Higher priorities are started first.
+
+        Returns:
+            MeseexBatch: Handle to gather or cancel the summoned Mr. Meseex instances as a unit.
+        """
+        params_list = list(iterable_of_params)
+        names_list = list(names) if names is not None else [None] * len(params_list)
+        if len(names_list) != len(params_list):
+            raise ValueError("names must have the same length as iterable_of_params")
+
+        # One random token per batch instead of one UUID per Mr. Meseex
+        batch_token = uuid.uuid4().hex
+        meekz = [
+            self._create_meseex(params, name, meseex_id=f"meseex_{batch_token}_{i}", priority=priority)
+            for i, (params, name) in enumerate(zip(params_list, names_list))
+        ]
+        if meekz:
+            self._enqueue(meekz)
+        return MeseexBatch(meekz)
+
     def summon_meseex(self, meseex: MrMeseex) -> MrMeseex:
         """
         Add an existing Mr. Meseex instance to the box.
@@ -301,62 +845,106 @@ class MeseexBox:
         Returns:
             MrMeseex: The added Mr. Meseex instance
         """
-        if meseex._cancel_handler is None:
-            meseex._cancel_handler = self.cancel_meseex
-        self.meseex_store.add_to_queue(meseex)
-        self.start()
+        self._bind_meseex(meseex)
+        self._enqueue([meseex])
         return meseex
 
+    def resume(self) -> MeseexBatch:
+        """
+        Continue the unfinished jobs of the checkpoint store, e.g. after a restart of the process.
+
+        Every job continues with the first task whose output was not recorded. Outputs of completed tasks
+        are restored, so expensive earlier tasks are not computed again. A task that was running when the
+        process stopped runs again from the start. Jobs already known to this box are skipped.
+
+        Returns:
+            MeseexBatch: Handle to gather or cancel the resumed Mr. Meseex instances.
+        """
+        if self.checkpoint is None:
+            raise ValueError("resume needs a MeseexBox with a checkpoint store")
+
+        meekz = []
+        for checkpoint in self.checkpoint.load_unfinished():
+            if self.meseex_store.get_meseex(checkpoint.meseex_id) is not None:
+                continue
+            meseex = MrMeseex(
+                tasks=list(checkpoint.tasks),
+                data=checkpoint.input,
+                name=checkpoint.name,
+                cancel_handler=self.cancel_meseex,
+                meseex_id=checkpoint.meseex_id,
+                priority=checkpoint.priority
+            )
+            meseex.task_outputs.update(checkpoint.task_outputs)
+            # Queued jobs are started with next_task, which moves them to the task to resume
+            meseex.current_task_index = checkpoint.resume_task_index - 1
+            self._bind_meseex(meseex)
+            meekz.append(meseex)
+
+        if meekz:
+            self._enqueue(meekz)
+        return MeseexBatch(meekz)
+
+    def _has_free_slot(self) -> bool:
+        return self.max_in_flight is None or self.meseex_store.working_count < self.max_in_flight
+
     def _start_queued_meekz(self):
-        """Start processing queued Meseex instances"""
+        """Start processing queued Meseex instances while there are free slots"""
+        started_any = False
         # Using atomic pop operation to prevent deadlocks
-        while self.meseex_store.has_queued():
+        while self._has_free_slot() and self.meseex_store.has_queued():
             meseex_id, meseex = self.meseex_store.pop_next_queued()
+            started_any = True
             if meseex:
                 if meseex.cancel_requested or meseex.termination_state == TerminationState.CANCELLED:
                     self._finalize_cancelled_meseex(meseex, meseex.cancel_result)
                     continue
                 self._continue_to_next_task(meseex)
 
+        if started_any:
+            self._notify_queue_space()
+
+    def _update_progress_display(self) -> bool:
+        """
+        Apply the latest store transitions to the view and render it on the progress bar.
+
+        Returns:
+            bool: True if there are still queued or working Meseex instances.
+        """
+        view = self._store_view
+        changed = view.refresh()
+        has_active = view.active_count > 0
+        # Only update the UI if there's been a state change or if tasks are still active
+        if changed or has_active:
+            self.progress_bar.update_progress(view)
+        return has_active
+
     def _process_meekz_in_background(self) -> None:
-        """Background thread that processes Meseex instances"""
-        last_active_count = 0
-        last_all_completed = False
-        
+        """
+        Background thread that processes Meseex instances.
+
+        The loop sleeps until it is woken by a summon, a task transition or shutdown.
+        While jobs are active and the progress bar is shown, it additionally wakes up
+        once per progress refresh interval to animate spinners and show task progress,
+        and when the oldest terminated job expires under the retention policy.
+        """
         while not self._shutdown.is_set() and self._is_running:
             try:
+                # Clear before processing, so wakeups that arrive while we work are not lost.
+                self._wakeup.clear()
                 self._start_queued_meekz()
-                
-                # Get a snapshot for consistent state
-                snapshot = self.meseex_store.get_state_snapshot()
-                
-                # Detect all jobs completed
-                active_count = len(snapshot["working_ids"]) + len(snapshot["queued_ids"])
-                task_count = len(snapshot["completed_ids"]) + len(snapshot["failed_ids"])
-                all_completed = (active_count == 0) and (task_count > 0)
-                
-                # Only update the UI if there's been a state change or if tasks are still active
-                if (last_active_count != active_count) or (last_all_completed != all_completed) or not all_completed:
-                    # Update the progress bar
-                    self.progress_bar.update_progress(
-                        snapshot["all_meekz"],
-                        snapshot["task_map"],
-                        snapshot["completed_ids"],
-                        snapshot["failed_ids"],
-                        snapshot["cancelled_ids"]
-                    )
-                
-                # Store state for next iteration
-                last_active_count = active_count
-                last_all_completed = all_completed
-                
-                # More responsive shutdown check
-                if self._shutdown.wait(timeout=0.01):
-                    break
-                    
-                # If all completed, slow down the update loop
-                if all_completed:
-                    time.sleep(0.05)
+                self.meseex_store.evict_expired()
+
+                has_active = False
+                if self.progress_bar.enabled:
+                    has_active = self._update_progress_display()
+
+                timeout = self.progress_bar.refresh_interval_s if has_active else None
+                # Wake up in time for the next retention expiry
+                expiry = self.meseex_store.seconds_until_next_expiry()
+                if expiry is not None:
+                    timeout = expiry if timeout is None else min(timeout, expiry)
+                self._wakeup.wait(timeout=timeout)
             except Exception as e:
                 if not self._shutdown.is_set():
                     import traceback
@@ -392,6 +980,9 @@ class MeseexBox:
         # First, stop accepting new tasks
         self._is_running = False
         self._shutdown.set()
+        self._wakeup.set()
+        # Blocked summons raise instead of waiting forever
+        self._notify_queue_space()
 
         if not graceful:
             # Cancel all running tasks
@@ -399,6 +990,7 @@ class MeseexBox:
                 meseex = self.meseex_store.get_meseex(meseex_id)
                 if meseex:
                     meseex.termination_state = TerminationState.CANCELLED
+                    meseex._notify_completion()
             
             # Force kill the process
             import signal
@@ -409,25 +1001,37 @@ class MeseexBox:
             time.sleep(1)
             os.kill(os.getpid(), signal.SIGKILL)
         else:
-            # Graceful shutdown
-            self.task_executor.shutdown(wait=True)
-            
+            # Graceful shutdown. Repeated tasks that are still waiting for their delay are cancelled.
+            with self._delayed_lock:
+                delayed_calls, self._delayed_calls = self._delayed_calls, {}
+            for meseex_id, delayed_call in delayed_calls.items():
+                delayed_call.cancel()
+                meseex = self.meseex_store.get_meseex(meseex_id)
+                if meseex is not None:
+                    self._finalize_cancelled_meseex(meseex, meseex.cancel_result)
+
+            # Executors passed in by the caller may be shared and are left running
+            if self._owns_task_executor:
+                self.task_executor.shutdown(wait=True)
+
+            worker_thread = self._worker_thread
+            if worker_thread and worker_thread.is_alive() and worker_thread is not threading.current_thread():
+                worker_thread.join(timeout=5.0)
+                self._worker_thread = None
+
+            # The worker thread may still save checkpoints until it was joined
+            if self.checkpoint is not None:
+                self.checkpoint.close()
+            # Caches passed in by the caller may be shared and are left open
+            for cache in self._owned_caches:
+                cache.close()
+
             # Force one final UI update to ensure all completed tasks are shown
-            snapshot = self.meseex_store.get_state_snapshot()
-            self.progress_bar.update_progress(
-                snapshot["all_meekz"],
-                snapshot["task_map"],
-                snapshot["completed_ids"],
-                snapshot["failed_ids"],
-                snapshot["cancelled_ids"]
-            )
-            
+            if self.progress_bar.enabled:
+                self._update_progress_display()
+
             # Now stop the progress bar display
             self.progress_bar.stop()
-            
-            if self._worker_thread and self._worker_thread.is_alive():
-                self._worker_thread.join(timeout=5.0)
-                self._worker_thread = None
 
     async def __aenter__(self):
         """Async context manager entry"""
@@ -439,4 +1043,7 @@ class MeseexBox:
         self.shutdown()
 
     def __del__(self):
+        # __init__ may have raised before the box was complete. Then there is nothing to shut down.
+        if getattr(self, "_shutdown", None) is None:
+            return
         self.shutdown()
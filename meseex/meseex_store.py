@@ -1,25 +1,118 @@
 import threading
-from collections import deque
-from typing import Optional, Set, Dict, List, Any, Tuple
+import time
+from collections import deque, OrderedDict
+from typing import Optional, Set, Dict, List, Any, Tuple, NamedTuple
 
 from meseex.mr_meseex import MrMeseex, TerminationState
+from meseex.priority_queue import AgingPriorityQueue
+
+
+class StateChange(NamedTuple):
+    """A single state transition recorded in the change log of the MeseexStore."""
+    version: int
+    meseex_id: str
+    # One of: "queued", "working", "task", "completed", "failed", "cancelled", "removed"
+    state: str
+    # The new task of the Meseex for "task" changes. None if it left its task.
+    task: Any = None
 
 
 class MeseexStore:
-    """Thread-safe storage for Mr. Meseex instances with efficient lookups"""
+    """
+    Thread-safe storage for Mr. Meseex instances with efficient lookups.
+
+    Every state transition increments the store version and is appended to a bounded change log.
+    Consumers remember the last version they have seen and call changes_since(version),
+    so their work per update is proportional to the number of changes instead of the store size.
+
+    Terminated Meseex instances can be evicted by a retention policy. Aggregate totals
+    are kept in counters, so they stay correct after the individual records are dropped.
+
+    Queued Meseex instances are started by priority (higher first) and in order of arrival within a priority.
+    With aging, waiting jobs slowly gain priority, so bulk jobs still start while urgent jobs keep arriving.
+    """
 
-    def __init__(self):
+    def __init__(
+            self,
+            max_change_log_size: int = 100_000,
+            max_terminated: Optional[int] = None,
+            terminated_ttl_s: Optional[float] = None,
+            priority_aging_s: Optional[float] = 30.0
+    ):
+        """
+        Args:
+            max_change_log_size: Number of transitions kept in the change log.
+                Consumers that fall further behind need to resync with get_state_snapshot().
+            max_terminated: Maximum number of terminated Meseex instances to keep.
+                The oldest terminated instances are evicted first. None keeps all.
+            terminated_ttl_s: Terminated Meseex instances are evicted after this many seconds
+                by evict_expired(). None keeps them forever.
+            priority_aging_s: Seconds a queued Meseex waits to gain one priority level.
+                Prevents starvation of low priority jobs. None disables aging.
+        """
+        if max_terminated is not None and max_terminated < 0:
+            raise ValueError("max_terminated must be >= 0")
+        if terminated_ttl_s is not None and terminated_ttl_s < 0:
+            raise ValueError("terminated_ttl_s must be >= 0")
+
+        self.max_terminated = max_terminated
+        self.terminated_ttl_s = terminated_ttl_s
         self._lock = threading.Lock()
+        # Monotonically increasing version; incremented with every recorded transition
+        self._version = 0
+        self._changes: deque[StateChange] = deque(maxlen=max_change_log_size)
         # All active Meseex instances
         self._meekz: Dict[str, MrMeseex] = {}
-        # Reference lists for different states
-        self._queued: deque[str] = deque()
+        # Reference lists for different states.
+        # Queued jobs ordered by priority, then by arrival. Removing a queued job is O(1).
+        self._queued = AgingPriorityQueue(aging_s=priority_aging_s)
         self._working: Set[str] = set()
         self._completed: Set[str] = set()
         self._failed: Set[str] = set()
         self._cancelled: Set[str] = set()
         # Task to Meseex ID mapping
         self._task_meekz: Dict[Any, Set[str]] = {}
+        # Terminated Meseex IDs in order of termination with their monotonic termination time
+        self._terminated_at: OrderedDict[str, float] = OrderedDict()
+        # Aggregate counters that survive the eviction of individual records
+        self._totals: Dict[str, int] = {"summoned": 0, "completed": 0, "failed": 0, "cancelled": 0, "evicted": 0}
+
+    def _record_change(self, meseex_id: str, state: str, task: Any = None) -> None:
+        """Append a transition to the change log. Must be called while holding the lock."""
+        self._version += 1
+        self._changes.append(StateChange(self._version, meseex_id, state, task))
+
+    @property
+    def version(self) -> int:
+        """The version of the most recent transition"""
+        return self._version
+
+    def changes_since(self, version: int) -> Tuple[int, Optional[List[StateChange]]]:
+        """
+        Get all transitions that happened after the given version.
+
+        Args:
+            version: The last version the consumer has seen. Use 0 to start from the beginning.
+
+        Returns:
+            Tuple of (current version, changes in order). The changes are None if the requested
+            version is no longer covered by the change log. In that case the consumer has to
+            resync with get_state_snapshot().
+        """
+        with self._lock:
+            if version >= self._version:
+                return self._version, []
+
+            if not self._changes or self._changes[0].version > version + 1:
+                return self._version, None
+
+            changes = []
+            for change in reversed(self._changes):
+                if change.version <= version:
+                    break
+                changes.append(change)
+            changes.reverse()
+            return self._version, changes
 
     def get_meseex(self, meseex_id: str) -> Optional[MrMeseex]:
         """Get a Meseex instance by ID"""
@@ -29,12 +122,28 @@ class MeseexStore:
         """Add a new Meseex to the queue"""
         with self._lock:
             self._meekz[meseex.meseex_id] = meseex
-            self._queued.append(meseex.meseex_id)
+            self._queued.push(meseex.meseex_id, priority=meseex.priority)
+            self._totals["summoned"] += 1
+            self._record_change(meseex.meseex_id, "queued")
+
+    def add_many_to_queue(self, meekz: List[MrMeseex]) -> None:
+        """Add many new Meseex instances to the queue with a single lock acquisition"""
+        with self._lock:
+            for meseex in meekz:
+                self._meekz[meseex.meseex_id] = meseex
+                self._queued.push(meseex.meseex_id, priority=meseex.priority)
+                self._record_change(meseex.meseex_id, "queued")
+            self._totals["summoned"] += len(meekz)
+
+    def is_queued(self, meseex_id: str) -> bool:
+        """Check if a Meseex is waiting in the queue"""
+        with self._lock:
+            return meseex_id in self._queued
 
     def get_next_queued(self) -> Optional[str]:
         """Get the next queued Meseex ID without removing it"""
         with self._lock:
-            return self._queued[0] if self._queued else None
+            return self._queued.peek()
 
     def move_to_working(self, meseex_id: str, task: Any = None) -> Optional[MrMeseex]:
         """Move a Meseex from queue to working state and assign to a task"""
@@ -42,6 +151,7 @@ class MeseexStore:
             if meseex_id in self._queued:
                 self._queued.remove(meseex_id)
                 self._working.add(meseex_id)
+                self._record_change(meseex_id, "working")
                 meseex = self._meekz.get(meseex_id)
                 
                 if task is not None and meseex is not None:
@@ -49,6 +159,7 @@ class MeseexStore:
                     if task not in self._task_meekz:
                         self._task_meekz[task] = set()
                     self._task_meekz[task].add(meseex_id)
+                    self._record_change(meseex_id, "task", task)
                 
                 return meseex
         return None
@@ -56,13 +167,23 @@ class MeseexStore:
     def pop_next_queued(self) -> Tuple[str, MrMeseex]:
         """Atomically get and remove the next queued Meseex, and move it to working state"""
         with self._lock:
-            if not self._queued:
+            meseex_id, _ = self._queued.pop()
+            if meseex_id is None:
                 return None, None
-                
-            meseex_id = self._queued.popleft()
             self._working.add(meseex_id)
+            self._record_change(meseex_id, "working")
             return meseex_id, self._meekz.get(meseex_id)
 
+    @property
+    def queued_count(self) -> int:
+        """Number of queued Meseex instances"""
+        return len(self._queued)
+
+    @property
+    def working_count(self) -> int:
+        """Number of working Meseex instances"""
+        return len(self._working)
+
     def has_queued(self) -> bool:
         """Check if there are any queued Meseex instances"""
         with self._lock:
@@ -81,30 +202,52 @@ class MeseexStore:
                     self._task_meekz[new_task] = set()
                 self._task_meekz[new_task].add(meseex_id)
 
+            self._record_change(meseex_id, "task", new_task)
+
+    def _mark_terminated(self, meseex_id: str, state: str) -> None:
+        """Move a Meseex into a terminal state set. Must be called while holding the lock."""
+        state_sets = {"completed": self._completed, "failed": self._failed, "cancelled": self._cancelled}
+        target = state_sets[state]
+        if meseex_id in target:
+            return
+
+        self._working.discard(meseex_id)
+        for other in state_sets.values():
+            other.discard(meseex_id)
+        target.add(meseex_id)
+        self._record_change(meseex_id, state)
+
+        # Count every Meseex only once, even if its terminal state is corrected afterwards
+        if meseex_id not in self._terminated_at:
+            self._totals[state] += 1
+            self._terminated_at[meseex_id] = time.monotonic()
+            if self.max_terminated is not None:
+                while len(self._terminated_at) > self.max_terminated:
+                    oldest_id, _ = self._terminated_at.popitem(last=False)
+                    self._remove(oldest_id, evicted=True)
+
     def complete_meseex(self, meseex_id: str) -> None:
         """Mark a Meseex as completed"""
         with self._lock:
             meseex = self._meekz.get(meseex_id)
             if meseex_id in self._working and meseex:
-                self._working.remove(meseex_id)
-                self._completed.add(meseex_id)
-                
                 # Remove from any task mappings
                 if meseex.current_task_index in self._task_meekz:
                     self._task_meekz[meseex.current_task_index].discard(meseex_id)
 
+                self._mark_terminated(meseex_id, "completed")
+
     def fail_meseex(self, meseex_id: str) -> None:
         """Mark a Meseex as failed"""
         with self._lock:
             meseex = self._meekz.get(meseex_id)
             if meseex_id in self._working and meseex:
-                self._working.remove(meseex_id)
-                self._failed.add(meseex_id)
-                
                 # Remove from any task mappings
                 if meseex.current_task_index in self._task_meekz:
                     self._task_meekz[meseex.current_task_index].discard(meseex_id)
 
+                self._mark_terminated(meseex_id, "failed")
+
     def terminate_meseex(self, meseex_id: str) -> None:
         """Handle termination state of a Meseex"""
         with self._lock:
@@ -117,55 +260,117 @@ class MeseexStore:
                 self._task_meekz[meseex.current_task_index].discard(meseex_id)
             
             # Now update the state
+            self._queued.remove(meseex_id)
             if meseex.termination_state == TerminationState.SUCCESS:
-                self._queued = deque(m_id for m_id in self._queued if m_id != meseex_id)
-                self._working.discard(meseex_id)
-                self._completed.add(meseex_id)
+                self._mark_terminated(meseex_id, "completed")
             elif meseex.termination_state == TerminationState.FAILED:
-                self._queued = deque(m_id for m_id in self._queued if m_id != meseex_id)
-                self._working.discard(meseex_id)
-                self._failed.add(meseex_id)
+                self._mark_terminated(meseex_id, "failed")
             elif meseex.termination_state == TerminationState.CANCELLED:
-                self._queued = deque(m_id for m_id in self._queued if m_id != meseex_id)
-                self._working.discard(meseex_id)
-                self._cancelled.add(meseex_id)
+                self._mark_terminated(meseex_id, "cancelled")
+
+    def _remove(self, meseex_id: str, evicted: bool = False) -> None:
+        """Remove a Meseex from all collections. Must be called while holding the lock."""
+        # Remove from state collections
+        self._queued.remove(meseex_id)
+        self._working.discard(meseex_id)
+        self._completed.discard(meseex_id)
+        self._failed.discard(meseex_id)
+        self._cancelled.discard(meseex_id)
+        self._terminated_at.pop(meseex_id, None)
+
+        # Remove from task mapping
+        meseex = self._meekz.get(meseex_id)
+        if meseex and meseex.current_task_index in self._task_meekz:
+            self._task_meekz[meseex.current_task_index].discard(meseex_id)
+
+        # Remove from main collection
+        if self._meekz.pop(meseex_id, None) is not None:
+            self._record_change(meseex_id, "removed")
+            if evicted:
+                self._totals["evicted"] += 1
 
     def remove_meseex(self, meseex_id: str) -> None:
         """Remove a Meseex completely from all collections"""
         with self._lock:
-            # Remove from state collections
-            self._queued = deque(m_id for m_id in self._queued if m_id != meseex_id)
-            self._working.discard(meseex_id)
-            self._completed.discard(meseex_id)
-            self._failed.discard(meseex_id)
-            self._cancelled.discard(meseex_id)
-            
-            # Remove from task mapping
-            meseex = self._meekz.get(meseex_id)
-            if meseex and meseex.current_task_index in self._task_meekz:
-                self._task_meekz[meseex.current_task_index].discard(meseex_id)
-                
-            # Remove from main collection
-            self._meekz.pop(meseex_id, None)
+            self._remove(meseex_id)
+
+    def evict_terminated(self, meseex_id: str) -> bool:
+        """
+        Evict a Meseex if it is terminated. Used to drop records once their result was consumed.
+
+        Returns:
+            bool: True if the Meseex was evicted.
+        """
+        with self._lock:
+            if meseex_id not in self._terminated_at:
+                return False
+            self._remove(meseex_id, evicted=True)
+            return True
+
+    def evict_expired(self, now: Optional[float] = None) -> int:
+        """
+        Evict all terminated Meseex instances older than terminated_ttl_s.
+
+        Args:
+            now: Optional time.monotonic() timestamp to compare against.
+
+        Returns:
+            int: The number of evicted Meseex instances.
+        """
+        if self.terminated_ttl_s is None:
+            return 0
+
+        now = time.monotonic() if now is None else now
+        evicted = 0
+        with self._lock:
+            while self._terminated_at:
+                oldest_id, terminated_at = next(iter(self._terminated_at.items()))
+                if now - terminated_at < self.terminated_ttl_s:
+                    break
+                self._terminated_at.popitem(last=False)
+                self._remove(oldest_id, evicted=True)
+                evicted += 1
+        return evicted
+
+    def seconds_until_next_expiry(self) -> Optional[float]:
+        """Seconds until the oldest terminated Meseex expires. None if nothing can expire."""
+        if self.terminated_ttl_s is None:
+            return None
+
+        with self._lock:
+            if not self._terminated_at:
+                return None
+            oldest_terminated_at = next(iter(self._terminated_at.values()))
+        return max(0.0, oldest_terminated_at + self.terminated_ttl_s - time.monotonic())
+
+    @property
+    def totals(self) -> Dict[str, int]:
+        """
+        Aggregate counters over the lifetime of the store.
+        Contains the number of summoned, completed, failed, cancelled and evicted Meseex instances.
+        """
+        with self._lock:
+            return self._totals.copy()
 
     def get_state_snapshot(self):
         """Get a consistent snapshot of the current state"""
         with self._lock:
             return {
+                "version": self._version,
                 "all_meekz": self._meekz.copy(),
                 "task_map": {task: set(ids) for task, ids in self._task_meekz.items()},
                 "completed_ids": self._completed.copy(),
                 "failed_ids": self._failed.copy(),
                 "cancelled_ids": self._cancelled.copy(),
                 "working_ids": self._working.copy(),
-                "queued_ids": list(self._queued)
+                "queued_ids": self._queued.ordered_ids()
             }
 
     @property
     def queued_meekz(self) -> List[MrMeseex]:
         """Get all queued Meseex instances"""
         with self._lock:
-            return [self._meekz[m_id] for m_id in self._queued]
+            return [self._meekz[m_id] for m_id in self._queued.ordered_ids()]
 
     @property
     def working_meekz(self) -> List[MrMeseex]:
@@ -239,3 +444,119 @@ class MeseexStore:
         """Get IDs of all terminated (completed or failed) Meseex instances"""
         with self._lock:
             return self._completed.union(self._failed).union(self._cancelled)
+
+
+class MeseexStoreView:
+    """
+    Incrementally maintained copy of the MeseexStore state for a single consumer thread.
+
+    refresh() applies only the transitions since the last refresh. If the consumer fell behind
+    the change log, the view resyncs from a full snapshot.
+    """
+
+    _STATE_SETS = {
+        "queued": "queued_ids",
+        "working": "working_ids",
+        "completed": "completed_ids",
+        "failed": "failed_ids",
+        "cancelled": "cancelled_ids",
+    }
+
+    def __init__(self, store: MeseexStore):
+        self._store = store
+        self.version = 0
+        self.all_meekz: Dict[str, MrMeseex] = {}
+        self.task_map: Dict[Any, Set[str]] = {}
+        self.queued_ids: Set[str] = set()
+        self.working_ids: Set[str] = set()
+        self.completed_ids: Set[str] = set()
+        self.failed_ids: Set[str] = set()
+        self.cancelled_ids: Set[str] = set()
+        # Current state set and task of every Meseex in the view
+        self._state_of: Dict[str, str] = {}
+        self._task_of: Dict[str, Any] = {}
+        # Transitions applied by the last refresh. None if it resynced from a snapshot.
+        self.last_changes: Optional[List[StateChange]] = []
+
+    @property
+    def active_count(self) -> int:
+        """Number of queued and working Meseex instances"""
+        return len(self.queued_ids) + len(self.working_ids)
+
+    @property
+    def active_ids(self) -> Set[str]:
+        """IDs of the queued and working Meseex instances"""
+        return self.queued_ids | self.working_ids
+
+    @property
+    def terminated_count(self) -> int:
+        """Number of completed, failed and cancelled Meseex instances"""
+        return len(self.completed_ids) + len(self.failed_ids) + len(self.cancelled_ids)
+
+    def refresh(self) -> bool:
+        """
+        Bring the view up to date with the store.
+
+        Returns:
+            bool: True if anything changed since the last refresh.
+        """
+        version, changes = self._store.changes_since(self.version)
+        self.last_changes = changes
+        if changes is None:
+            self._resync()
+            return True
+
+        for change in changes:
+            self._apply(change)
+        self.version = version
+        return len(changes) > 0
+
+    def _resync(self):
+        snapshot = self._store.get_state_snapshot()
+        self.version = snapshot["version"]
+        self.all_meekz = snapshot["all_meekz"]
+        self.task_map = snapshot["task_map"]
+        self.queued_ids = set(snapshot["queued_ids"])
+        self.working_ids = snapshot["working_ids"]
+        self.completed_ids = snapshot["completed_ids"]
+        self.failed_ids = snapshot["failed_ids"]
+        self.cancelled_ids = snapshot["cancelled_ids"]
+        self._state_of = {}
+        for state, attr in self._STATE_SETS.items():
+            for meseex_id in getattr(self, attr):
+                self._state_of[meseex_id] = state
+        self._task_of = {meseex_id: task for task, ids in self.task_map.items() for meseex_id in ids}
+
+    def _set_task(self, meseex_id: str, task: Any):
+        old_task = self._task_of.pop(meseex_id, None)
+        if old_task is not None and old_task in self.task_map:
+            self.task_map[old_task].discard(meseex_id)
+        if task is not None:
+            self.task_map.setdefault(task, set()).add(meseex_id)
+            self._task_of[meseex_id] = task
+
+    def _set_state(self, meseex_id: str, state: Optional[str]):
+        old_state = self._state_of.pop(meseex_id, None)
+        if old_state is not None:
+            getattr(self, self._STATE_SETS[old_state]).discard(meseex_id)
+        if state is not None:
+            getattr(self, self._STATE_SETS[state]).add(meseex_id)
+            self._state_of[meseex_id] = state
+
+    def _apply(self, change: StateChange):
+        meseex_id = change.meseex_id
+        if change.state == "task":
+            self._set_task(meseex_id, change.task)
+        elif change.state == "removed":
+            self._set_task(meseex_id, None)
+            self._set_state(meseex_id, None)
+            self.all_meekz.pop(meseex_id, None)
+        else:
+            if change.state == "queued":
+                meseex = self._store.get_meseex(meseex_id)
+                if meseex is None:
+                    return
+                self.all_meekz[meseex_id] = meseex
+            elif change.state in ("completed", "failed", "cancelled"):
+                self._set_task(meseex_id, None)
+            self._set_state(meseex_id, change.state)
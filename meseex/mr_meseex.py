@@ -1,12 +1,16 @@
-from datetime import datetime, timezone
+from datetime import datetime
 from typing import Dict, Any, Union, List, Optional, Tuple, Callable
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 from enum import Enum, auto
-import time
+from array import array
+import itertools
+import asyncio
 import traceback
 import threading
 import uuid
 
+from meseex.clock import now_ns, to_datetime, now_datetime
+
 
 class TerminationState(Enum):
     SUCCESS = auto()
@@ -20,13 +24,14 @@ class TaskProgress(BaseModel):
 
 
 class TaskMeta(BaseModel):
-    entered_at: datetime = datetime.now(timezone.utc)
+    entered_at: datetime = Field(default_factory=now_datetime)
     left_at: Optional[datetime] = None
     progress: Optional[TaskProgress] = None
 
     @property
     def duration_ms(self) -> float:
-        left_at = self.left_at or datetime.now(timezone.utc)
+        # now_datetime is derived from the monotonic clock like the timestamps of MrMeseex
+        left_at = self.left_at or now_datetime()
         return (left_at - self.entered_at).total_seconds() * 1000
 
 
@@ -47,7 +52,7 @@ class TaskException(Exception):
         self.task = task
         self.original_error = original_error
         self.__traceback__ = getattr(original_error, '__traceback__', None)
-        self.timestamp = datetime.now(timezone.utc)
+        self.timestamp = now_datetime()
 
         # Build a descriptive message
         full_message = message
@@ -76,7 +81,7 @@ class TaskCancelledException(TaskException):
         self.cancel_result = cancel_result
         self.original_error = None
         self.__traceback__ = None
-        self.timestamp = datetime.now(timezone.utc)
+        self.timestamp = now_datetime()
 
         full_message = message
         if task:
@@ -88,11 +93,29 @@ class TaskCancelledException(TaskException):
 _RETURN_DEFAULT_ON_ERROR = object()
 
 
+def _resolve_waiter(waiter: asyncio.Future):
+    if not waiter.done():
+        waiter.set_result(None)
+
+
+# Marks unset timestamps and progress values in the per-task arrays of MrMeseex
+_UNSET = -1
+# Ids are unique per process token and counter. Much cheaper than a UUID per job.
+_ID_TOKEN = uuid.uuid4().hex[:12]
+_id_counter = itertools.count()
+# Mr. Meseex instances share a fixed pool of locks instead of allocating one each
+_STATE_LOCKS = tuple(threading.RLock() for _ in range(64))
+
+
 class MrMeseex:
     """
     The purpose of Mr. Meseex is to fulfill all its tasks.
     It maintains task-specific state, handles errors, and tracks progress.
 
+    Mr. Meseex is kept compact, because millions of them may exist at once: it uses __slots__,
+    timestamps (monotonic nanoseconds) and progress are kept in arrays indexed by task and the pydantic models
+    TaskMeta and TaskProgress are only created when they are accessed.
+
     Example:
         # Create Mr. Meseex with custom tasks.
         meseex = MrMeseex(
@@ -111,7 +134,23 @@ class MrMeseex:
         if meseex.is_terminal:
             result = meseex.result
     """
-    def __init__(self, tasks: list = None, data: Any = None, name: str = None, cancel_handler: Callable[..., Any] = None):
+    __slots__ = (
+        "_state_lock", "_done", "_done_event", "_loop_waiters", "_defer_completion", "_done_callbacks",
+        "meseex_id", "_name", "priority", "tasks", "n_tasks", "current_task_index",
+        "_entered_at", "_left_at", "_progress_percent", "_progress_messages",
+        "task_signal_metadata", "task_data", "task_outputs", "_termination_state", "_errors",
+        "_cancel_handler", "_cancel_requested", "_cancel_result", "_result_consumed_handler", "__weakref__"
+    )
+
+    def __init__(
+            self,
+            tasks: list = None,
+            data: Any = None,
+            name: str = None,
+            cancel_handler: Callable[..., Any] = None,
+            meseex_id: str = None,
+            priority: int = 0
+    ):
         """
         Initialize a new Mr. Meseex instance.
         
@@ -119,6 +158,9 @@ class MrMeseex:
             tasks: List of task identifiers. If None, Mr. Meseex will have just one task.
             data: Optional initial data for the tasks
             name: Optional name for Mr. Meseex (defaults to generated UUID)
+            cancel_handler: Optional handler called by cancel()
+            meseex_id: Optional unique id. Defaults to a generated id that is unique across processes.
+            priority: Scheduling priority. Higher priorities leave the queue and stage gates of a MeseexBox first.
         """
 
         if tasks is None:
@@ -127,14 +169,33 @@ class MrMeseex:
         if not isinstance(tasks, list):
             raise ValueError("Tasks must be a list")
 
-        self.meseex_id = "meseex_" + str(uuid.uuid4())
+        self.meseex_id = meseex_id if meseex_id is not None else f"meseex_{_ID_TOKEN}_{next(_id_counter)}"
+        self._state_lock = _STATE_LOCKS[hash(self.meseex_id) % len(_STATE_LOCKS)]
+        # True once waiters were notified about the terminal state
+        self._done = False
+        # Wakes up wait_for_result without polling. Created lazily by the first blocking waiter.
+        self._done_event: Optional[threading.Event] = None
+        # One future per event loop with awaiting coroutines. Created lazily in __await__.
+        self._loop_waiters: Optional[Dict[asyncio.AbstractEventLoop, asyncio.Future]] = None
+        # True if an orchestrator (MeseexBox) calls _notify_completion once it has processed the termination
+        self._defer_completion = False
+        # Callbacks registered with add_done_callback. Created lazily.
+        self._done_callbacks: Optional[List[Callable[["MrMeseex"], Any]]] = None
+
         self._name = name
+        self.priority = priority
 
         self.tasks = tasks
         self.n_tasks = len(tasks) if isinstance(tasks, list) else 1
         self.current_task_index = -1  # -1 means the job is not started yet
-        # Stores the metadata of each task by task index
-        self.task_metadata: Dict[int, TaskMeta] = {-1: TaskMeta(started_at=datetime.now(timezone.utc))}
+        # Monotonic nanosecond timestamps and progress of each task. Slot 0 belongs to task index -1 (not started).
+        n_slots = self.n_tasks + 1
+        self._entered_at = array("q", [_UNSET]) * n_slots
+        self._left_at = array("q", [_UNSET]) * n_slots
+        self._progress_percent = array("d", [_UNSET]) * n_slots
+        # Progress messages by task index. Created lazily.
+        self._progress_messages: Optional[Dict[int, Optional[str]]] = None
+        self._entered_at[0] = now_ns()
         # Stores the signal metadata of each task by task index
         # This is used for state handling for signals like PollAgain, Retry, etc.
         self.task_signal_metadata: Dict[int, Dict[str, Any]] = {}
@@ -148,32 +209,130 @@ class MrMeseex:
         self.termination_state: Union[TerminationState, None] = None
         # Stores the errors that occurred in each task
         self._errors: List[TaskException] = []
-        self._state_lock = threading.RLock()
         self._cancel_handler: Optional[Callable[..., Any]] = cancel_handler
-        self._cancel_event = threading.Event()
+        self._cancel_requested = False
         self._cancel_result: Any = None
+        # Called once the result was handed out by wait_for_result or await. Used for eviction.
+        self._result_consumed_handler: Optional[Callable[["MrMeseex"], Any]] = None
         
+    @property
+    def termination_state(self) -> Union[TerminationState, None]:
+        return self._termination_state
+
+    @termination_state.setter
+    def termination_state(self, value: Union[TerminationState, None]):
+        """
+        Setting a terminal state wakes up all threads and coroutines waiting for the result.
+        If the job is managed by a MeseexBox, the box does this after its bookkeeping is done.
+        """
+        with self._state_lock:
+            self._termination_state = value
+            if value is None:
+                self._done = False
+                if self._done_event is not None:
+                    self._done_event.clear()
+                return
+
+        if not self._defer_completion:
+            self._notify_completion()
+
+    def _notify_completion(self):
+        """Wake up everybody waiting for the result. Does nothing if the job is not terminal."""
+        with self._state_lock:
+            if self._termination_state is None:
+                return
+            self._done = True
+            if self._done_event is not None:
+                self._done_event.set()
+            loop_waiters, self._loop_waiters = self._loop_waiters, None
+            done_callbacks, self._done_callbacks = self._done_callbacks, None
+
+        if loop_waiters:
+            for loop, waiter in loop_waiters.items():
+                try:
+                    loop.call_soon_threadsafe(_resolve_waiter, waiter)
+                except RuntimeError:
+                    # The loop was closed in the meantime. Nobody is waiting there anymore.
+                    pass
+
+        if done_callbacks:
+            for callback in done_callbacks:
+                try:
+                    callback(self)
+                except Exception:
+                    traceback.print_exc()
+
+    def add_done_callback(self, callback: Callable[["MrMeseex"], Any]) -> None:
+        """
+        Call callback(meseex) once the job reached its terminal state.
+        If the job is already done, the callback is called immediately.
+        The callback runs in the thread that finished the job and should return quickly.
+        """
+        with self._state_lock:
+            if not self._done:
+                if self._done_callbacks is None:
+                    self._done_callbacks = []
+                self._done_callbacks.append(callback)
+                return
+        callback(self)
+
+    def remove_done_callback(self, callback: Callable[["MrMeseex"], Any]) -> bool:
+        """Remove a callback registered with add_done_callback. Returns True if it was registered."""
+        with self._state_lock:
+            if self._done_callbacks and callback in self._done_callbacks:
+                self._done_callbacks.remove(callback)
+                return True
+            return False
+
+    def wait(self, timeout_s: Optional[float] = None) -> bool:
+        """
+        Block until the job reached its terminal state without consuming the result.
+
+        Args:
+            timeout_s: Maximum time to wait in seconds. None waits forever.
+
+        Returns:
+            bool: True if the job is done, False if the timeout expired.
+        """
+        with self._state_lock:
+            if self._done:
+                return True
+            if self._done_event is None:
+                self._done_event = threading.Event()
+            done_event = self._done_event
+        return done_event.wait(timeout=timeout_s)
+
+    def _get_loop_waiter(self) -> Optional[asyncio.Future]:
+        """Get the future of the running event loop that resolves on completion. None if already completed."""
+        loop = asyncio.get_running_loop()
+        with self._state_lock:
+            if self._done:
+                return None
+            if self._loop_waiters is None:
+                self._loop_waiters = {}
+            waiter = self._loop_waiters.get(loop)
+            if waiter is None:
+                waiter = loop.create_future()
+                self._loop_waiters[loop] = waiter
+            return waiter
+
     def next_task(self) -> Enum:
         """Move to the next task in the sequence."""
-        # Set the progress of the current task to 100%
+        now = now_ns()
+        slot = self.current_task_index + 1
         if self.current_task_index >= 0:
-            self.task_progress = 1.0, None
-        
+            # Set the progress of the current task to 100% and record when it was left
+            self._progress_percent[slot] = 1.0
+            if self._progress_messages:
+                self._progress_messages.pop(self.current_task_index, None)
+            self._left_at[slot] = now
+
         # Check if we are done
         if (self.current_task_index + 1) >= self.n_tasks:
             self.termination_state = TerminationState.SUCCESS
-            # Record completion time for the final task
-            if self.current_task_index >= 0:
-                self.task_metadata[self.current_task_index].left_at = datetime.now(timezone.utc)
             return self.current_task_index
 
-        # Update left_at for current task
-        if self.current_task_index >= 0:
-            self.task_metadata[self.current_task_index].left_at = datetime.now(timezone.utc)
-
-        # Create task metadata for next task
-        self.task_metadata[self.current_task_index + 1] = TaskMeta(entered_at=datetime.now(timezone.utc))
-
+        self._entered_at[slot + 1] = now
         self.current_task_index += 1
         return self.current_task_index
 
@@ -314,12 +473,12 @@ class MrMeseex:
             )
         
         self._errors.append(task_error)
-        self.termination_state = TerminationState.FAILED
-        
+
         # Record completion time for the failed task
         if self.current_task_index >= 0:
-            self.task_metadata[self.current_task_index].left_at = datetime.now(timezone.utc)
-            
+            self._left_at[self.current_task_index + 1] = now_ns()
+
+        self.termination_state = TerminationState.FAILED
         return True
 
     def get_errors(self) -> List[TaskException]:
@@ -328,7 +487,7 @@ class MrMeseex:
 
     @property
     def cancel_requested(self) -> bool:
-        return self._cancel_event.is_set()
+        return self._cancel_requested
 
     @property
     def cancel_result(self) -> Any:
@@ -368,7 +527,7 @@ class MrMeseex:
             if self.is_terminal:
                 return False
 
-            self._cancel_event.set()
+            self._cancel_requested = True
             return True
 
     def mark_cancelled(self, cancel_result: Any = None) -> bool:
@@ -389,16 +548,14 @@ class MrMeseex:
 
             if cancel_result is not None:
                 self._cancel_result = cancel_result
-            self._cancel_event.set()
-            self.termination_state = TerminationState.CANCELLED
-            finished_at = datetime.now(timezone.utc)
+            self._cancel_requested = True
+            self._left_at[self._slot(self.current_task_index)] = now_ns()
+            self._termination_state = TerminationState.CANCELLED
 
-            if self.current_task_index in self.task_metadata:
-                self.task_metadata[self.current_task_index].left_at = finished_at
-            elif -1 in self.task_metadata:
-                self.task_metadata[-1].left_at = finished_at
-
-            return True
+        # Waiters and done callbacks run outside the lock, which is shared with other Mr. Meseex instances
+        if not self._defer_completion:
+            self._notify_completion()
+        return True
 
     def cancel(self, *args, **kwargs):
         """
@@ -430,13 +587,12 @@ class MrMeseex:
         if (not isinstance(timeout_s, float) and not isinstance(timeout_s, int)) or timeout_s <= 0:
             raise ValueError("timeout_s must be a float > 0")
 
-        start_time = time.time()
-        while not self.is_terminal:
-            time.sleep(0.01)
-            if time.time() - start_time > timeout_s:
-                if default_value_on_error is _RETURN_DEFAULT_ON_ERROR:
-                    return None
-                return default_value_on_error
+        if not self.wait(timeout_s=None if timeout_s == float('inf') else timeout_s):
+            if default_value_on_error is _RETURN_DEFAULT_ON_ERROR:
+                return None
+            return default_value_on_error
+
+        self._notify_result_consumed()
 
         if self.termination_state == TerminationState.FAILED:
             if default_value_on_error is _RETURN_DEFAULT_ON_ERROR:
@@ -450,6 +606,10 @@ class MrMeseex:
             
         return self.result
     
+    def _notify_result_consumed(self):
+        if self._result_consumed_handler is not None:
+            self._result_consumed_handler(self)
+
     def get_result(self, default_value_on_error: Any = _RETURN_DEFAULT_ON_ERROR, timeout_s: float = None):
         """
         Wait for the job to complete and return its result.
@@ -480,9 +640,39 @@ class MrMeseex:
             except ValueError:
                 raise ValueError(f"Invalid task value: {value}")
 
+    def _slot(self, task_index: int) -> int:
+        """Position of a task in the timestamp and progress arrays. Out of range indices map to the not started slot."""
+        slot = task_index + 1
+        return slot if 0 <= slot < len(self._entered_at) else 0
+
+    def _get_task_meta(self, task_index: int) -> Optional[TaskMeta]:
+        slot = task_index + 1
+        if not 0 <= slot < len(self._entered_at) or self._entered_at[slot] == _UNSET:
+            return None
+        left_at = self._left_at[slot]
+        return TaskMeta(
+            entered_at=to_datetime(self._entered_at[slot]),
+            left_at=None if left_at == _UNSET else to_datetime(left_at),
+            progress=self._get_task_progress(task_index)
+        )
+
+    @property
+    def task_metadata(self) -> Dict[int, TaskMeta]:
+        """
+        Metadata of each entered task by task index. Index -1 is the time before the first task.
+        The TaskMeta models are created on access. Changing them doesn't change Mr. Meseex.
+        """
+        task_metadata = {}
+        for task_index in range(-1, self.n_tasks):
+            task_meta = self._get_task_meta(task_index)
+            if task_meta is not None:
+                task_metadata[task_index] = task_meta
+        return task_metadata
+
     @property
-    def task_meta(self):
-        return self.task_metadata[self.current_task_index]
+    def task_meta(self) -> Optional[TaskMeta]:
+        """Metadata of the current task, created on access."""
+        return self._get_task_meta(self.current_task_index)
 
     @property
     def name(self) -> str:
@@ -530,15 +720,19 @@ class MrMeseex:
         """
         return self._errors[-1] if self._errors else None
 
+    def _get_task_progress(self, task_index: int) -> Optional[TaskProgress]:
+        percent = self._progress_percent[self._slot(task_index)]
+        if percent == _UNSET:
+            return None
+        message = self._progress_messages.get(task_index) if self._progress_messages else None
+        return TaskProgress(percent=percent, message=message)
+
     @property
     def task_progress(self) -> Union[TaskProgress, None]:
         """
         Get the progress of the current task.
         """
-        if self.task_metadata[self.current_task_index].progress is None:
-            return None
-
-        return self.task_metadata[self.current_task_index].progress
+        return self._get_task_progress(self.current_task_index)
     
     @task_progress.setter
     def task_progress(self, percent_message: Tuple[float, str]):
@@ -556,24 +750,25 @@ class MrMeseex:
                 raise ValueError("percent_message must be a tuple of (float, str)")
 
         percent, message = percent_message
+        slot = self._slot(self.current_task_index)
         
         # Use existing percent if None provided
         if percent is None:
-            prev_progress = self.task_metadata[self.current_task_index].progress
-            percent = 0 if prev_progress is None else prev_progress.percent
+            prev_percent = self._progress_percent[slot]
+            percent = 0 if prev_percent == _UNSET else prev_percent
         # Normalize percent value
         elif percent > 1:
             percent = percent / 100.0
         
         percent = max(0, percent)  # Ensure percent is not negative
         
-        # Create or update progress
-        task_meta = self.task_metadata[self.current_task_index]
-        if task_meta.progress is None:
-            task_meta.progress = TaskProgress(percent=percent, message=message)
-        else:
-            task_meta.progress.percent = percent
-            task_meta.progress.message = message
+        self._progress_percent[slot] = percent
+        if message is not None:
+            if self._progress_messages is None:
+                self._progress_messages = {}
+            self._progress_messages[self.current_task_index] = message
+        elif self._progress_messages:
+            self._progress_messages.pop(self.current_task_index, None)
 
     def set_task_progress(self, percent: float, message: str = None):
         """
@@ -589,49 +784,38 @@ class MrMeseex:
         """
         n_tasks = self.n_tasks
         total_progress = 0
-        for i in range(self.current_task_index):
-            if self.task_metadata[i].progress is None:
-                total_progress += 1 / n_tasks
-            else:
-                total_progress += self.task_metadata[i].progress.percent / n_tasks
+        for percent in self._progress_percent[1:self.current_task_index + 1]:
+            total_progress += (1 if percent == _UNSET else percent) / n_tasks
 
         return total_progress
 
     @property
     def total_duration_ms(self) -> float:
         """Calculate the total duration of all tasks in milliseconds."""
-        if not self.task_metadata:
-            return 0
-            
         # Initial start time is when the Meseex was created
-        start_time = self.task_metadata[-1].entered_at
-        if start_time is None:
-            return 0
-        
+        start_time = self._entered_at[0]
+
         # For terminal tasks, use the recorded completion time of the final task
+        end_time = _UNSET
         if self.is_terminal:
-            # Get the last task's metadata using the current_task_index (where it finished)
-            if self.current_task_index in self.task_metadata and self.task_metadata[self.current_task_index].left_at:
-                end_time = self.task_metadata[self.current_task_index].left_at
-            else:
-                # Fallback in case the metadata is missing
-                end_time = datetime.now(timezone.utc)
-        else:
+            end_time = self._left_at[self._slot(self.current_task_index)]
+        if end_time == _UNSET:
             # For active tasks, use current time
-            end_time = datetime.now(timezone.utc)
-
-        if end_time is None:
-            end_time = datetime.now(timezone.utc)
+            end_time = now_ns()
 
-        return (end_time - start_time).total_seconds() * 1000
+        return (end_time - start_time) / 1e6
 
     def __await__(self):
         """
         Makes MrMeseex awaitable. When awaited, it will wait until he reaches a terminal state.
         Returns the ultimate task's result if successful, or raises an exception if failed.
+        All coroutines of one event loop share a single future, so idle awaiters cost no CPU.
         """
-        while not self.is_terminal:
-            yield
+        waiter = self._get_loop_waiter()
+        if waiter is not None:
+            # Shield the shared future, so cancelling one awaiter doesn't affect the others
+            yield from asyncio.shield(waiter).__await__()
+        self._notify_result_consumed()
         if self.termination_state == TerminationState.SUCCESS:
             return self.result
         elif self.termination_state == TerminationState.FAILED:
@@ -0,0 +1,100 @@
+import heapq
+import itertools
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from meseex.clock import now_ns
+
+
+class AgingPriorityQueue:
+    """
+    Heap of entries ordered by priority, with aging so low priority entries don't starve.
+
+    Higher priorities are popped first. Equal priorities are popped in insertion order.
+    With aging, an entry gains one priority level for every aging_s seconds it waits. Because all entries
+    age at the same rate, this is equivalent to the static key enqueued_at / aging_s - priority,
+    so the heap never has to be reordered.
+
+    Removed entries are only marked as tombstones and skipped when they reach the top of the heap.
+    The heap is compacted once most of it are tombstones.
+    The queue is not thread-safe. Callers guard it with their own lock.
+    """
+    def __init__(self, aging_s: Optional[float] = None):
+        """
+        Args:
+            aging_s: Seconds of waiting that are worth one priority level. None disables aging.
+        """
+        if aging_s is not None and aging_s <= 0:
+            raise ValueError("aging_s must be > 0")
+        self.aging_s = aging_s
+        # Entries are [key, seq, entry_id, item]. The entry_id of a tombstone is None.
+        self._heap: List[list] = []
+        self._entries: Dict[Any, list] = {}
+        self._seq = itertools.count()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __bool__(self) -> bool:
+        return bool(self._entries)
+
+    def __contains__(self, entry_id: Any) -> bool:
+        return entry_id in self._entries
+
+    def __iter__(self) -> Iterator[Any]:
+        """Iterate over the entry ids in no particular order."""
+        return iter(self._entries)
+
+    def _key(self, priority: float) -> float:
+        if self.aging_s is None:
+            return -priority
+        return now_ns() / 1e9 / self.aging_s - priority
+
+    def push(self, entry_id: Any, item: Any = None, priority: float = 0) -> None:
+        """Add an entry. An existing entry with the same id is replaced."""
+        self.remove(entry_id)
+        entry = [self._key(priority), next(self._seq), entry_id, item]
+        self._entries[entry_id] = entry
+        heapq.heappush(self._heap, entry)
+
+    def remove(self, entry_id: Any) -> bool:
+        """
+        Remove an entry in O(1) by turning it into a tombstone.
+
+        Returns:
+            bool: True if the entry was queued.
+        """
+        entry = self._entries.pop(entry_id, None)
+        if entry is None:
+            return False
+        entry[2] = entry[3] = None
+        if len(self._heap) > 64 and len(self._entries) < len(self._heap) // 2:
+            self._heap = [e for e in self._heap if e[2] is not None]
+            heapq.heapify(self._heap)
+        return True
+
+    def _drop_tombstones(self) -> None:
+        while self._heap and self._heap[0][2] is None:
+            heapq.heappop(self._heap)
+
+    def peek(self) -> Optional[Any]:
+        """The id of the next entry without removing it. None if the queue is empty."""
+        self._drop_tombstones()
+        return self._heap[0][2] if self._heap else None
+
+    def pop(self) -> Tuple[Any, Any]:
+        """
+        Remove and return the next entry.
+
+        Returns:
+            Tuple of (entry_id, item). (None, None) if the queue is empty.
+        """
+        self._drop_tombstones()
+        if not self._heap:
+            return None, None
+        _, _, entry_id, item = heapq.heappop(self._heap)
+        del self._entries[entry_id]
+        return entry_id, item
+
+    def ordered_ids(self) -> List[Any]:
+        """All entry ids in the order they would be popped."""
+        return [entry[2] for entry in sorted(self._entries.values())]
@@ -1,6 +1,7 @@
-from datetime import datetime, timezone
-from typing import Dict, Set, Optional, List
-from collections import defaultdict, Counter
+import time
+from itertools import islice
+from typing import Dict, Set, Optional, List, Tuple
+from collections import defaultdict, Counter, OrderedDict
 
 from rich.console import Console, Group
 from rich.text import Text
@@ -11,6 +12,86 @@ from rich.table import Table
 from rich.columns import Columns
 
 from meseex.mr_meseex import MrMeseex
+from meseex.meseex_store import MeseexStoreView
+
+
+_TERMINAL_STATES = ("completed", "failed", "cancelled")
+
+
+class _TerminatedJobs:
+    """
+    Running statistics of the terminated Mr. Meseex instances for the summary panels.
+    Updated per transition, so rendering a summary doesn't iterate over all terminated jobs.
+    """
+    def __init__(self):
+        # Incremented with every change, so displays can detect changes cheaply
+        self.n_changes = 0
+        self._clear()
+
+    def _clear(self):
+        # Terminated jobs per state in order of termination, the most recent last
+        self._by_state: Dict[str, OrderedDict] = {state: OrderedDict() for state in _TERMINAL_STATES}
+        # Runtime in ms and task type of every terminated job
+        self._stats: Dict[str, Tuple[float, str]] = {}
+        self.total_runtime_ms = 0.0
+        self.task_counts: Counter = Counter()
+        self._min_runtime_ms = float('inf')
+        self._max_runtime_ms = 0.0
+        # The range is recomputed after a job at its border was removed
+        self._range_stale = False
+
+    def __len__(self) -> int:
+        return len(self._stats)
+
+    def add(self, meseex: MrMeseex, state: str):
+        # A corrected terminal state moves the job to its new state
+        self.remove(meseex.meseex_id)
+        runtime_ms = meseex.total_duration_ms
+        task_type = str(meseex.tasks[0]) if meseex.tasks else "unknown"
+        self._by_state[state][meseex.meseex_id] = meseex
+        self._stats[meseex.meseex_id] = (runtime_ms, task_type)
+        self.total_runtime_ms += runtime_ms
+        self.task_counts[task_type] += 1
+        self._min_runtime_ms = min(self._min_runtime_ms, runtime_ms)
+        self._max_runtime_ms = max(self._max_runtime_ms, runtime_ms)
+        self.n_changes += 1
+
+    def remove(self, meseex_id: str):
+        stats = self._stats.pop(meseex_id, None)
+        if stats is None:
+            return
+        runtime_ms, task_type = stats
+        for meekz in self._by_state.values():
+            meekz.pop(meseex_id, None)
+        self.total_runtime_ms -= runtime_ms
+        self.task_counts[task_type] -= 1
+        if self.task_counts[task_type] <= 0:
+            del self.task_counts[task_type]
+        if runtime_ms in (self._min_runtime_ms, self._max_runtime_ms):
+            self._range_stale = True
+        self.n_changes += 1
+
+    def rebuild(self, view: MeseexStoreView):
+        """Start over from the state sets of the view. The order of termination is lost."""
+        self._clear()
+        self.n_changes += 1
+        for state in _TERMINAL_STATES:
+            for meseex_id in getattr(view, f"{state}_ids"):
+                meseex = view.all_meekz.get(meseex_id)
+                if meseex is not None:
+                    self.add(meseex, state)
+
+    def most_recent(self, state: str, n: int) -> List[MrMeseex]:
+        return list(islice(reversed(self._by_state[state].values()), n))
+
+    def runtime_range_ms(self) -> Tuple[float, float]:
+        """Minimum and maximum runtime of the terminated jobs"""
+        if self._range_stale:
+            runtimes = [runtime_ms for runtime_ms, _ in self._stats.values()]
+            self._min_runtime_ms = min(runtimes, default=float('inf'))
+            self._max_runtime_ms = max(runtimes, default=0.0)
+            self._range_stale = False
+        return self._min_runtime_ms, self._max_runtime_ms
 
 
 class ProgressBar:
@@ -35,11 +116,12 @@ class ProgressBar:
         self._completed_shown: Set[str] = set()
         self._failed_shown: Set[str] = set()
         self._spinner_frame = 0
-        self._last_update = datetime.now(timezone.utc)
+        self._last_update = time.monotonic()
         self._update_interval = 0.1  # Interval for spinner animation update
         self._compact_mode = False   # Placeholder, not fully implemented in this version
         self._last_display_state = None  # Track last display state to avoid duplicates
         self._max_detailed_jobs = 15  # Maximum number of jobs to show in detailed view
+        self._terminated = _TerminatedJobs()  # Statistics for the summary of terminated jobs
         self._progress_verbosity = progress_verbosity  # Control progress display verbosity
         
         # Mr. Meeseeks spinner frames - use an even number for balanced animation
@@ -47,6 +129,16 @@ class ProgressBar:
             "╭◕‿◕╮", "\\◕‿◕/", "╰◕‿◕╯", "ᕦ◕‿◕ᕤ", "╰◕‿◕╯", "\\◕‿◕/"
         ]
 
+    @property
+    def enabled(self) -> bool:
+        """True if the progress bar is displayed at all (progress_verbosity > 0)."""
+        return self._progress_verbosity > 0
+
+    @property
+    def refresh_interval_s(self) -> float:
+        """Interval in seconds in which the display of active jobs should be refreshed."""
+        return self._update_interval
+
     def _ensure_display_started(self):
         """Starts the rich Live display if not already running."""
         if self._live is None:
@@ -63,89 +155,86 @@ class ProgressBar:
         """Update the spinner frame index"""
         self._spinner_frame = (self._spinner_frame + 1) % len(self.SPINNER_FRAMES)
 
-    def _create_display_state_digest(self, meekz, terminated_ids, completed_meekz, failed_meekz, cancelled_meekz, all_finished):
-        """Create a comprehensive state digest for detecting display changes."""
+    def _create_display_state_digest(self, view: MeseexStoreView, active_meekz: List[MrMeseex], all_finished: bool):
+        """
+        Create a state digest for detecting display changes.
+        Terminated jobs don't change anymore, so they are represented by the change counter of their statistics.
+        """
         state = {
             'all_finished': all_finished,
-            'completed_count': len(completed_meekz),
-            'failed_count': len(failed_meekz),
-            'cancelled_count': len(cancelled_meekz),
-            'active_count': len(meekz) - len(terminated_ids),
-            'terminated_jobs': {},
+            'completed_count': len(view.completed_ids),
+            'failed_count': len(view.failed_ids),
+            'cancelled_count': len(view.cancelled_ids),
+            'active_count': len(active_meekz),
+            'terminated_changes': self._terminated.n_changes,
             'active_jobs': {}
         }
 
-        # Track terminated jobs details
-        for meseex_id in sorted(terminated_ids):
-            meseex = meekz.get(meseex_id)
-            if meseex:
-                state['terminated_jobs'][meseex_id] = {
-                    'name': meseex.name,
-                    'completed': meseex_id in completed_meekz,
-                    'runtime_ms': meseex.total_duration_ms,
-                    'error': str(meseex.error) if meseex.error else None,
-                    'task_count': meseex.n_tasks if hasattr(meseex, 'n_tasks') else 0
-                }
-
         # Track active jobs details
-        for meseex_id, meseex in meekz.items():
-            if meseex_id not in terminated_ids and meseex:
-                state['active_jobs'][meseex_id] = {
-                    'name': meseex.name,
-                    'current_task': str(meseex.task) if meseex.task else None,
-                    'current_task_index': meseex.current_task_index if hasattr(meseex, 'current_task_index') else 0,
-                    'n_tasks': meseex.n_tasks if hasattr(meseex, 'n_tasks') else 0,
-                    'progress': meseex.progress,
-                    'runtime_ms': meseex.total_duration_ms,
-                    'task_progress_percent': meseex.task_progress.percent if meseex.task_progress else None,
-                    'task_progress_message': meseex.task_progress.message if meseex.task_progress else None
-                }
+        for meseex in active_meekz:
+            task_progress = meseex.task_progress
+            state['active_jobs'][meseex.meseex_id] = {
+                'name': meseex.name,
+                'current_task': str(meseex.task) if meseex.task else None,
+                'current_task_index': meseex.current_task_index,
+                'n_tasks': meseex.n_tasks,
+                'progress': meseex.progress,
+                'runtime_ms': meseex.total_duration_ms,
+                'task_progress_percent': task_progress.percent if task_progress else None,
+                'task_progress_message': task_progress.message if task_progress else None
+            }
 
         return state
 
-    def update_progress(
-            self,
-            meekz: Dict[str, MrMeseex],
-            task_meekz: Dict[any, Set[str]],
-            completed_meekz: Set[str],
-            failed_meekz: Set[str],
-            cancelled_meekz: Set[str] = None
-    ):
+    def _apply_changes(self, view: MeseexStoreView):
+        """Update the statistics of terminated jobs with the transitions of the last refresh of the view."""
+        if view.last_changes is None:
+            self._terminated.rebuild(view)
+            return
+
+        for change in view.last_changes:
+            if change.state in _TERMINAL_STATES:
+                meseex = view.all_meekz.get(change.meseex_id)
+                if meseex is not None:
+                    self._terminated.add(meseex, change.state)
+            elif change.state == "removed":
+                self._terminated.remove(change.meseex_id)
+
+    def update_progress(self, view: MeseexStoreView):
         """
         Update the progress display using Rich Panels and Text.
 
+        Must be called after every refresh of the view, because terminated jobs are only taken
+        from the transitions of the last refresh. The work per update grows with the number of
+        active jobs and new transitions, not with the number of terminated jobs.
+
         Args:
-            meekz: Dictionary of meseex_id to Mr. Meseex objects
-            task_meekz: The Mr. Meseex instances in each task by id
-            completed_meekz: Set of completed Mr. Meseex instances
-            failed_meekz: Set of failed Mr. Meseex instances
-            cancelled_meekz: Set of cancelled Mr. Meseex instances
+            view: Incrementally maintained view of the MeseexStore.
         """
-        if cancelled_meekz is None:
-            cancelled_meekz = set()
         # If verbosity is 0, don't show any progress bar
         if self._progress_verbosity == 0:
             return
 
-        now = datetime.now(timezone.utc)
+        self._apply_changes(view)
+        now = time.monotonic()
 
         # Update spinner frame index only when verbosity level 2 (with spinners)
         if self._progress_verbosity >= 2:
             self._update_spinner()
 
-        # Gather information about task state for quick initial check
-        terminated_ids = completed_meekz.union(failed_meekz).union(cancelled_meekz)
-        all_ids = set(meekz.keys())
-        all_finished = len(terminated_ids) == len(all_ids) and len(all_ids) > 0
+        # Sort by name for consistent display
+        active_meekz = [view.all_meekz[meseex_id] for meseex_id in view.active_ids if meseex_id in view.all_meekz]
+        active_meekz.sort(key=lambda m: m.name)
+        all_finished = not active_meekz and view.terminated_count > 0
 
         # Create a state digest to detect actual display changes
-        current_state = self._create_display_state_digest(meekz, terminated_ids, completed_meekz, failed_meekz, cancelled_meekz, all_finished)
+        current_state = self._create_display_state_digest(view, active_meekz, all_finished)
 
         # Check if any real change happened (ignore spinner-only updates)
         is_real_change = self._last_display_state != current_state
 
         # Throttle the actual Rich update calls for performance (only when verbosity level 2)
-        is_update_due = (self._progress_verbosity >= 2) and (now - self._last_update).total_seconds() >= self._update_interval
+        is_update_due = (self._progress_verbosity >= 2) and now - self._last_update >= self._update_interval
 
         # Update logic depends on verbosity setting:
         # - Verbosity 2: update for time-based intervals OR real changes (with spinners)
@@ -161,7 +250,7 @@ class ProgressBar:
         self._ensure_display_started()
 
         # Prepare renderables for display
-        renderables = self._prepare_renderables(meekz, terminated_ids, completed_meekz, failed_meekz, cancelled_meekz, all_finished)
+        renderables = self._prepare_renderables(view, active_meekz, all_finished)
         
         # Update the live display
         self._update_live_display(renderables)
@@ -174,17 +263,17 @@ class ProgressBar:
             # Clear the live display before updating to avoid stale content
             self._live.update(display_group)
 
-    def _prepare_renderables(self, meekz, terminated_ids, completed_meekz, failed_meekz, cancelled_meekz, all_finished):
+    def _prepare_renderables(self, view: MeseexStoreView, active_meekz: List[MrMeseex], all_finished: bool):
         """Prepare renderables for display based on current state."""
         renderables = []
         
         if all_finished:
-            all_completed_panel = self._prepare_all_completed_panel(meekz, terminated_ids, completed_meekz, failed_meekz, cancelled_meekz)
+            all_completed_panel = self._prepare_all_completed_panel(view)
             if all_completed_panel:
                 renderables.append(all_completed_panel)
         else:
-            terminated_panel = self._prepare_terminated_panel(meekz, terminated_ids, completed_meekz, failed_meekz, cancelled_meekz)
-            active_panel = self._prepare_active_panel(meekz, terminated_ids)
+            terminated_panel = self._prepare_terminated_panel(view)
+            active_panel = self._prepare_active_panel(active_meekz)
             
             # If both panels exist, show them side by side
             if terminated_panel and active_panel:
@@ -202,20 +291,24 @@ class ProgressBar:
         
         return renderables
 
-    def _prepare_all_completed_panel(self, meekz, terminated_ids, completed_meekz, failed_meekz, cancelled_meekz):
+    def _create_terminated_job_lines(self, view: MeseexStoreView) -> List[Text]:
+        """Lines for all terminated jobs. Only used while there are at most _max_detailed_jobs of them."""
+        terminated_ids = view.completed_ids | view.failed_ids | view.cancelled_ids
+        meekz = [view.all_meekz[meseex_id] for meseex_id in terminated_ids if meseex_id in view.all_meekz]
+        # Sort by name for consistent display
+        meekz.sort(key=lambda m: m.name)
+        return [
+            self._create_terminated_job_line(meseex, meseex.meseex_id, view.completed_ids, view.cancelled_ids)
+            for meseex in meekz
+        ]
+
+    def _prepare_all_completed_panel(self, view: MeseexStoreView):
         """Prepare panel for when all tasks are completed."""
-        all_terminated_lines = []
-        
         # If there are too many jobs, show a summary instead
-        if len(terminated_ids) > self._max_detailed_jobs:
-            return self._prepare_summary_completed_panel(meekz, terminated_ids, completed_meekz, failed_meekz, cancelled_meekz)
+        if view.terminated_count > self._max_detailed_jobs:
+            return self._prepare_summary_completed_panel(view)
         
-        # Sort by name for consistent display
-        for meseex_id in sorted(list(terminated_ids), key=lambda m_id: meekz.get(m_id).name if meekz.get(m_id) else m_id):
-            meseex = meekz.get(meseex_id)
-            if meseex:
-                line = self._create_terminated_job_line(meseex, meseex_id, completed_meekz, cancelled_meekz)
-                all_terminated_lines.append(line)
+        all_terminated_lines = self._create_terminated_job_lines(view)
         
         # Add the single "All Tasks Completed" panel
         if all_terminated_lines:
@@ -230,35 +323,18 @@ class ProgressBar:
             )
         return None
 
-    def _prepare_summary_completed_panel(self, meekz, terminated_ids, completed_meekz, failed_meekz, cancelled_meekz):
+    def _prepare_summary_completed_panel(self, view: MeseexStoreView):
         """Prepare a summary panel for completed jobs when there are many jobs."""
         # Calculate statistics for completed jobs
-        total_jobs = len(terminated_ids)
-        completed_jobs = len(completed_meekz)
-        failed_jobs = len(failed_meekz)
-        cancelled_jobs = len(cancelled_meekz)
-        
-        # Calculate average runtime
-        total_runtime = 0
-        max_runtime = 0
-        min_runtime = float('inf')
-        
-        # Group by task type
-        task_counts = Counter()
-        
-        for meseex_id in terminated_ids:
-            meseex = meekz.get(meseex_id)
-            if meseex:
-                runtime = meseex.total_duration_ms
-                total_runtime += runtime
-                max_runtime = max(max_runtime, runtime)
-                min_runtime = min(min_runtime, runtime)
-                
-                # Count by task type
-                task_type = str(meseex.tasks[0]) if meseex.tasks else "unknown"
-                task_counts[task_type] += 1
-        
-        avg_runtime = total_runtime / total_jobs if total_jobs > 0 else 0
+        total_jobs = view.terminated_count
+        completed_jobs = len(view.completed_ids)
+        failed_jobs = len(view.failed_ids)
+        cancelled_jobs = len(view.cancelled_ids)
+        
+        # Runtimes and task types are kept up to date as jobs terminate
+        stats = self._terminated
+        avg_runtime = stats.total_runtime_ms / len(stats) if len(stats) > 0 else 0
+        min_runtime, max_runtime = stats.runtime_range_ms()
         
         # Create summary table
         table = Table(box=box.MINIMAL)
@@ -279,7 +355,7 @@ class ProgressBar:
         task_table.add_column("Count", style="green")
         
         # Show top 5 task types
-        for task_type, count in task_counts.most_common(5):
+        for task_type, count in stats.task_counts.most_common(5):
             task_table.add_row(task_type, f"{count} ({count/total_jobs*100:.1f}%)")
         
         summary_group = Group(
@@ -297,20 +373,13 @@ class ProgressBar:
             width=None  # Allow width to be determined by parent container
         )
 
-    def _prepare_terminated_panel(self, meekz, terminated_ids, completed_meekz, failed_meekz, cancelled_meekz):
+    def _prepare_terminated_panel(self, view: MeseexStoreView):
         """Prepare panel for terminated jobs."""
-        terminated_lines = []
-        
         # If there are too many jobs, show a summary instead
-        if len(terminated_ids) > self._max_detailed_jobs:
-            return self._prepare_summary_terminated_panel(meekz, terminated_ids, completed_meekz, failed_meekz, cancelled_meekz)
+        if view.terminated_count > self._max_detailed_jobs:
+            return self._prepare_summary_terminated_panel(view)
         
-        # Sort by name for consistent display
-        for meseex_id in sorted(list(terminated_ids), key=lambda m_id: meekz.get(m_id).name if meekz.get(m_id) else m_id):
-            meseex = meekz.get(meseex_id)
-            if meseex:
-                line = self._create_terminated_job_line(meseex, meseex_id, completed_meekz, cancelled_meekz)
-                terminated_lines.append(line)
+        terminated_lines = self._create_terminated_job_lines(view)
 
         if terminated_lines:
             terminated_content = Text("\n").join(terminated_lines)
@@ -324,13 +393,13 @@ class ProgressBar:
             )
         return None
 
-    def _prepare_summary_terminated_panel(self, meekz, terminated_ids, completed_meekz, failed_meekz, cancelled_meekz):
+    def _prepare_summary_terminated_panel(self, view: MeseexStoreView):
         """Prepare a summary panel for terminated jobs when there are many jobs."""
         # Similar to _prepare_summary_completed_panel but for terminated jobs
-        total_terminated = len(terminated_ids)
-        completed = len(completed_meekz)
-        failed = len(failed_meekz)
-        cancelled = len(cancelled_meekz)
+        total_terminated = view.terminated_count
+        completed = len(view.completed_ids)
+        failed = len(view.failed_ids)
+        cancelled = len(view.cancelled_ids)
         
         table = Table(box=box.MINIMAL)
         table.add_column("Status", style="cyan")
@@ -341,35 +410,13 @@ class ProgressBar:
         table.add_row("Failed", str(failed), f"{failed/total_terminated*100:.1f}%")
         table.add_row("Cancelled", str(cancelled), f"{cancelled/total_terminated*100:.1f}%")
         
-        # Show most recent 5 completed and failed jobs
-        recent_completed = []
-        recent_failed = []
-        recent_cancelled = []
-        
-        for meseex_id in terminated_ids:
-            meseex = meekz.get(meseex_id)
-            if not meseex:
-                continue
-                
-            if meseex_id in completed_meekz:
-                recent_completed.append((meseex, meseex.total_duration_ms))
-            elif meseex_id in failed_meekz:
-                recent_failed.append((meseex, meseex.total_duration_ms))
-            else:
-                recent_cancelled.append((meseex, meseex.total_duration_ms))
-        
-        # Sort by most recent (highest duration)
-        recent_completed.sort(key=lambda x: x[1], reverse=True)
-        recent_failed.sort(key=lambda x: x[1], reverse=True)
-        recent_cancelled.sort(key=lambda x: x[1], reverse=True)
-        
         recent_table = Table(title="Most Recent Jobs", box=box.MINIMAL)
         recent_table.add_column("Name", style="cyan")
         recent_table.add_column("Status", style="green")
         recent_table.add_column("Runtime", style="magenta")
         
         # Add most recent completions
-        for meseex, _ in recent_completed[:3]:
+        for meseex in self._terminated.most_recent("completed", 3):
             recent_table.add_row(
                 meseex.name,
                 "✓ Completed",
@@ -377,7 +424,7 @@ class ProgressBar:
             )
             
         # Add most recent failures
-        for meseex, _ in recent_failed[:2]:
+        for meseex in self._terminated.most_recent("failed", 2):
             recent_table.add_row(
                 meseex.name,
                 "✗ Failed",
@@ -385,7 +432,7 @@ class ProgressBar:
             )
 
         # Add most recent cancellations
-        for meseex, _ in recent_cancelled[:2]:
+        for meseex in self._terminated.most_recent("cancelled", 2):
             recent_table.add_row(
                 meseex.name,
                 "⊘ Cancelled",
@@ -427,18 +474,9 @@ class ProgressBar:
             (f" {msg}", "yellow")
         )
 
-    def _prepare_active_panel(self, meekz, terminated_ids):
-        """Prepare panel for active jobs."""
+    def _prepare_active_panel(self, active_meekz_list: List[MrMeseex]):
+        """Prepare panel for active jobs. They are sorted by name already."""
         active_lines = []
-        active_meekz_list = []
-        
-        # Process active jobs by checking if they're actually active (not terminated)
-        for meseex_id, meseex in meekz.items():
-            if meseex_id not in terminated_ids and meseex:
-                active_meekz_list.append(meseex)
-        
-        # Sort by name for consistent display
-        active_meekz_list.sort(key=lambda m: m.name)
         
         # If there are too many active jobs, use the summary view
         if len(active_meekz_list) > self._max_detailed_jobs:
@@ -532,7 +570,8 @@ class ProgressBar:
         progress_display = self._create_progress_display(meseex)
         running_time = self._format_duration_ms(meseex.total_duration_ms)
         total_progress = f"{meseex.progress * 100:.1f}%"
-        message = meseex.task_progress.message if meseex.task_progress and meseex.task_progress.message else ""
+        task_progress = meseex.task_progress
+        message = task_progress.message if task_progress and task_progress.message else ""
         
         return Text.assemble(
             (f"{name:<20} ", "cyan"),
@@ -545,9 +584,10 @@ class ProgressBar:
 
     def _create_progress_display(self, meseex: MrMeseex) -> str:
         """Creates either a progress bar or spinner for task progress."""
-        if meseex.task_progress and meseex.task_progress.percent is not None and meseex.task_progress.percent > 0.0:
+        task_progress = meseex.task_progress
+        if task_progress and task_progress.percent is not None and task_progress.percent > 0.0:
             # Create a mini progress bar
-            percent = meseex.task_progress.percent
+            percent = task_progress.percent
             width = 15 # Reduced width for text display
             filled = int(width * percent)
             bar = f"[{'=' * filled}{' ' * (width - filled)}] {percent * 100:.1f}%"
@@ -0,0 +1,70 @@
+import threading
+
+from meseex.clock import now_ns
+
+
+class TokenBucket:
+    """
+    Token bucket that limits how often a task stage calls an upstream service.
+
+    The bucket holds up to burst tokens and refills at rate_per_s tokens per second.
+    Instead of blocking, reserve() takes a token right away and returns how long the caller
+    has to wait until that token is actually available. The balance may go negative, which queues
+    the callers in order of their reservations without occupying a thread.
+
+    Share one instance between several tasks to apply a common quota, e.g. for stages that call the same API.
+    """
+    def __init__(self, rate_per_s: float, burst: int = 1):
+        """
+        Args:
+            rate_per_s: Sustained number of calls per second.
+            burst: Number of calls that may start at once after the bucket was idle.
+        """
+        if rate_per_s <= 0:
+            raise ValueError("rate_per_s must be > 0")
+        if burst < 1:
+            raise ValueError("burst must be >= 1")
+
+        self.rate_per_s = rate_per_s
+        self.burst = burst
+        self._lock = threading.Lock()
+        self._tokens = float(burst)
+        self._updated_ns = now_ns()
+
+    def _refill(self, now: int):
+        elapsed_s = (now - self._updated_ns) / 1e9
+        self._tokens = min(self.burst, self._tokens + elapsed_s * self.rate_per_s)
+        self._updated_ns = now
+
+    def reserve(self) -> float:
+        """
+        Take a token.
+
+        Returns:
+            float: Seconds to wait before the call may start. 0 if a token was available.
+        """
+        with self._lock:
+            self._refill(now_ns())
+            self._tokens -= 1
+            if self._tokens >= 0:
+                return 0.0
+            return -self._tokens / self.rate_per_s
+
+    def try_acquire(self) -> bool:
+        """Take a token only if one is available right now."""
+        with self._lock:
+            self._refill(now_ns())
+            if self._tokens < 1:
+                return False
+            self._tokens -= 1
+            return True
+
+    @property
+    def available_tokens(self) -> float:
+        """Tokens available right now. Negative if callers are waiting for reserved tokens."""
+        with self._lock:
+            self._refill(now_ns())
+            return self._tokens
+
+    def __repr__(self):
+        return f"TokenBucket(rate_per_s={self.rate_per_s}, burst={self.burst})"
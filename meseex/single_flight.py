@@ -0,0 +1,107 @@
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, List, Optional
+
+from meseex.mr_meseex import MrMeseex
+from meseex.stage_cache import _default_key, _digest
+
+
+class SingleFlight:
+    """
+    Coalesces identical executions of a task that are in flight at the same time.
+
+    The first Mr. Meseex with a key becomes the leader and runs the task. Instances with the same key that
+    reach the task while the leader runs become its followers. They don't run the task and receive the output
+    (or the error) of the leader instead. If the leader is cancelled, the next follower takes over.
+    The SingleFlight only keeps the membership. The MeseexBox runs leaders and hands results to followers.
+    """
+    def __init__(self, key_fn: Optional[Callable[[MrMeseex], Any]] = None):
+        """
+        Args:
+            key_fn: Returns the key of a Mr. Meseex. Return None to run it on its own.
+                Defaults to (meex.input, meex.prev_task_output).
+        """
+        self.key_fn = key_fn or _default_key
+        self._lock = threading.Lock()
+        # Followers of each flight in order of arrival. A key is present while its leader runs.
+        self._flights: Dict[str, OrderedDict[str, MrMeseex]] = {}
+        # Flight key of each follower, to remove cancelled followers
+        self._follower_keys: Dict[str, str] = {}
+        self._stats: Dict[str, int] = {"leaders": 0, "followers": 0, "handovers": 0}
+
+    def key_for(self, meex: MrMeseex) -> Optional[str]:
+        """The flight key of a Mr. Meseex, or None if it should not be coalesced."""
+        return _digest(self.key_fn(meex))
+
+    def join(self, key: str, meex: MrMeseex) -> bool:
+        """
+        Join the flight of the key.
+
+        Returns:
+            bool: True if the Mr. Meseex leads the flight and has to run the task.
+        """
+        with self._lock:
+            followers = self._flights.get(key)
+            if followers is None:
+                self._flights[key] = OrderedDict()
+                self._stats["leaders"] += 1
+                return True
+            followers[meex.meseex_id] = meex
+            self._follower_keys[meex.meseex_id] = key
+            self._stats["followers"] += 1
+            return False
+
+    def complete(self, key: str) -> List[MrMeseex]:
+        """End the flight once its leader finished. Returns the followers that wait for the result."""
+        with self._lock:
+            followers = self._flights.pop(key, None)
+            if not followers:
+                return []
+            for meseex_id in followers:
+                self._follower_keys.pop(meseex_id, None)
+            return list(followers.values())
+
+    def hand_over(self, key: str) -> Optional[MrMeseex]:
+        """
+        Make the longest waiting follower the new leader, because the leader was cancelled.
+
+        Returns:
+            The new leader, or None if nobody is waiting. Then the flight ends.
+        """
+        with self._lock:
+            followers = self._flights.get(key)
+            if not followers:
+                self._flights.pop(key, None)
+                return None
+            meseex_id, new_leader = followers.popitem(last=False)
+            self._follower_keys.pop(meseex_id, None)
+            self._stats["handovers"] += 1
+            return new_leader
+
+    def remove(self, meex: MrMeseex) -> bool:
+        """
+        Remove a waiting follower, for example because it was cancelled.
+
+        Returns:
+            bool: True if the Mr. Meseex was a follower.
+        """
+        with self._lock:
+            key = self._follower_keys.pop(meex.meseex_id, None)
+            if key is None:
+                return False
+            self._flights[key].pop(meex.meseex_id, None)
+            return True
+
+    @property
+    def in_flight(self) -> int:
+        """Number of running flights"""
+        return len(self._flights)
+
+    @property
+    def stats(self) -> Dict[str, int]:
+        """Number of leaders that ran the task, followers that were coalesced and handovers after cancellation."""
+        with self._lock:
+            return dict(self._stats)
+
+    def __repr__(self):
+        return f"SingleFlight(in_flight={self.in_flight})"
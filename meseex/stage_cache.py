@@ -0,0 +1,152 @@
+import hashlib
+import pickle
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+
+from meseex.clock import now_ns
+from meseex.mr_meseex import MrMeseex
+
+
+def _default_key(meex: MrMeseex) -> Hashable:
+    return meex.input, meex.prev_task_output
+
+
+def _digest(key: Any) -> Optional[str]:
+    """Stable hash of a key. None if the key can't be pickled."""
+    if key is None:
+        return None
+    try:
+        return hashlib.sha256(pickle.dumps(key, protocol=pickle.HIGHEST_PROTOCOL)).hexdigest()
+    except Exception:
+        return None
+
+
+class StageCache:
+    """
+    Memoizes the outputs of a task by a key derived from the Mr. Meseex, by default its input and previous task output.
+
+    Entries live in an in-memory LRU with an optional time to live. With disk_path, entries are also
+    written to a SQLite database, which survives restarts and can be shared by several processes.
+    Keys are hashed from the pickled key, so inputs don't need to be hashable but must be picklable.
+    Cached outputs are shared by all jobs with the same key, so tasks should not mutate them.
+    """
+    def __init__(
+            self,
+            max_size: int = 1024,
+            ttl_s: Optional[float] = None,
+            disk_path: Optional[str] = None,
+            key_fn: Optional[Callable[[MrMeseex], Any]] = None
+    ):
+        """
+        Args:
+            max_size: Maximum number of entries in memory. The least recently used entries are evicted first.
+            ttl_s: Entries expire after this many seconds. None keeps them until they are evicted.
+            disk_path: Optional path of a SQLite database used as second cache tier.
+            key_fn: Returns the cache key of a Mr. Meseex. Return None to skip the cache for it.
+                Defaults to (meex.input, meex.prev_task_output).
+        """
+        if max_size < 1:
+            raise ValueError("max_size must be >= 1")
+        if ttl_s is not None and ttl_s <= 0:
+            raise ValueError("ttl_s must be > 0")
+
+        self.max_size = max_size
+        self.ttl_s = ttl_s
+        self.key_fn = key_fn or _default_key
+        self._lock = threading.Lock()
+        # Maps key digest to (output, expiry in monotonic ns or None)
+        self._entries: OrderedDict[str, Tuple[Any, Optional[int]]] = OrderedDict()
+        self._stats: Dict[str, int] = {"hits": 0, "misses": 0, "disk_hits": 0, "evictions": 0}
+
+        self.disk_path = disk_path
+        self._disk: Optional[sqlite3.Connection] = None
+        if disk_path is not None:
+            self._disk = sqlite3.connect(disk_path, check_same_thread=False)
+            self._disk.execute("PRAGMA journal_mode=WAL")
+            # Expiry uses wall-clock time, because monotonic timestamps don't survive restarts
+            self._disk.execute("CREATE TABLE IF NOT EXISTS stage_cache (key TEXT PRIMARY KEY, expires_at REAL, value BLOB NOT NULL)")
+            self._disk.commit()
+
+    def key_for(self, meex: MrMeseex) -> Optional[str]:
+        """The cache key of a Mr. Meseex, or None if it can't be cached."""
+        return _digest(self.key_fn(meex))
+
+    def get(self, key: str) -> Tuple[bool, Any]:
+        """
+        Look up a cached output.
+
+        Returns:
+            Tuple of (found, output).
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                output, expires_at = entry
+                if expires_at is None or expires_at > now_ns():
+                    self._entries.move_to_end(key)
+                    self._stats["hits"] += 1
+                    return True, output
+                del self._entries[key]
+
+            if self._disk is not None:
+                row = self._disk.execute("SELECT expires_at, value FROM stage_cache WHERE key = ?", (key,)).fetchone()
+                if row is not None and (row[0] is None or row[0] > time.time()):
+                    output = pickle.loads(row[1])
+                    self._put_in_memory(key, output)
+                    self._stats["hits"] += 1
+                    self._stats["disk_hits"] += 1
+                    return True, output
+
+            self._stats["misses"] += 1
+            return False, None
+
+    def _put_in_memory(self, key: str, output: Any):
+        expires_at = None if self.ttl_s is None else now_ns() + int(self.ttl_s * 1e9)
+        self._entries[key] = (output, expires_at)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+            self._stats["evictions"] += 1
+
+    def put(self, key: str, output: Any) -> None:
+        """Cache the output of a task."""
+        with self._lock:
+            self._put_in_memory(key, output)
+            if self._disk is None:
+                return
+            try:
+                value = pickle.dumps(output, protocol=pickle.HIGHEST_PROTOCOL)
+            except Exception:
+                return  # Unpicklable outputs are only cached in memory
+            expires_at = None if self.ttl_s is None else time.time() + self.ttl_s
+            self._disk.execute(
+                "INSERT OR REPLACE INTO stage_cache (key, expires_at, value) VALUES (?, ?, ?)", (key, expires_at, value)
+            )
+            self._disk.commit()
+
+    @property
+    def stats(self) -> Dict[str, int]:
+        """Number of hits (including disk_hits), misses and evictions from memory, and the current size in memory."""
+        with self._lock:
+            return {**self._stats, "size": len(self._entries)}
+
+    def clear(self) -> None:
+        """Drop all entries, also from the disk tier. Stats are kept."""
+        with self._lock:
+            self._entries.clear()
+            if self._disk is not None:
+                self._disk.execute("DELETE FROM stage_cache")
+                self._disk.commit()
+
+    def close(self) -> None:
+        """Close the disk tier."""
+        with self._lock:
+            if self._disk is not None:
+                self._disk.close()
+                self._disk = None
+
+    def __repr__(self):
+        return f"StageCache(max_size={self.max_size}, ttl_s={self.ttl_s}, disk_path={self.disk_path!r})"
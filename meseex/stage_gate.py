@@ -0,0 +1,72 @@
+import threading
+from typing import Optional, Tuple
+
+from meseex.mr_meseex import MrMeseex
+from meseex.priority_queue import AgingPriorityQueue
+
+
+class StageGate:
+    """
+    Limits how many Mr. Meseex instances execute a task at the same time.
+
+    Instances over the limit wait at the gate. They are admitted by priority (higher first)
+    and in order of arrival within a priority. With aging, waiting instances slowly gain priority
+    so low priority instances are not starved. When a running instance leaves,
+    its slot is handed directly to the next waiting instance.
+    """
+    def __init__(self, concurrency: int, priority_aging_s: Optional[float] = None):
+        """
+        Args:
+            concurrency: Maximum number of Mr. Meseex instances executing the task at the same time.
+            priority_aging_s: Seconds a Mr. Meseex waits at the gate to gain one priority level. None disables aging.
+        """
+        self.concurrency = concurrency
+        self._lock = threading.Lock()
+        self._running = 0
+        # Waiting Mr. Meseex instances by id with their delay_s
+        self._waiting = AgingPriorityQueue(aging_s=priority_aging_s)
+
+    @property
+    def running_count(self) -> int:
+        return self._running
+
+    @property
+    def waiting_count(self) -> int:
+        return len(self._waiting)
+
+    def try_enter(self, meseex: MrMeseex, delay_s: Optional[float] = None) -> bool:
+        """
+        Take a slot if one is free. Otherwise the Mr. Meseex waits at the gate.
+
+        Returns:
+            bool: True if the Mr. Meseex may run now.
+        """
+        with self._lock:
+            if self._running < self.concurrency:
+                self._running += 1
+                return True
+            self._waiting.push(meseex.meseex_id, (meseex, delay_s), priority=meseex.priority)
+            return False
+
+    def leave(self) -> Optional[Tuple[MrMeseex, Optional[float]]]:
+        """
+        Free a slot. If a Mr. Meseex is waiting, the slot is handed over to it.
+
+        Returns:
+            The (meseex, delay_s) entry that now owns the slot and has to be run, or None.
+        """
+        with self._lock:
+            if self._waiting:
+                return self._waiting.pop()[1]
+            self._running = max(0, self._running - 1)
+            return None
+
+    def remove(self, meseex: MrMeseex) -> bool:
+        """
+        Remove a waiting Mr. Meseex from the gate, for example because it was cancelled.
+
+        Returns:
+            bool: True if the Mr. Meseex was waiting.
+        """
+        with self._lock:
+            return self._waiting.remove(meseex.meseex_id)
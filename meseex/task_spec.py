@@ -0,0 +1,137 @@
+from typing import Callable, Optional, Union
+
+from meseex.tasks.i_task_executor import ITaskExecutor
+from meseex.rate_limiter import TokenBucket
+from meseex.stage_cache import StageCache
+from meseex.single_flight import SingleFlight
+
+
+class TaskSpec:
+    """
+    Declarative configuration of a task in a MeseexBox.
+
+    Plain callables passed to a MeseexBox are wrapped in a TaskSpec with default settings.
+    Use the task() helper to configure a task, for example to limit its concurrency.
+    A TaskSpec can still be called like the wrapped method.
+    """
+    def __init__(
+            self,
+            method: Callable,
+            concurrency: Optional[int] = None,
+            executor: Union[str, ITaskExecutor, None] = None,
+            rate_limit: Union[float, TokenBucket, None] = None,
+            cache: Union[bool, StageCache, None] = None,
+            single_flight: Union[bool, SingleFlight, None] = None
+    ):
+        """
+        Args:
+            method: The sync or async task method.
+            concurrency: Maximum number of Mr. Meseex instances executing this task at the same time.
+                Further instances wait at the stage until a slot is free. None means unlimited.
+            executor: Executor that runs the task. Either the name of an executor registered
+                in the MeseexBox (executors=...) or an ITaskExecutor instance. None uses the default executor of the box.
+            rate_limit: Maximum calls per second, or a TokenBucket which can be shared with other tasks.
+                Mr. Meseex instances over the limit wait at the stage without occupying a thread. None means unlimited.
+            cache: Memoize the task outputs. True uses a StageCache keyed by input and previous task output,
+                or pass a configured StageCache. On a hit the task is skipped and the cached output is used.
+                The MeseexBox closes the caches created for True on shutdown. A passed StageCache
+                can be shared and must be closed by the caller.
+            single_flight: Coalesce identical executions that are in flight at the same time. True keys them by
+                input and previous task output, or pass a SingleFlight with a key_fn. Only one Mr. Meseex per key
+                runs the task, the others wait and receive its output or error.
+        """
+        if isinstance(method, TaskSpec):
+            raise ValueError("method is already a TaskSpec")
+        if not callable(method):
+            raise ValueError("method must be callable")
+        if concurrency is not None and concurrency < 1:
+            raise ValueError("concurrency must be >= 1")
+        if executor is not None and not isinstance(executor, (str, ITaskExecutor)):
+            raise ValueError("executor must be an executor name or an ITaskExecutor")
+        if rate_limit is not None and not isinstance(rate_limit, TokenBucket):
+            if not isinstance(rate_limit, (int, float)) or rate_limit <= 0:
+                raise ValueError("rate_limit must be a positive number of calls per second or a TokenBucket")
+            rate_limit = TokenBucket(rate_per_s=rate_limit)
+        # Only the caches created here are closed by the MeseexBox
+        self.owns_cache = cache is True
+        if cache is True:
+            cache = StageCache()
+        elif cache is False:
+            cache = None
+        elif cache is not None and not isinstance(cache, StageCache):
+            raise ValueError("cache must be a bool or a StageCache")
+        if single_flight is True:
+            single_flight = SingleFlight()
+        elif single_flight is False:
+            single_flight = None
+        elif single_flight is not None and not isinstance(single_flight, SingleFlight):
+            raise ValueError("single_flight must be a bool or a SingleFlight")
+
+        self.method = method
+        self.concurrency = concurrency
+        self.executor = executor
+        self.rate_limit: Optional[TokenBucket] = rate_limit
+        self.cache: Optional[StageCache] = cache
+        self.single_flight: Optional[SingleFlight] = single_flight
+
+    def __call__(self, *args, **kwargs):
+        return self.method(*args, **kwargs)
+
+    def __repr__(self):
+        name = getattr(self.method, "__qualname__", repr(self.method))
+        return f"TaskSpec({name}, concurrency={self.concurrency}, executor={self.executor!r}, rate_limit={self.rate_limit!r}, cache={self.cache!r}, single_flight={self.single_flight!r})"
+
+
+def task(
+        method: Callable = None,
+        *,
+        concurrency: Optional[int] = None,
+        executor: Union[str, ITaskExecutor, None] = None,
+        rate_limit: Union[float, TokenBucket, None] = None,
+        cache: Union[bool, StageCache, None] = None,
+        single_flight: Union[bool, SingleFlight, None] = None
+) -> Union[TaskSpec, Callable[[Callable], TaskSpec]]:
+    """
+    Configure how a MeseexBox runs a task.
+
+    Example:
+        meseex_box = MeseexBox({
+            "download": task(download, concurrency=200, executor="io"),
+            "infer": task(infer, concurrency=2, executor="cpu"),
+        }, executors={"io": TaskExecutor(max_workers=64), "cpu": TaskExecutor(max_workers=4)})
+
+        # At most 10 calls per second with bursts of 20, shared by two stages calling the same API
+        api_quota = TokenBucket(rate_per_s=10, burst=20)
+        meseex_box = MeseexBox({
+            "submit": task(submit_job, rate_limit=api_quota),
+            "fetch": task(fetch_result, rate_limit=api_quota),
+        })
+
+        # Skip the transcription of files that were transcribed in the last hour
+        task(transcribe, cache=StageCache(max_size=10_000, ttl_s=3600, key_fn=lambda meex: meex.input["file_hash"]))
+
+        # 200 identical prompts arriving at once call the model only once
+        task(generate, single_flight=True)
+
+        # Also works as decorator
+        @task(concurrency=2)
+        async def infer(meex: MrMeseex):
+            ...
+
+    Args:
+        method: The sync or async task method. If omitted, a decorator is returned.
+        concurrency: Maximum number of Mr. Meseex instances executing this task at the same time.
+        executor: Name of an executor registered in the MeseexBox or an ITaskExecutor instance.
+        rate_limit: Maximum calls per second or a shared TokenBucket.
+        cache: True or a StageCache to memoize the task outputs.
+        single_flight: True or a SingleFlight to coalesce identical executions that run at the same time.
+
+    Returns:
+        TaskSpec: The task configuration to pass to a MeseexBox.
+    """
+    def decorator(func: Callable) -> TaskSpec:
+        return TaskSpec(func, concurrency=concurrency, executor=executor, rate_limit=rate_limit, cache=cache, single_flight=single_flight)
+
+    if method is None:
+        return decorator
+    return decorator(method)
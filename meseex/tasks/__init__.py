@@ -3,5 +3,7 @@ from .async_task_executor import AsyncTaskExecutor
 from .task_executor import TaskExecutor
 from .thread_pool_task_executor import ThreadPoolTaskExecutor
 from .i_task_executor import ITaskExecutor
+from .delay_scheduler import DelayScheduler
+from .process_pool_task_executor import ProcessPoolTaskExecutor, MeseexView
 
-__all__ = ['AsyncTask', 'AsyncTaskExecutor', 'TaskExecutor', 'ThreadPoolTaskExecutor', 'ITaskExecutor']
+__all__ = ['AsyncTask', 'AsyncTaskExecutor', 'TaskExecutor', 'ThreadPoolTaskExecutor', 'ITaskExecutor', 'ProcessPoolTaskExecutor', 'MeseexView', 'DelayScheduler']
@@ -79,7 +79,7 @@ class AsyncTaskExecutor(ITaskExecutor):
 
         return async_job
 
-    def shutdown(self):
+    def shutdown(self, wait: bool = True):
         """
         Shuts down the AsyncJobManager, stopping the event loop and cleaning up resources.
         """
@@ -0,0 +1,127 @@
+import heapq
+import itertools
+import threading
+import time
+import traceback
+from concurrent.futures import CancelledError, Future
+from typing import Callable, List, Optional, Tuple
+
+
+class ScheduledCall:
+    """Handle of a callback scheduled with DelayScheduler.call_later."""
+    __slots__ = ("due", "callback", "cancelled")
+
+    def __init__(self, due: float, callback: Callable[[], None]):
+        self.due = due
+        self.callback = callback
+        self.cancelled = False
+
+    def cancel(self):
+        """Prevent the callback from running. It is dropped from the scheduler once it is due."""
+        self.cancelled = True
+
+
+class DelayScheduler:
+    """
+    Runs callbacks after a delay using a heap and a single thread.
+
+    Delayed tasks are only handed to their executor once they are due,
+    so thousands of pending polls don't occupy any worker thread.
+    Callbacks run on the scheduler thread and should return quickly.
+    """
+    _shared: Optional["DelayScheduler"] = None
+    _shared_lock = threading.Lock()
+
+    def __init__(self):
+        self._heap: List[Tuple[float, int, ScheduledCall]] = []
+        self._counter = itertools.count()
+        self._condition = threading.Condition()
+        self._thread: Optional[threading.Thread] = None
+
+    @classmethod
+    def shared(cls) -> "DelayScheduler":
+        """The scheduler shared by all executors of the process."""
+        with cls._shared_lock:
+            if cls._shared is None:
+                cls._shared = cls()
+            return cls._shared
+
+    @property
+    def pending_count(self) -> int:
+        """Number of scheduled callbacks including cancelled ones that are not due yet."""
+        return len(self._heap)
+
+    def call_later(self, delay_s: float, callback: Callable[[], None]) -> ScheduledCall:
+        """
+        Run the callback on the scheduler thread after delay_s seconds.
+
+        Returns:
+            ScheduledCall: Handle to cancel the call.
+        """
+        call = ScheduledCall(time.monotonic() + max(0.0, delay_s), callback)
+        with self._condition:
+            heapq.heappush(self._heap, (call.due, next(self._counter), call))
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="meseex-delay-scheduler", daemon=True)
+                self._thread.start()
+            # Only a new earliest deadline changes how long the scheduler thread has to sleep
+            if self._heap[0][2] is call:
+                self._condition.notify()
+        return call
+
+    def _next_due_call(self) -> ScheduledCall:
+        with self._condition:
+            while True:
+                while self._heap and self._heap[0][2].cancelled:
+                    heapq.heappop(self._heap)
+                if not self._heap:
+                    self._condition.wait()
+                    continue
+
+                wait_s = self._heap[0][0] - time.monotonic()
+                if wait_s <= 0:
+                    return heapq.heappop(self._heap)[2]
+                self._condition.wait(wait_s)
+
+    def _run(self):
+        while True:
+            call = self._next_due_call()
+            if call.cancelled:
+                continue
+            try:
+                call.callback()
+            except Exception:
+                traceback.print_exc()
+
+
+def _copy_future_state(source: Future, target: Future):
+    if source.cancelled():
+        target.set_exception(CancelledError())
+    elif source.exception() is not None:
+        target.set_exception(source.exception())
+    else:
+        target.set_result(source.result())
+
+
+def submit_later(delay_scheduler: DelayScheduler, submit: Callable[[], Future], delay_s: float) -> Future:
+    """
+    Call submit once delay_s seconds have passed and mirror the state of the submitted future.
+
+    Returns:
+        Future: Completes with the submitted task. Cancelling it before it is due prevents the submission.
+    """
+    future = Future()
+
+    def hand_over():
+        if not future.set_running_or_notify_cancel():
+            return
+        try:
+            submitted = submit()
+        except Exception as e:
+            future.set_exception(e)
+            return
+        submitted.add_done_callback(lambda f: _copy_future_state(f, future))
+
+    call = delay_scheduler.call_later(delay_s, hand_over)
+    future.add_done_callback(lambda f: call.cancel() if f.cancelled() else None)
+    return future
@@ -11,6 +11,13 @@ class ITaskExecutor(ABC):
     def submit(self, method: Callable, *args, callback: Optional[Callable] = None, delay_s: Optional[float] = None) -> AsyncTask:
         """Submit a task to be executed"""
         pass
+
+    def get_submit(self, method: Callable) -> Callable[..., AsyncTask]:
+        """
+        Get the submit function for a method. It has the signature of submit.
+        Executors that route tasks override this, so callers can resolve the route once and reuse it.
+        """
+        return self.submit
     
     @abstractmethod
     def shutdown(self, wait: bool = True):
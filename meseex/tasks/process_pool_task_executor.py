@@ -0,0 +1,214 @@
+import asyncio
+import multiprocessing
+import threading
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
+
+from meseex.mr_meseex import MrMeseex
+from .task_result import SyncTask
+from .i_task_executor import ITaskExecutor
+from .delay_scheduler import DelayScheduler, submit_later
+
+
+# Queue to ship progress updates from a worker process back to the parent. Set by _init_worker.
+_progress_queue = None
+
+
+def _init_worker(progress_queue):
+    global _progress_queue
+    _progress_queue = progress_queue
+
+
+class MeseexView:
+    """
+    Picklable snapshot of a Mr. Meseex that is passed to tasks running in a worker process.
+
+    It offers the read accessors tasks usually need (input, prev_task_output, task data) and
+    set_task_progress, whose updates are shipped back to the Mr. Meseex in the parent process.
+    It has no task signals and no setters for task data.
+    """
+    def __init__(
+            self,
+            meseex_id: str,
+            name: str,
+            tasks: list,
+            current_task_index: int,
+            task_data: Dict[Any, Any],
+            task_outputs: Dict[int, Any]
+    ):
+        self.meseex_id = meseex_id
+        self.name = name
+        self.tasks = tasks
+        self.n_tasks = len(tasks)
+        self.current_task_index = current_task_index
+        self.task_data = task_data
+        self.task_outputs = task_outputs
+
+    @classmethod
+    def from_meseex(cls, meseex: MrMeseex) -> "MeseexView":
+        index = meseex.current_task_index
+        task_data = {key: meseex.task_data[key] for key in (-1, index) if key in meseex.task_data}
+        task_outputs = {index - 1: meseex.task_outputs[index - 1]} if index - 1 in meseex.task_outputs else {}
+        return cls(meseex.meseex_id, meseex.name, list(meseex.tasks), index, task_data, task_outputs)
+
+    @property
+    def task(self) -> Any:
+        return self.tasks[self.current_task_index]
+
+    @property
+    def input(self) -> Any:
+        return self.task_data.get(-1)
+
+    @property
+    def prev_task_output(self) -> Any:
+        return self.task_outputs.get(self.current_task_index - 1)
+
+    @property
+    def cancel_requested(self) -> bool:
+        # Cancellation requests are not forwarded to worker processes
+        return False
+
+    def get_task_data(self, task: Any = None) -> Any:
+        if task is None:
+            return self.task_data.get(self.current_task_index)
+        if isinstance(task, int):
+            return self.task_data.get(task)
+        return self.task_data.get(self.tasks.index(task))
+
+    def set_task_progress(self, percent: float, message: str = None):
+        """Set the progress of the current task. The update is applied to the Mr. Meseex in the parent process."""
+        if _progress_queue is not None:
+            _progress_queue.put((self.meseex_id, self.current_task_index, percent, message))
+
+
+def _run_in_worker(method: Callable, args: tuple) -> Any:
+    """Entry point in the worker process. Runs sync functions directly and async functions with their own event loop."""
+    if asyncio.iscoroutinefunction(method):
+        return asyncio.run(method(*args))
+    return method(*args)
+
+
+class ProcessPoolTaskExecutor(ITaskExecutor):
+    """
+    Executor for CPU-bound tasks using a pool of worker processes.
+
+    Task functions and their results must be picklable, so define the functions at module level.
+    A Mr. Meseex argument is replaced with a MeseexView. Progress updates are sent back to the parent
+    and applied to the Mr. Meseex. Async functions are run with asyncio.run in the worker.
+
+    Tasks decorated with polling_task, retry_task or batched_polling_task keep their state in the task signals
+    of the Mr. Meseex and are rejected. Run them on a thread or async executor and let them call into
+    the pool for the CPU-bound work instead.
+    """
+
+    def __init__(
+            self,
+            max_workers: int = None,
+            mp_context: Optional[multiprocessing.context.BaseContext] = None,
+            delay_scheduler: Optional[DelayScheduler] = None
+    ):
+        """
+        Args:
+            max_workers: Number of worker processes. Defaults to the number of CPUs.
+            mp_context: Multiprocessing context. Defaults to "spawn" which is safe in multi-threaded parents.
+            delay_scheduler: Hands delayed tasks to the pool once they are due. Defaults to the shared scheduler.
+        """
+        mp_context = mp_context or multiprocessing.get_context("spawn")
+        self._progress_queue = mp_context.Queue()
+        self.process_pool = ProcessPoolExecutor(
+            max_workers=max_workers,
+            mp_context=mp_context,
+            initializer=_init_worker,
+            initargs=(self._progress_queue,)
+        )
+        self.delay_scheduler = delay_scheduler or DelayScheduler.shared()
+        self._shutdown_flag = False
+        # Futures of delayed tasks that were not handed to the pool yet
+        self._delayed_lock = threading.Lock()
+        self._delayed_futures: Set[Future] = set()
+        # Mr. Meseex instances with a running task, to apply progress updates to
+        self._meekz_lock = threading.Lock()
+        self._running_meekz: Dict[str, MrMeseex] = {}
+        self._progress_listener = threading.Thread(target=self._listen_for_progress, daemon=True)
+        self._progress_listener.start()
+
+    def get_submit(self, method: Callable) -> Callable[..., SyncTask]:
+        """Reject tasks whose control flow needs the task signals of the Mr. Meseex"""
+        control_flow = getattr(method, "control_flow", None)
+        if control_flow is not None:
+            raise ValueError(
+                f"Tasks decorated with {control_flow} can't run in a ProcessPoolTaskExecutor, "
+                "because their state is kept in the task signals of the Mr. Meseex. Use a thread or async executor."
+            )
+        return self.submit
+
+    def _listen_for_progress(self):
+        while True:
+            update: Optional[Tuple[str, int, float, str]] = self._progress_queue.get()
+            if update is None:
+                return
+
+            meseex_id, task_index, percent, message = update
+            with self._meekz_lock:
+                meseex = self._running_meekz.get(meseex_id)
+            # Drop late updates of tasks that finished already
+            if meseex is not None and meseex.current_task_index == task_index:
+                meseex.set_task_progress(percent, message)
+
+    def _to_picklable_args(self, args: tuple) -> Tuple[tuple, List[MrMeseex]]:
+        picklable_args = []
+        meekz = []
+        for arg in args:
+            if isinstance(arg, MrMeseex):
+                meekz.append(arg)
+                arg = MeseexView.from_meseex(arg)
+            picklable_args.append(arg)
+        return tuple(picklable_args), meekz
+
+    def _discard_delayed(self, future: Future):
+        with self._delayed_lock:
+            self._delayed_futures.discard(future)
+
+    def submit(self, method: Callable, *args, callback: Optional[Callable] = None, delay_s: Optional[float] = None) -> SyncTask:
+        """Submit a picklable sync or async function to be executed in a worker process"""
+        if self._shutdown_flag:
+            raise RuntimeError('cannot schedule new tasks after shutdown')
+
+        args, meekz = self._to_picklable_args(args)
+        with self._meekz_lock:
+            for meseex in meekz:
+                self._running_meekz[meseex.meseex_id] = meseex
+
+        if delay_s is not None:
+            # No worker process is occupied while the task is waiting
+            future = submit_later(self.delay_scheduler, lambda: self.process_pool.submit(_run_in_worker, method, args), delay_s)
+            with self._delayed_lock:
+                self._delayed_futures.add(future)
+            future.add_done_callback(self._discard_delayed)
+        else:
+            future = self.process_pool.submit(_run_in_worker, method, args)
+        sync_task = SyncTask(future=future)
+
+        def on_done(_):
+            with self._meekz_lock:
+                for meseex in meekz:
+                    self._running_meekz.pop(meseex.meseex_id, None)
+            if callback:
+                callback(sync_task)
+
+        future.add_done_callback(on_done)
+        return sync_task
+
+    def shutdown(self, wait: bool = True):
+        """Shutdown the worker processes and the progress listener"""
+        if self._shutdown_flag:
+            return
+        self._shutdown_flag = True
+        with self._delayed_lock:
+            delayed_futures = list(self._delayed_futures)
+        for future in delayed_futures:
+            future.cancel()
+        self.process_pool.shutdown(wait=wait, cancel_futures=True)
+        self._progress_queue.put(None)
+        if wait:
+            self._progress_listener.join()
@@ -23,6 +23,18 @@ class TaskExecutor(ITaskExecutor):
             # For regular functions, we pass the function and args to the thread pool
             return self.thread_pool.submit(method, *args, callback=callback, delay_s=delay_s)
     
+    def _submit_coroutine_function(self, method: Callable, *args, callback: Optional[Callable] = None, delay_s: Optional[float] = None) -> AsyncTask:
+        return self.async_executor.submit(method(*args), callback=callback, delay_s=delay_s)
+
+    def get_submit(self, method: Union[Callable, Coroutine]) -> Callable[..., Union[AsyncTask, SyncTask]]:
+        """Resolve the executor of the method once instead of checking it on every submit"""
+        if type(self).submit is not TaskExecutor.submit:
+            # Keep custom submit logic of subclasses
+            return self.submit
+        if asyncio.iscoroutinefunction(method):
+            return self._submit_coroutine_function
+        return self.thread_pool.submit
+
     def shutdown(self, wait: bool = True):
         """Shutdown both executors"""
         self.async_executor.shutdown()
@@ -1,17 +1,30 @@
 import asyncio
 from concurrent.futures import Future
-from datetime import datetime, timezone
+from datetime import datetime
 from typing import Optional, Any
 
+from meseex.clock import now_ns, to_datetime
+
 
 class TaskResult:
     """Base class for task results"""
     def __init__(self):
-        self.created_at = datetime.now(timezone.utc)
-        self.completed_at: Optional[datetime] = None
+        # Monotonic nanosecond timestamps. Converted to datetimes on demand.
+        self._created_ns = now_ns()
+        self._completed_ns: Optional[int] = None
         self._result: Optional[Any] = None
         self._error: Optional[Exception] = None
 
+    @property
+    def created_at(self) -> datetime:
+        return to_datetime(self._created_ns)
+
+    @property
+    def completed_at(self) -> Optional[datetime]:
+        if self._completed_ns is None:
+            return None
+        return to_datetime(self._completed_ns)
+
     @property
     def result(self) -> Optional[Any]:
         """Get the task result if completed successfully"""
@@ -29,23 +42,22 @@ class TaskResult:
     @property
     def is_completed(self) -> bool:
         """Check if the task has completed"""
-        return self.completed_at is not None
+        return self._completed_ns is not None
 
     def get_execution_time(self) -> float:
         """Get the execution time in seconds"""
-        if not self.is_completed:
-            return (datetime.now(timezone.utc) - self.created_at).total_seconds()
-        return (self.completed_at - self.created_at).total_seconds()
+        end_ns = self._completed_ns if self._completed_ns is not None else now_ns()
+        return (end_ns - self._created_ns) / 1e9
 
     def _set_result(self, result: Any):
         """Set the task result and mark as completed"""
         self._result = result
-        self.completed_at = datetime.now(timezone.utc)
+        self._completed_ns = now_ns()
 
     def _set_error(self, error: Exception):
         """Set the task error and mark as completed"""
         self._error = error
-        self.completed_at = datetime.now(timezone.utc)
+        self._completed_ns = now_ns()
 
     def cancel(self) -> bool:
         """Best-effort cancellation hook implemented by subclasses."""
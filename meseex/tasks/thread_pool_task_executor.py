@@ -1,39 +1,63 @@
-from concurrent.futures import ThreadPoolExecutor
-from typing import Callable, Optional
-import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable, Optional, Set
+import threading
 
 from .task_result import SyncTask
 from .i_task_executor import ITaskExecutor
+from .delay_scheduler import DelayScheduler, submit_later
 
 
 class ThreadPoolTaskExecutor(ITaskExecutor):
     """Executor for synchronous tasks using a thread pool"""
-    
-    def __init__(self, max_workers: int = None):
+
+    def __init__(self, max_workers: int = None, delay_scheduler: Optional[DelayScheduler] = None):
+        """
+        Args:
+            max_workers: Number of threads.
+            delay_scheduler: Hands delayed tasks to the pool once they are due. Defaults to the shared scheduler.
+        """
         self.thread_pool = ThreadPoolExecutor(max_workers=max_workers)
+        self.delay_scheduler = delay_scheduler or DelayScheduler.shared()
         self._shutdown_flag = False
-    
+        # Futures of delayed tasks that were not handed to the pool yet
+        self._delayed_lock = threading.Lock()
+        self._delayed_futures: Set[Future] = set()
+
+    def _submit_later(self, method: Callable, *args, delay_s: float) -> Future:
+        future = submit_later(self.delay_scheduler, lambda: self.thread_pool.submit(method, *args), delay_s)
+        with self._delayed_lock:
+            self._delayed_futures.add(future)
+        future.add_done_callback(self._discard_delayed)
+        return future
+
+    def _discard_delayed(self, future: Future):
+        with self._delayed_lock:
+            self._delayed_futures.discard(future)
+
     def submit(self, method: Callable, *args, callback: Optional[Callable] = None, delay_s: Optional[float] = None) -> SyncTask:
         """Submit a synchronous task to be executed in a thread"""
         if self._shutdown_flag:
             raise RuntimeError('cannot schedule new tasks after shutdown')
-        
+
         if delay_s is not None:
-            def delayed_method(*args):
-                time.sleep(delay_s)
-                return method(*args)
-            future = self.thread_pool.submit(delayed_method, *args)
+            # No thread is occupied while the task is waiting
+            future = self._submit_later(method, *args, delay_s=delay_s)
         else:
             future = self.thread_pool.submit(method, *args)
-            
+
         sync_task = SyncTask(future=future)
-        
+
         if callback:
             future.add_done_callback(lambda _: callback(sync_task))
-        
+
         return sync_task
-    
+
     def shutdown(self, wait: bool = True):
         """Shutdown the thread pool"""
         self._shutdown_flag = True
+        # Like cancel_futures of the pool, delayed tasks that are not due yet are cancelled
+        with self._delayed_lock:
+            delayed_futures = list(self._delayed_futures)
+        for future in delayed_futures:
+            future.cancel()
         self.thread_pool.shutdown(wait=wait, cancel_futures=True)
@@ -0,0 +1,105 @@
+import pytest
+from meseex import MeseexBox, MrMeseex
+from meseex.checkpoint import FileCheckpointStore, SQLiteCheckpointStore, MeseexCheckpoint
+from meseex.control_flow import Repeat
+
+expensive_runs = []
+
+
+def expensive(meex: MrMeseex):
+    expensive_runs.append(meex.input)
+    return meex.input * 10
+
+
+def stuck(meex: MrMeseex):
+    if meex.input == 0:
+        return meex.prev_task_output
+    # Waits much longer than the test. The shutdown interrupts it like a crash would.
+    return Repeat(delay_s=60)
+
+
+def pass_through(meex: MrMeseex):
+    return meex.prev_task_output
+
+
+def finish(meex: MrMeseex):
+    return meex.prev_task_output + 1
+
+
+def _make_store(kind: str, path):
+    if kind == "sqlite":
+        return SQLiteCheckpointStore(str(path / "checkpoints.db"))
+    return FileCheckpointStore(str(path / "checkpoints.log"))
+
+
+@pytest.mark.parametrize("kind", ["sqlite", "file"])
+def test_resume_continues_after_the_last_completed_task(kind, tmp_path):
+    expensive_runs.clear()
+    box = MeseexBox(
+        {"expensive": expensive, "wait": stuck, "finish": finish},
+        progress_verbosity=0,
+        checkpoint=_make_store(kind, tmp_path)
+    )
+    assert box.summon(0).wait_for_result(timeout_s=5) == 1
+    interrupted = box.summon_many([1, 2, 3])
+    # Let the jobs reach the stuck task
+    for meex in interrupted:
+        while meex.current_task_index < 1:
+            meex.wait(timeout_s=0.01)
+    box.shutdown()
+    assert sorted(expensive_runs) == [0, 1, 2, 3]
+
+    store = _make_store(kind, tmp_path)
+    unfinished = store.load_unfinished()
+    assert [checkpoint.meseex_id for checkpoint in unfinished] == [meex.meseex_id for meex in interrupted]
+    assert all(checkpoint.resume_task_index == 1 for checkpoint in unfinished)
+
+    # After the restart the stuck task works again
+    box = MeseexBox({"expensive": expensive, "wait": pass_through, "finish": finish},
+                    progress_verbosity=0, checkpoint=store)
+    resumed = box.resume()
+    assert resumed.gather(timeout_s=5) == [11, 21, 31]
+    # The expensive task was not computed again
+    assert sorted(expensive_runs) == [0, 1, 2, 3]
+    assert box.resume().meekz == []
+    assert store.load(interrupted.meekz[0].meseex_id).termination_state == "SUCCESS"
+    box.shutdown()
+
+
+def test_file_store_ignores_torn_records_and_compacts(tmp_path):
+    path = str(tmp_path / "checkpoints.log")
+    store = FileCheckpointStore(path)
+    store.save(MeseexCheckpoint("a", "a", ["t"], 1, {}, 0))
+    store.save(MeseexCheckpoint("b", "b", ["t"], 2, {}, 0))
+    store.save(MeseexCheckpoint("a", "a", ["t"], 1, {0: "out"}, 1, termination_state="SUCCESS"))
+    store.close()
+
+    # Simulate a crash in the middle of a write
+    with open(path, "ab") as f:
+        f.write(b"\xff\x00\x00\x00partial")
+
+    store = FileCheckpointStore(path)
+    assert [checkpoint.meseex_id for checkpoint in store.load_unfinished()] == ["b"]
+    assert store.load("a").task_outputs == {0: "out"}
+    store.save(MeseexCheckpoint("c", "c", ["t"], 3, {}, 0))
+    store.compact(keep_terminated=False)
+    store.close()
+
+    store = FileCheckpointStore(path)
+    assert [checkpoint.meseex_id for checkpoint in store.load_unfinished()] == ["b", "c"]
+    assert store.load("a") is None
+    store.close()
+
+
+def test_job_without_task_method_is_not_resumed_again(tmp_path):
+    store = FileCheckpointStore(str(tmp_path / "checkpoints.log"))
+    # Saved by an older version of the pipeline with a task that doesn't exist anymore
+    store.save(MeseexCheckpoint("old", "old", ["renamed"], 1, {}, 0))
+    box = MeseexBox({"finish": finish}, progress_verbosity=0, checkpoint=store)
+
+    resumed = box.resume()
+    assert resumed.meekz[0].wait(timeout_s=5)
+    assert resumed.meekz[0].error is not None
+    assert store.load("old").is_terminal
+    assert box.resume().meekz == []
+    box.shutdown()
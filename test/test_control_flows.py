@@ -1,5 +1,11 @@
-from meseex.control_flow import polling_task, PollAgain, PollingException
-from meseex import MrMeseex, MeseexBox
+from meseex.control_flow import polling_task, batched_polling_task, PollAgain, PollingException
+from meseex.control_flow import ExponentialBackoff, DecorrelatedJitterBackoff, batched_task, Retry, retry_task
+from meseex.control_flow import BatchedPoller
+from meseex.control_flow.retry import _count_retry, DEFAULT_RETRY_DELAY_S
+from meseex.control_flow.polling import PollingState
+from meseex import MrMeseex, MeseexBox, gather_results
+import asyncio
+import time
 from asyncio import sleep
 
 
@@ -56,5 +62,197 @@ def test_polling():
     assert isinstance(meex.error, PollingException)
 
 
+remote_jobs = {}
+status_requests = []
+
+
+@batched_polling_task(key_fn=lambda meex: meex.input, poll_interval_seconds=0.2, timeout_seconds=10)
+def check_remote_jobs(job_ids):
+    status_requests.append(len(job_ids))
+    statuses = {}
+    for job_id in job_ids:
+        remote_jobs[job_id] += 1
+        if job_id == "broken":
+            statuses[job_id] = ValueError("remote job failed")
+        elif remote_jobs[job_id] >= 3:
+            statuses[job_id] = f"{job_id} done"
+        else:
+            statuses[job_id] = PollAgain("running")
+    return statuses
+
+
+def test_batched_polling():
+    job_ids = [f"job_{i}" for i in range(50)] + ["broken"]
+    remote_jobs.update({job_id: 0 for job_id in job_ids})
+
+    meseex_box = MeseexBox({"poll": check_remote_jobs}, progress_verbosity=0)
+    meekz = [meseex_box.summon(job_id) for job_id in job_ids]
+    results = gather_results(meekz, timeout_s=10, results_only=True, default_value="failed")
+
+    assert results == [f"{job_id} done" for job_id in job_ids[:-1]] + ["failed"]
+    # Each job needed 3 polls. Far fewer upstream calls than the 150 single polls are made.
+    assert len(status_requests) < 20
+    assert isinstance(meekz[-1].error.original_error, ValueError)
+    meseex_box.shutdown()
+
+
+def test_cancelled_poll_does_not_break_its_batch():
+    async def statuses(keys):
+        return {key: f"{key} done" for key in keys}
+
+    async def main():
+        poller = BatchedPoller(statuses, batch_window_s=0.05)
+        cancelled = asyncio.ensure_future(poller.poll("shared"))
+        same_key = asyncio.ensure_future(poller.poll("shared"))
+        other_key = asyncio.ensure_future(poller.poll("other"))
+        await asyncio.sleep(0.01)
+        cancelled.cancel()
+        return await asyncio.wait_for(asyncio.gather(same_key, other_key), timeout=1), cancelled.cancelled()
+
+    assert asyncio.run(main()) == (["shared done", "other done"], True)
+
+
+def test_backoff_strategies():
+    exponential = PollingState(timeout_s=1000, backoff=ExponentialBackoff(initial_s=1, factor=2, max_s=10))
+    assert [exponential.next_delay() for _ in range(6)] == [1, 2, 4, 8, 10, 10]
+    # A server hint replaces the backoff for one attempt
+    assert exponential.next_delay(retry_after=0.5) == 0.5
+
+    jittered = PollingState(timeout_s=1000, backoff=DecorrelatedJitterBackoff(base_s=1, max_s=30))
+    delays = [jittered.next_delay() for _ in range(50)]
+    assert all(1 <= delay <= 30 for delay in delays)
+    assert jittered.attempts == 50
+
+    # Delays never reach beyond the timeout
+    short = PollingState(timeout_s=0.5, backoff=ExponentialBackoff(initial_s=2, max_s=2))
+    assert short.next_delay() <= 0.5
+
+
+hinted_polls = []
+
+
+@polling_task(timeout_seconds=10, poll_interval_seconds=5)
+def poll_with_retry_after(meex: MrMeseex):
+    hinted_polls.append(meex.input)
+    if len(hinted_polls) < 3:
+        return PollAgain("busy", retry_after=0.05)
+    return "done"
+
+
+def test_polling_with_retry_after():
+    meseex_box = MeseexBox({"poll": poll_with_retry_after}, progress_verbosity=0)
+    # Without the hint the 3 polls would take 10 seconds
+    assert meseex_box.summon("job").wait_for_result(timeout_s=2) == "done"
+    meseex_box.shutdown()
+
+
+batch_sizes = []
+
+
+@batched_task(max_batch_size=16, max_wait_ms=50)
+def square_batch(meekz):
+    batch_sizes.append(len(meekz))
+    return [ValueError("negative") if meex.input < 0 else meex.input ** 2 for meex in meekz]
+
+
+def test_batched_task():
+    meseex_box = MeseexBox({"square": square_batch}, progress_verbosity=0)
+    meekz = [meseex_box.summon(i) for i in range(40)] + [meseex_box.summon(-1)]
+    results = gather_results(meekz, timeout_s=5, results_only=True, default_value="failed")
+
+    assert results == [i ** 2 for i in range(40)] + ["failed"]
+    assert max(batch_sizes) <= 16
+    assert len(batch_sizes) < 41
+    meseex_box.shutdown()
+
+
+stage_runs = {"prepare": 0, "upload": 0}
+
+
+def prepare(meex: MrMeseex):
+    stage_runs["prepare"] += 1
+    return meex.input
+
+
+@retry_task(max_attempts=3, backoff=ExponentialBackoff(initial_s=0.01, max_s=0.05), retry_on=(ConnectionError,))
+def flaky_upload(meex: MrMeseex):
+    stage_runs["upload"] += 1
+    if meex.input == "fatal":
+        raise ValueError("not retryable")
+    if meex.input == "always" or stage_runs["upload"] < 3:
+        raise ConnectionError("connection reset")
+    return f"uploaded {meex.prev_task_output}"
+
+
+def test_retry_task_reruns_only_the_failed_stage():
+    meseex_box = MeseexBox({"prepare": prepare, "upload": flaky_upload}, progress_verbosity=0)
+
+    assert meseex_box.summon("file").wait_for_result(timeout_s=5) == "uploaded file"
+    assert stage_runs == {"prepare": 1, "upload": 3}
+
+    # Gives up after max_attempts with the last error
+    stage_runs.update(prepare=0, upload=0)
+    always = meseex_box.summon("always")
+    assert always.wait_for_result(timeout_s=5, default_value_on_error="failed") == "failed"
+    assert stage_runs["upload"] == 3
+    assert isinstance(always.error.original_error, ConnectionError)
+
+    # Other exceptions are not retried
+    stage_runs.update(prepare=0, upload=0)
+    fatal = meseex_box.summon("fatal")
+    assert fatal.wait_for_result(timeout_s=5, default_value_on_error="failed") == "failed"
+    assert stage_runs["upload"] == 1
+    meseex_box.shutdown()
+
+
+def test_returned_retry_signal_is_repeated():
+    attempts = []
+
+    async def ask_for_retry(meex: MrMeseex):
+        attempts.append(meex.get_task_signal("_retry_state").attempts)
+        if len(attempts) < 2:
+            return Retry(delay_s=0.01, message="not yet")
+        return "ok"
+
+    meseex_box = MeseexBox({"step": retry_task(max_attempts=2)(ask_for_retry)}, progress_verbosity=0)
+    assert meseex_box.summon().wait_for_result(timeout_s=5) == "ok"
+    assert attempts == [0, 1]
+    meseex_box.shutdown()
+
+
+def test_bare_retry_is_limited_by_max_attempts():
+    attempts = []
+
+    def always_retry(meex: MrMeseex):
+        attempts.append(1)
+        return Retry(delay_s=0.01, error=ConnectionError("still down"), max_attempts=4)
+
+    meseex_box = MeseexBox({"step": always_retry}, progress_verbosity=0)
+    meex = meseex_box.summon()
+    assert meex.wait_for_result(timeout_s=5, default_value_on_error="failed") == "failed"
+    assert len(attempts) == 4
+    assert isinstance(meex.error.original_error, ConnectionError)
+    # Without a delay the box doesn't retry in a busy loop
+    assert _count_retry(MrMeseex(), Retry()).delay_s == DEFAULT_RETRY_DELAY_S
+    meseex_box.shutdown()
+
+
+def test_returned_retry_without_delay_follows_the_backoff():
+    attempts = []
+
+    def ask_for_retry(meex: MrMeseex):
+        attempts.append(time.monotonic())
+        if len(attempts) < 3:
+            return Retry(message="not yet")
+        return "ok"
+
+    backoff = ExponentialBackoff(initial_s=0.01, max_s=0.02, jitter=0)
+    meseex_box = MeseexBox({"step": retry_task(max_attempts=3, backoff=backoff)(ask_for_retry)}, progress_verbosity=0)
+    assert meseex_box.summon().wait_for_result(timeout_s=5) == "ok"
+    # The default delay of 1 s would take 2 s
+    assert attempts[-1] - attempts[0] < 0.5
+    meseex_box.shutdown()
+
+
 if __name__ == "__main__":
     test_polling()
@@ -0,0 +1,64 @@
+import asyncio
+import time
+import pytest
+from meseex import MeseexBox, MrMeseex, gather_results, gather_results_async, as_completed, as_completed_async
+
+
+async def sleep_for_input(meex: MrMeseex):
+    await asyncio.sleep(meex.input)
+    return meex.input
+
+
+def test_gather_results_uses_one_deadline_for_the_batch():
+    box = MeseexBox({"sleep": sleep_for_input}, progress_verbosity=0)
+    meekz = [box.summon(0.3, f"job_{i}") for i in range(5)] + [box.summon(10, "slow")]
+
+    start = time.monotonic()
+    results = gather_results(meekz, timeout_s=1, default_value="timeout")
+    assert time.monotonic() - start < 2
+    assert results == {**{f"job_{i}": 0.3 for i in range(5)}, "slow": "timeout"}
+
+    with pytest.raises(TimeoutError):
+        gather_results(meekz, timeout_s=0.1, raise_on_error=True)
+    box.shutdown()
+
+
+def test_as_completed_yields_in_completion_order():
+    box = MeseexBox({"sleep": sleep_for_input}, progress_verbosity=0)
+    meekz = [box.summon(delay) for delay in (0.6, 0.1, 0.3)]
+    assert [m.get_result() for m in as_completed(meekz, timeout_s=5)] == [0.1, 0.3, 0.6]
+    box.shutdown()
+
+
+def test_as_completed_async_and_gather_async():
+    box = MeseexBox({"sleep": sleep_for_input}, progress_verbosity=0)
+
+    async def main():
+        meekz = [box.summon(delay) for delay in (0.4, 0.2, 0.0)]
+        completed = [m.result async for m in as_completed_async(meekz, timeout_s=5)]
+        gathered = await gather_results_async(meekz, results_only=True)
+        return completed, gathered
+
+    completed, gathered = asyncio.run(main())
+    assert completed == [0.0, 0.2, 0.4]
+    assert gathered == [0.4, 0.2, 0.0]
+    box.shutdown()
+
+
+def test_summon_many_batch():
+    box = MeseexBox({"sleep": sleep_for_input}, progress_verbosity=0)
+    batch = box.summon_many([0.0] * 200 + [0.1], names=[f"job_{i}" for i in range(201)])
+    assert len(batch) == 201
+    assert len({m.meseex_id for m in batch}) == 201
+    assert batch.gather(timeout_s=10) == [0.0] * 200 + [0.1]
+    assert batch.is_terminal
+    assert asyncio.run(_await(batch)) == [0.0] * 200 + [0.1]
+
+    slow = box.summon_many([10, 10])
+    assert slow.cancel() == 2
+    assert slow.gather(timeout_s=5, default_value="cancelled") == ["cancelled", "cancelled"]
+    box.shutdown()
+
+
+async def _await(awaitable):
+    return await awaitable
@@ -0,0 +1,199 @@
+import time
+from meseex import MrMeseex
+from meseex.meseex_store import MeseexStore, MeseexStoreView
+from meseex.mr_meseex import TerminationState
+
+
+def _assert_view_matches_store(view: MeseexStoreView, store: MeseexStore):
+    snapshot = store.get_state_snapshot()
+    assert view.version == snapshot["version"]
+    assert view.all_meekz == snapshot["all_meekz"]
+    assert {t: ids for t, ids in view.task_map.items() if ids} == {t: ids for t, ids in snapshot["task_map"].items() if ids}
+    assert view.queued_ids == set(snapshot["queued_ids"])
+    assert view.working_ids == snapshot["working_ids"]
+    assert view.completed_ids == snapshot["completed_ids"]
+    assert view.failed_ids == snapshot["failed_ids"]
+    assert view.cancelled_ids == snapshot["cancelled_ids"]
+
+
+def test_changes_since_returns_only_new_transitions():
+    store = MeseexStore()
+    meekz = [MrMeseex(tasks=["a", "b"]) for _ in range(3)]
+    for meex in meekz:
+        store.add_to_queue(meex)
+
+    version, changes = store.changes_since(0)
+    assert version == 3
+    assert [c.state for c in changes] == ["queued"] * 3
+
+    meseex_id, _ = store.pop_next_queued()
+    store.update_meseex_task(meseex_id, -1, 0)
+    version, changes = store.changes_since(version)
+    assert version == 5
+    assert [(c.meseex_id, c.state, c.task) for c in changes] == [(meseex_id, "working", None), (meseex_id, "task", 0)]
+
+    assert store.changes_since(version) == (version, [])
+
+
+def test_changes_since_requests_resync_when_log_is_truncated():
+    store = MeseexStore(max_change_log_size=2)
+    for _ in range(5):
+        store.add_to_queue(MrMeseex())
+
+    version, changes = store.changes_since(1)
+    assert version == 5
+    assert changes is None
+    assert len(store.changes_since(3)[1]) == 2
+
+
+def test_store_view_follows_store():
+    store = MeseexStore(max_change_log_size=4)
+    view = MeseexStoreView(store)
+    meekz = [MrMeseex(tasks=["a", "b"]) for _ in range(4)]
+    for meex in meekz:
+        store.add_to_queue(meex)
+    # Log is exactly large enough for an incremental refresh
+    assert view.refresh()
+    _assert_view_matches_store(view, store)
+
+    done_id, done = store.pop_next_queued()
+    store.update_meseex_task(done_id, -1, done.next_task())
+    failed_id, failed = store.pop_next_queued()
+    store.update_meseex_task(failed_id, -1, failed.next_task())
+    # Falls behind the truncated change log and resyncs
+    assert view.refresh()
+    _assert_view_matches_store(view, store)
+
+    done.termination_state = TerminationState.SUCCESS
+    store.terminate_meseex(done_id)
+    store.fail_meseex(failed_id)
+    store.remove_meseex(meekz[3].meseex_id)
+    assert view.refresh()
+    _assert_view_matches_store(view, store)
+    assert not view.refresh()
+
+
+def _terminate(store: MeseexStore, meex: MrMeseex, state: TerminationState = TerminationState.SUCCESS):
+    meex.termination_state = state
+    store.terminate_meseex(meex.meseex_id)
+
+
+def test_retention_evicts_oldest_terminated_and_keeps_totals():
+    store = MeseexStore(max_terminated=2)
+    meekz = [MrMeseex() for _ in range(4)]
+    for meex in meekz:
+        store.add_to_queue(meex)
+        store.pop_next_queued()
+
+    _terminate(store, meekz[0])
+    _terminate(store, meekz[1], TerminationState.FAILED)
+    _terminate(store, meekz[2], TerminationState.CANCELLED)
+    _terminate(store, meekz[3])
+
+    assert store.terminated_ids == {meekz[2].meseex_id, meekz[3].meseex_id}
+    assert store.get_meseex(meekz[0].meseex_id) is None
+    assert store.totals == {"summoned": 4, "completed": 2, "failed": 1, "cancelled": 1, "evicted": 2}
+
+
+def test_retention_ttl_expiry():
+    store = MeseexStore(terminated_ttl_s=10)
+    meex = MrMeseex()
+    store.add_to_queue(meex)
+    store.pop_next_queued()
+    _terminate(store, meex)
+
+    assert store.evict_expired() == 0
+    assert 0 < store.seconds_until_next_expiry() <= 10
+    assert store.evict_expired(now=time.monotonic() + 11) == 1
+    assert store.all_meekz == {}
+    assert store.seconds_until_next_expiry() is None
+    assert store.totals["completed"] == 1
+
+
+def test_cancelling_many_queued_meekz_is_fast():
+    store = MeseexStore()
+    meekz = [MrMeseex() for _ in range(50_000)]
+    store.add_many_to_queue(meekz)
+
+    start = time.monotonic()
+    # Cancel every second job, then remove some of the remaining ones
+    for meex in meekz[::2]:
+        meex.mark_cancelled()
+        store.terminate_meseex(meex.meseex_id)
+    for meex in meekz[1:1000:2]:
+        store.remove_meseex(meex.meseex_id)
+    # Rebuilding the queue on each call would take minutes
+    assert time.monotonic() - start < 5
+
+    assert store.queued_count == 25_000 - 500
+    assert store.get_next_queued() == meekz[1001].meseex_id
+    assert store.pop_next_queued()[0] == meekz[1001].meseex_id
+    assert store.totals["cancelled"] == 25_000
+
+
+def test_store_stays_consistent_under_many_threads():
+    import threading
+
+    store = MeseexStore()
+    view = MeseexStoreView(store)
+    meekz = [MrMeseex(tasks=["a", "b"]) for _ in range(4000)]
+    store.add_many_to_queue(meekz)
+
+    def worker():
+        while True:
+            meseex_id, meex = store.pop_next_queued()
+            if meseex_id is None:
+                return
+            store.update_meseex_task(meseex_id, -1, 0)
+            store.update_meseex_task(meseex_id, 0, None)
+            if meex.meseex_id[-1] in "02468":
+                store.fail_meseex(meseex_id)
+            else:
+                store.complete_meseex(meseex_id)
+
+    threads = [threading.Thread(target=worker) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    totals = store.totals
+    assert totals["summoned"] == 4000
+    assert totals["completed"] + totals["failed"] == 4000
+    assert store.working_count == 0 and store.queued_count == 0
+    assert len(store.terminated_ids) == 4000
+    assert store.version == 4000 * 5
+    view.refresh()
+    _assert_view_matches_store(view, store)
+
+
+def test_queue_starts_higher_priority_first_and_ages_waiting_jobs():
+    store = MeseexStore(priority_aging_s=None)
+    bulk = [MrMeseex(priority=0) for _ in range(3)]
+    urgent = MrMeseex(priority=5)
+    store.add_many_to_queue(bulk)
+    store.add_to_queue(urgent)
+
+    assert store.get_next_queued() == urgent.meseex_id
+    popped = [store.pop_next_queued()[0] for _ in range(4)]
+    assert popped == [urgent.meseex_id] + [meex.meseex_id for meex in bulk]
+
+    # With aging, a job that waited long enough overtakes newer jobs of higher priority
+    store = MeseexStore(priority_aging_s=0.01)
+    old = MrMeseex(priority=0)
+    store.add_to_queue(old)
+    time.sleep(0.05)
+    newer = MrMeseex(priority=2)
+    store.add_to_queue(newer)
+    assert store.pop_next_queued()[0] == old.meseex_id
+
+    # Removed jobs leave tombstones that are skipped
+    store = MeseexStore()
+    meekz = [MrMeseex(priority=i % 3) for i in range(200)]
+    store.add_many_to_queue(meekz)
+    for meex in meekz[:150]:
+        store.remove_meseex(meex.meseex_id)
+    assert store.queued_count == 50
+    assert store.get_state_snapshot()["queued_ids"][0] == store.get_next_queued()
+    assert {store.pop_next_queued()[0] for _ in range(50)} == {meex.meseex_id for meex in meekz[150:]}
+    assert store.pop_next_queued() == (None, None)
@@ -0,0 +1,119 @@
+import asyncio
+import threading
+import time
+import pytest
+from meseex import MrMeseex, TaskCancelledException
+
+
+def _finish_later(meex: MrMeseex, output, delay_s: float = 0.1):
+    def finish():
+        time.sleep(delay_s)
+        meex.next_task()
+        meex.set_task_output(output)
+        meex.next_task()
+    threading.Thread(target=finish, daemon=True).start()
+
+
+def test_wait_for_result_wakes_up_on_completion():
+    meex = MrMeseex()
+    _finish_later(meex, "done")
+    assert meex.wait_for_result(timeout_s=5) == "done"
+
+
+def test_wait_for_result_timeout_returns_default():
+    meex = MrMeseex()
+    assert meex.wait_for_result(timeout_s=0.05, default_value_on_error="timeout") == "timeout"
+
+
+def test_many_awaiters_share_completion():
+    meex = MrMeseex()
+
+    async def wait():
+        return await meex
+
+    async def main():
+        awaiters = [asyncio.ensure_future(wait()) for _ in range(1000)]
+        await asyncio.sleep(0)
+        # Cancelling one awaiter must not affect the others
+        awaiters[0].cancel()
+        _finish_later(meex, 42)
+        return await asyncio.gather(*awaiters[1:])
+
+    assert asyncio.run(main()) == [42] * 999
+
+
+def test_await_cancelled_job_raises():
+    meex = MrMeseex()
+
+    async def main():
+        threading.Timer(0.05, meex.cancel).start()
+        await meex
+
+    with pytest.raises(TaskCancelledException):
+        asyncio.run(main())
+
+
+def test_done_callbacks_of_cancelled_job_run_outside_the_state_lock():
+    meex = MrMeseex()
+    lock_free = []
+
+    def try_lock_from_other_thread(_):
+        # The lock is pooled, so a callback holding it would block unrelated Mr. Meseex instances
+        def try_lock():
+            acquired = meex._state_lock.acquire(timeout=1)
+            lock_free.append(acquired)
+            if acquired:
+                meex._state_lock.release()
+        thread = threading.Thread(target=try_lock)
+        thread.start()
+        thread.join()
+
+    meex.add_done_callback(try_lock_from_other_thread)
+    assert meex.mark_cancelled()
+    assert lock_free == [True]
+
+
+def test_compact_state_materializes_metadata_on_access():
+    meex = MrMeseex(tasks=["prepare", "process"], data="input")
+    assert not hasattr(meex, "__dict__")
+    assert meex.task_progress is None
+    assert list(meex.task_metadata) == [-1]
+
+    meex.next_task()
+    meex.set_task_progress(0.5, "halfway")
+    assert meex.task_progress.percent == 0.5
+    assert meex.task_progress.message == "halfway"
+    assert meex.task_meta.left_at is None
+
+    meex.next_task()
+    assert meex.progress == 0.5
+    assert meex.task_metadata[0].progress.percent == 1.0
+    assert meex.task_metadata[0].left_at >= meex.task_metadata[0].entered_at
+
+    meex.next_task()
+    assert meex.termination_state is not None
+    assert meex.total_duration_ms >= 0
+    assert MrMeseex().meseex_id != MrMeseex().meseex_id
+
+
+def test_task_meta_default_is_creation_time():
+    from meseex.mr_meseex import TaskMeta
+
+    first = TaskMeta()
+    time.sleep(0.01)
+    second = TaskMeta()
+    assert second.entered_at > first.entered_at
+    assert 0 <= second.duration_ms < 1000
+
+
+def test_durations_use_monotonic_clock():
+    meex = MrMeseex(tasks=["a"])
+    meex.next_task()
+    time.sleep(0.05)
+    meex.next_task()
+    duration_ms = meex.total_duration_ms
+    assert 50 <= duration_ms < 1000
+    # Terminal jobs keep their duration
+    time.sleep(0.02)
+    assert meex.total_duration_ms == duration_ms
+    assert abs(meex.task_metadata[0].duration_ms - duration_ms) < 5
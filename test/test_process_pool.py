@@ -0,0 +1,57 @@
+import os
+import pytest
+from meseex import MeseexBox, MrMeseex, gather_results, task
+from meseex.control_flow import polling_task, retry_task
+from meseex.tasks import ProcessPoolTaskExecutor
+
+
+def count_primes(meex: MrMeseex):
+    limit = meex.input
+    primes = [n for n in range(2, limit) if all(n % d for d in range(2, int(n ** 0.5) + 1))]
+    meex.set_task_progress(1.0, "counted")
+    return len(primes), os.getpid()
+
+
+async def async_square(meex: MrMeseex):
+    return meex.prev_task_output[0] ** 2
+
+
+def fail(meex: MrMeseex):
+    raise ValueError("worker failed")
+
+
+def test_process_pool_runs_tasks_in_worker_processes():
+    executor = ProcessPoolTaskExecutor(max_workers=2)
+    box = MeseexBox(
+        {"count": task(count_primes, executor="cpu"), "square": task(async_square, executor="cpu")},
+        progress_verbosity=0,
+        executors={"cpu": executor}
+    )
+    meekz = [box.summon(1000) for _ in range(4)]
+    results = gather_results(meekz, timeout_s=60, raise_on_error=True, results_only=True)
+
+    assert results == [168 ** 2] * 4
+    for meex in meekz:
+        n_primes, pid = meex.get_task_output("count")
+        assert n_primes == 168
+        assert pid != os.getpid()
+    box.shutdown()
+    executor.shutdown()
+
+
+def test_process_pool_error_fails_meseex():
+    executor = ProcessPoolTaskExecutor(max_workers=1)
+    box = MeseexBox({"fail": task(fail, executor=executor)}, progress_verbosity=0)
+    meex = box.summon(None)
+    assert meex.wait(timeout_s=60)
+    assert "worker failed" in str(meex.error)
+    box.shutdown()
+    executor.shutdown()
+
+
+def test_process_pool_rejects_tasks_with_control_flow_state():
+    executor = ProcessPoolTaskExecutor(max_workers=1)
+    for decorated in (polling_task()(count_primes), retry_task()(count_primes)):
+        with pytest.raises(ValueError, match="ProcessPoolTaskExecutor"):
+            MeseexBox({"count": task(decorated, executor=executor)}, progress_verbosity=0)
+    executor.shutdown()
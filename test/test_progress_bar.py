@@ -0,0 +1,54 @@
+import io
+from rich.console import Console
+from meseex import MrMeseex
+from meseex.meseex_store import MeseexStore, MeseexStoreView
+from meseex.mr_meseex import TerminationState
+from meseex.progress_bar import ProgressBar
+
+
+class CountingMeseex(MrMeseex):
+    """Records which jobs the display reads the runtime of"""
+    read_ids = set()
+
+    @property
+    def total_duration_ms(self) -> float:
+        CountingMeseex.read_ids.add(self.meseex_id)
+        return super().total_duration_ms
+
+
+def _quiet_progress_bar() -> ProgressBar:
+    progress_bar = ProgressBar(progress_verbosity=1)
+    progress_bar._console = Console(file=io.StringIO(), force_terminal=True)
+    return progress_bar
+
+
+def test_update_does_not_touch_terminated_jobs_again():
+    store = MeseexStore()
+    view = MeseexStoreView(store)
+    progress_bar = _quiet_progress_bar()
+    meekz = [CountingMeseex(tasks=["a"], name=f"job {i}") for i in range(100)]
+    store.add_many_to_queue(meekz)
+    for meex in meekz[:90]:
+        store.pop_next_queued()
+        meex.termination_state = TerminationState.FAILED if meex is meekz[5] else TerminationState.SUCCESS
+        store.terminate_meseex(meex.meseex_id)
+
+    view.refresh()
+    progress_bar.update_progress(view)
+    assert progress_bar._terminated.most_recent("completed", 2) == [meekz[89], meekz[88]]
+    assert progress_bar._terminated.most_recent("failed", 2) == [meekz[5]]
+
+    # Ticks only read the active jobs and the few most recent terminated jobs that are shown
+    CountingMeseex.read_ids = set()
+    view.refresh()
+    progress_bar.update_progress(view)
+    shown = {meex.meseex_id for meex in meekz[90:] + meekz[87:90] + [meekz[5]]}
+    assert CountingMeseex.read_ids == shown
+
+    store.remove_meseex(meekz[89].meseex_id)
+    view.refresh()
+    progress_bar.update_progress(view)
+    assert progress_bar._terminated.most_recent("completed", 1) == [meekz[88]]
+    assert len(progress_bar._terminated) == 89
+    assert progress_bar._terminated.task_counts == {"a": 89}
+    progress_bar.stop()
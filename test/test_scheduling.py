@@ -0,0 +1,328 @@
+import asyncio
+import threading
+import time
+import pytest
+from meseex import MeseexBox, MrMeseex, QueueFullException, gather_results, task
+from meseex.control_flow import Repeat
+
+
+def test_idle_box_starts_new_jobs_immediately():
+    def double(meex: MrMeseex):
+        return meex.input * 2
+
+    box = MeseexBox({"double": double}, progress_verbosity=0)
+    assert box.summon(1).wait_for_result(timeout_s=5) == 2
+
+    # The background loop is now sleeping until it is woken by the next summon
+    time.sleep(0.2)
+    start = time.monotonic()
+    assert box.summon(21).wait_for_result(timeout_s=5) == 42
+    assert time.monotonic() - start < 1.0
+
+    box.shutdown()
+
+
+def test_evict_on_result():
+    async def echo(meex: MrMeseex):
+        return meex.input
+
+    box = MeseexBox({"echo": echo}, progress_verbosity=0, evict_on_result=True)
+    meex = box.summon("hello")
+    assert meex.wait_for_result(timeout_s=5) == "hello"
+    assert box.meseex_store.get_meseex(meex.meseex_id) is None
+    assert box.meseex_store.totals["completed"] == 1
+    box.shutdown()
+
+
+def test_max_in_flight_limits_working_jobs():
+    running = []
+    peak = []
+
+    def work(meex: MrMeseex):
+        running.append(meex.meseex_id)
+        peak.append(len(running))
+        time.sleep(0.05)
+        running.remove(meex.meseex_id)
+        return meex.input
+
+    box = MeseexBox({"work": work}, progress_verbosity=0, max_in_flight=3)
+    batch = box.summon_many(range(12))
+    assert batch.gather(timeout_s=10) == list(range(12))
+    assert max(peak) <= 3
+    box.shutdown()
+
+
+def test_max_queued_reject_and_block():
+    async def wait_a_bit(meex: MrMeseex):
+        await asyncio.sleep(0.2)
+        return meex.input
+
+    box = MeseexBox({"wait": wait_a_bit}, progress_verbosity=0, max_in_flight=1, max_queued=2, admission_policy="reject")
+    meekz = [box.summon(i) for i in range(3)]
+    # Give the loop time to start the first job, the other two fill the queue
+    time.sleep(0.05)
+    with pytest.raises(QueueFullException):
+        box.summon(3)
+    gather_results(meekz, timeout_s=5)
+    box.shutdown()
+
+    box = MeseexBox({"wait": wait_a_bit}, progress_verbosity=0, max_in_flight=1, max_queued=1)
+    batch = box.summon_many(range(4))
+    # summon_many blocked until the last job was admitted
+    assert box.meseex_store.queued_count <= 1
+    assert batch.gather(timeout_s=5) == [0, 1, 2, 3]
+
+    async def summon_async():
+        return [await box.summon_async(i) for i in range(3)]
+
+    assert gather_results(asyncio.run(summon_async()), timeout_s=5, results_only=True) == [0, 1, 2]
+    box.shutdown()
+
+
+def test_task_concurrency_limits_each_stage():
+    lock = threading.Lock()
+    running = {"download": 0, "infer": 0}
+    peak = {"download": 0, "infer": 0}
+
+    def track(stage, delta):
+        with lock:
+            running[stage] += delta
+            peak[stage] = max(peak[stage], running[stage])
+
+    async def download(meex: MrMeseex):
+        track("download", 1)
+        await asyncio.sleep(0.01)
+        track("download", -1)
+        return meex.input
+
+    def infer(meex: MrMeseex):
+        track("infer", 1)
+        time.sleep(0.02)
+        track("infer", -1)
+        return meex.prev_task_output * 2
+
+    box = MeseexBox({
+        "download": task(download, concurrency=5),
+        "infer": task(infer, concurrency=2),
+    }, progress_verbosity=0)
+    meekz = [box.summon(i) for i in range(20)]
+    results = gather_results(meekz, timeout_s=10, raise_on_error=True, results_only=True)
+
+    assert results == [i * 2 for i in range(20)]
+    assert 1 <= peak["download"] <= 5
+    assert 1 <= peak["infer"] <= 2
+    box.shutdown()
+
+
+def test_cancel_while_waiting_for_stage_slot():
+    release = threading.Event()
+
+    @task(concurrency=1)
+    def slow(meex: MrMeseex):
+        release.wait(5)
+        return meex.input
+
+    box = MeseexBox({"slow": slow}, progress_verbosity=0)
+    first = box.summon(1)
+    second = box.summon(2)
+    time.sleep(0.2)
+    second.cancel(cancel_result="skipped")
+    assert second.wait(timeout_s=2)
+    assert second.cancel_result == "skipped"
+
+    release.set()
+    assert first.wait_for_result(timeout_s=5) == 1
+    box.shutdown()
+
+
+def test_tasks_run_on_their_executor():
+    from meseex.tasks import TaskExecutor
+
+    class CountingExecutor(TaskExecutor):
+        def __init__(self, max_workers: int):
+            super().__init__(max_workers=max_workers)
+            self.n_submitted = 0
+
+        def submit(self, method, *args, **kwargs):
+            self.n_submitted += 1
+            return super().submit(method, *args, **kwargs)
+
+    def load(meex: MrMeseex):
+        return meex.input
+
+    def compute(meex: MrMeseex):
+        return meex.prev_task_output * 2
+
+    cpu_pool = CountingExecutor(max_workers=2)
+    io_pool = CountingExecutor(max_workers=32)
+    box = MeseexBox(
+        {"load": load, "compute": task(compute, executor="cpu")},
+        progress_verbosity=0,
+        task_executor=io_pool,
+        executors={"cpu": cpu_pool}
+    )
+    results = gather_results([box.summon(i) for i in range(5)], timeout_s=5, results_only=True)
+    assert results == [i * 2 for i in range(5)]
+    assert io_pool.n_submitted == 5
+    assert cpu_pool.n_submitted == 5
+    box.shutdown()
+
+    # Executors of the caller are still usable after the box shut down
+    done = threading.Event()
+    still_running = cpu_pool.submit(lambda: 42, callback=lambda _: done.set())
+    assert done.wait(timeout=5) and still_running.result == 42
+    cpu_pool.shutdown()
+    io_pool.shutdown()
+
+    with pytest.raises(ValueError):
+        MeseexBox({"load": task(load, executor="gpu")}, progress_verbosity=0)
+
+
+def test_waiting_repeats_do_not_occupy_worker_threads():
+    def poll(meex: MrMeseex):
+        n_polls = (meex.get_task_data() or 0) + 1
+        meex.set_task_data(n_polls)
+        if n_polls < 3:
+            return Repeat(delay_s=0.2)
+        return n_polls
+
+    box = MeseexBox({"poll": poll}, progress_verbosity=0, max_workers=2)
+    start = time.monotonic()
+    results = gather_results([box.summon(i) for i in range(20)], timeout_s=10, raise_on_error=True, results_only=True)
+
+    assert results == [3] * 20
+    # Sleeping in the two worker threads would take 20 jobs * 2 delays * 0.2s / 2 threads = 4s
+    assert time.monotonic() - start < 2.0
+    box.shutdown()
+
+
+def test_cancel_while_waiting_for_repeat():
+    def poll_forever(meex: MrMeseex):
+        return Repeat(delay_s=30)
+
+    box = MeseexBox({"poll": poll_forever}, progress_verbosity=0)
+    meex = box.summon(None)
+    time.sleep(0.2)
+    meex.cancel()
+    assert meex.wait(timeout_s=1)
+    box.shutdown()
+
+
+def test_task_dispatch_is_resolved_once(monkeypatch):
+    import meseex.meseex_box as meseex_box_module
+
+    def add_one(meex: MrMeseex):
+        return meex.input + 1
+
+    box = MeseexBox({"add_one": add_one}, progress_verbosity=0)
+
+    def fail_inspection(method):
+        raise AssertionError("Task signatures must only be inspected when the box is created")
+
+    monkeypatch.setattr(meseex_box_module, "_expects_mr_meseex_param", fail_inspection)
+    results = gather_results([box.summon(i) for i in range(10)], timeout_s=5, raise_on_error=True, results_only=True)
+    assert results == list(range(1, 11))
+    box.shutdown()
+
+
+def test_priority_jobs_overtake_bulk_jobs_in_queue_and_at_gates():
+    started = []
+
+    def record(meex: MrMeseex):
+        started.append(meex.input)
+        time.sleep(0.02)
+        return meex.input
+
+    release = threading.Event()
+
+    def block(meex: MrMeseex):
+        release.wait(5)
+        return meex.input
+
+    # Queue: the first job occupies the only slot, then urgent jobs overtake the queued bulk jobs
+    box = MeseexBox({"block": block, "record": record}, progress_verbosity=0, max_in_flight=1)
+    first = box.summon("first")
+    time.sleep(0.05)
+    bulk = box.summon_many([f"bulk{i}" for i in range(3)])
+    urgent = box.summon("urgent", priority=10)
+    release.set()
+    gather_results([first, urgent] + list(bulk), timeout_s=10)
+    assert started[:2] == ["first", "urgent"]
+    box.shutdown()
+
+    # Stage gate: the urgent job waits at the gate and gets the next free slot
+    started.clear()
+    release.clear()
+
+    def gated(meex: MrMeseex):
+        started.append(meex.input)
+        if meex.input == "blocker":
+            release.wait(5)
+        return meex.input
+
+    box = MeseexBox({"gated": task(gated, concurrency=1)}, progress_verbosity=0)
+    blocker = box.summon("blocker")
+    time.sleep(0.05)
+    waiting = box.summon_many([f"bulk{i}" for i in range(3)])
+    time.sleep(0.05)
+    urgent = box.summon("urgent", priority=10)
+    time.sleep(0.05)
+    release.set()
+    gather_results([blocker, urgent] + list(waiting), timeout_s=10)
+    assert started[:2] == ["blocker", "urgent"]
+    box.shutdown()
+
+
+def test_rate_limit_spaces_out_calls_without_occupying_threads():
+    from meseex import TokenBucket
+
+    bucket = TokenBucket(rate_per_s=10, burst=2)
+    assert bucket.reserve() == 0 and bucket.reserve() == 0
+    assert bucket.reserve() == pytest.approx(0.1, abs=0.02)
+    assert not bucket.try_acquire()
+    with pytest.raises(ValueError):
+        task(lambda: None, rate_limit=0)
+
+    started = []
+
+    def call_api(meex: MrMeseex):
+        started.append(time.monotonic())
+        return meex.input
+
+    # Both stages share one quota of 20 calls per second
+    quota = TokenBucket(rate_per_s=20, burst=1)
+    box = MeseexBox(
+        {"submit": task(call_api, rate_limit=quota), "fetch": task(call_api, rate_limit=quota)},
+        progress_verbosity=0,
+        max_workers=2
+    )
+    batch = box.summon_many(range(6))
+    assert batch.gather(timeout_s=10) == list(range(6))
+
+    started.sort()
+    assert len(started) == 12
+    # 12 calls at 20 per second take at least 11 intervals of 50 ms
+    assert started[-1] - started[0] >= 0.5
+    # Any 5 consecutive calls span at least 4 intervals, minus some scheduling jitter
+    assert all(b - a >= 0.15 for a, b in zip(started, started[4:]))
+    box.shutdown()
+
+
+def test_invalid_arguments_raise_without_side_effects(monkeypatch):
+    import gc
+    import sys
+
+    unraisable = []
+    monkeypatch.setattr(sys, "unraisablehook", unraisable.append)
+
+    def noop(meex: MrMeseex):
+        return None
+
+    for kwargs in ({"max_in_flight": 0}, {"max_queued": 0}, {"admission_policy": "drop"}):
+        with pytest.raises(ValueError):
+            MeseexBox({"noop": noop}, progress_verbosity=0, **kwargs)
+    with pytest.raises(ValueError):
+        MeseexBox({"noop": task(noop, executor="gpu")}, progress_verbosity=0)
+    gc.collect()
+    # __del__ of the partly built box must not raise
+    assert unraisable == []
@@ -0,0 +1,70 @@
+import asyncio
+import time
+from meseex import MeseexBox, MrMeseex, SingleFlight, task, gather_results
+
+runs = []
+
+
+async def generate(meex: MrMeseex):
+    runs.append(meex.meseex_id)
+    await asyncio.sleep(0.3)
+    if meex.input == "bad prompt":
+        raise ValueError("model refused")
+    return f"answer to {meex.input}"
+
+
+def test_identical_jobs_in_flight_run_the_task_once():
+    runs.clear()
+    flight = SingleFlight()
+    box = MeseexBox({"generate": task(generate, single_flight=flight)}, progress_verbosity=0)
+    batch = box.summon_many(["same prompt"] * 20 + ["other prompt"])
+
+    assert batch.gather(timeout_s=5) == ["answer to same prompt"] * 20 + ["answer to other prompt"]
+    assert len(runs) == 2
+    assert flight.stats == {"leaders": 2, "followers": 19, "handovers": 0}
+    assert flight.in_flight == 0
+
+    # Once the flight ended, the next job runs again
+    assert box.summon("same prompt").wait_for_result(timeout_s=5) == "answer to same prompt"
+    assert len(runs) == 3
+    box.shutdown()
+
+
+def test_followers_receive_the_error_of_the_leader():
+    runs.clear()
+    box = MeseexBox({"generate": task(generate, single_flight=True)}, progress_verbosity=0)
+    meekz = [box.summon("bad prompt") for _ in range(5)]
+    results = gather_results(meekz, timeout_s=5, results_only=True, default_value="failed")
+    assert results == ["failed"] * 5
+    assert len(runs) == 1
+    assert all(isinstance(meex.error.original_error, ValueError) for meex in meekz)
+    box.shutdown()
+
+
+def test_cancelled_leader_hands_over_to_a_follower():
+    runs.clear()
+    flight = SingleFlight()
+    box = MeseexBox({"generate": task(generate, single_flight=flight)}, progress_verbosity=0)
+    leader = box.summon("prompt")
+    time.sleep(0.1)
+    followers = [box.summon("prompt") for _ in range(3)]
+    time.sleep(0.05)
+    assert len(runs) == 1
+
+    leader.cancel()
+    results = gather_results(followers, timeout_s=5, results_only=True)
+    assert results == ["answer to prompt"] * 3
+    assert runs == [leader.meseex_id, followers[0].meseex_id]
+    assert flight.stats["handovers"] == 1
+    box.shutdown()
+
+
+def test_failing_key_fn_fails_the_meseex():
+    runs.clear()
+    flight = SingleFlight(key_fn=lambda meex: meex.input["prompt"])
+    box = MeseexBox({"generate": task(generate, single_flight=flight)}, progress_verbosity=0)
+    meekz = [box.summon("no dict") for _ in range(3)]
+    assert gather_results(meekz, timeout_s=5, results_only=True, default_value="failed") == ["failed"] * 3
+    assert all(isinstance(meex.error.original_error, TypeError) for meex in meekz)
+    assert runs == [] and flight.in_flight == 0
+    box.shutdown()
@@ -0,0 +1,91 @@
+import time
+from meseex import MeseexBox, MrMeseex, StageCache, task, gather_results
+
+calls = []
+
+
+def transcribe(meex: MrMeseex):
+    calls.append(meex.input)
+    return f"text of {meex.input['file']}"
+
+
+def count_words(meex: MrMeseex):
+    return len(meex.prev_task_output.split())
+
+
+def test_cached_stage_is_skipped_for_identical_inputs():
+    calls.clear()
+    box = MeseexBox({"transcribe": task(transcribe, cache=True), "count": count_words}, progress_verbosity=0)
+
+    assert box.summon({"file": "a.wav"}).wait_for_result(timeout_s=5) == 3
+    results = gather_results([box.summon({"file": "a.wav"}) for _ in range(3)], timeout_s=5, results_only=True)
+    assert results == [3, 3, 3]
+    assert box.summon({"file": "b.wav"}).wait_for_result(timeout_s=5) == 3
+
+    assert calls == [{"file": "a.wav"}, {"file": "b.wav"}]
+    stats = box.cache_stats()["transcribe"]
+    assert (stats["hits"], stats["misses"], stats["size"]) == (3, 2, 2)
+    box.shutdown()
+
+
+def test_key_fn_and_lru_and_ttl():
+    cache = StageCache(max_size=2, ttl_s=0.05, key_fn=lambda meex: meex.input.get("file"))
+    meekz = [MrMeseex(data={"file": name}) for name in ("a", "b", "c")]
+    keys = [cache.key_for(meex) for meex in meekz]
+    assert cache.key_for(MrMeseex(data={"file": "a", "other": 1})) == keys[0]
+    assert cache.key_for(MrMeseex(data={})) is None
+
+    for key in keys:
+        cache.put(key, key)
+    # "a" was evicted as least recently used
+    assert cache.get(keys[0]) == (False, None)
+    assert cache.get(keys[2]) == (True, keys[2])
+    time.sleep(0.06)
+    assert cache.get(keys[2]) == (False, None)
+    assert cache.stats["evictions"] == 1
+
+
+def test_disk_tier_survives_a_new_cache(tmp_path):
+    path = str(tmp_path / "cache.db")
+    cache = StageCache(disk_path=path)
+    key = cache.key_for(MrMeseex(data="prompt"))
+    cache.put(key, {"answer": 42})
+    cache.close()
+
+    cache = StageCache(disk_path=path)
+    assert cache.get(key) == (True, {"answer": 42})
+    assert cache.stats["disk_hits"] == 1
+    # Promoted to memory
+    assert cache.get(key) == (True, {"answer": 42})
+    assert cache.stats["disk_hits"] == 1
+    cache.close()
+
+
+def test_shutdown_closes_only_the_caches_of_the_box(tmp_path):
+    shared = StageCache(disk_path=str(tmp_path / "cache.db"))
+    box = MeseexBox({"transcribe": task(transcribe, cache=True), "count": task(count_words, cache=shared)}, progress_verbosity=0)
+    closed = []
+    owned = box._dispatch["transcribe"].cache
+    owned.close = lambda: closed.append(owned)
+    assert box.summon({"file": "a.wav"}).wait_for_result(timeout_s=5) == 3
+    box.shutdown()
+
+    assert closed == [owned]
+    # The cache of the caller is still usable
+    shared.put("key", 1)
+    shared.close()
+    cache = StageCache(disk_path=shared.disk_path)
+    assert cache.get("key") == (True, 1)
+    cache.close()
+
+
+def test_failing_key_fn_fails_the_meseex():
+    cache = StageCache(key_fn=lambda meex: meex.input["file_hash"])
+    box = MeseexBox({"transcribe": task(transcribe, cache=cache), "count": count_words}, progress_verbosity=0)
+    meex = box.summon({"file": "a.wav"})
+    assert meex.wait(timeout_s=5)
+    assert isinstance(meex.error.original_error, KeyError)
+
+    # The box keeps working
+    assert box.summon({"file": "b.wav", "file_hash": "b"}).wait_for_result(timeout_s=5) == 3
+    box.shutdown()